@@ -148,22 +148,6 @@ def clean_string(value):
         return value.replace('\x00', '').replace('\u0000', '')
     return value
 
-def get_existing_urls(dbname='gradcafe'):
-    """Get all URLs already in the database to avoid duplicates"""
-    conn_params = get_db_params(dbname)
-
-    try:
-        conn = psycopg2.connect(**conn_params)
-        cur = conn.cursor()
-        cur.execute("SELECT url FROM gradcafe_main WHERE url IS NOT NULL;")
-        existing_urls = set(row[0] for row in cur.fetchall())
-        cur.close()
-        conn.close()
-        return existing_urls
-    except Exception as exc:  # pylint: disable=broad-exception-caught
-        print(f"Error getting existing URLs: {exc}")
-        return set()
-
 def add_new_records_to_db(records, dbname='gradcafe'):
     """Add new records to the database"""
     if not records:
@@ -312,17 +296,35 @@ def add_new_records_to_db(records, dbname='gradcafe'):
             )
             data_to_insert.append(row)
 
-        # Execute batch insert
-        insert_query = """
-            INSERT INTO gradcafe_main (program, comments, date_added, url, status, term, us_or_international,
-                                       gpa, gre, gre_v, gre_aw, degree, llm_generated_program,
-                                       llm_generated_university, raw_data)
-            VALUES %s
-        """
-        execute_values(cur, insert_query, data_to_insert)
+        # Stage the batch in a temp table and let the server skip URLs it
+        # already has; each NOT EXISTS probe is an idx_gradcafe_url lookup
+        # (created by load_data), so dedup cost scales with the batch, not
+        # the table.  gradcafe_main has no UNIQUE(url) here, so duplicates
+        # inside the batch are collapsed with DISTINCT ON rather than
+        # ON CONFLICT.
+        columns = """program, comments, date_added, url, status, term, us_or_international,
+                     gpa, gre, gre_v, gre_aw, degree, llm_generated_program,
+                     llm_generated_university, raw_data"""
+        cur.execute(f"""
+            CREATE TEMP TABLE new_records ON COMMIT DROP AS
+            SELECT {columns} FROM gradcafe_main WITH NO DATA
+        """)
+        execute_values(cur, f"INSERT INTO new_records ({columns}) VALUES %s", data_to_insert)
+        cur.execute(f"""
+            INSERT INTO gradcafe_main ({columns})
+            SELECT {columns} FROM (
+                SELECT DISTINCT ON (url) {columns} FROM new_records
+                WHERE url IS NOT NULL
+                ORDER BY url
+            ) s
+            WHERE NOT EXISTS (SELECT 1 FROM gradcafe_main g WHERE g.url = s.url)
+            UNION ALL
+            SELECT {columns} FROM new_records WHERE url IS NULL
+            RETURNING 1
+        """)
+        records_added = len(cur.fetchall())
 
         conn.commit()
-        records_added = len(records)
         cur.close()
         conn.close()
         return records_added
@@ -352,10 +354,6 @@ def scrape_and_update_background(dbname='gradcafe', max_pages=2):
         scraping_status["status_message"] = f"Initializing scraper for {dbname}..."
         scraping_status["records_added"] = 0
 
-        # Get existing URLs to avoid duplicates
-        scraping_status["status_message"] = "Checking existing data..."
-        existing_urls = get_existing_urls(dbname=dbname)
-
         # Scrape new data
         scraping_status["status_message"] = f"Scraping GradCafe (up to {max_pages} pages)..."
         scraper = GradCafeScraper()
@@ -391,27 +389,15 @@ def scrape_and_update_background(dbname='gradcafe', max_pages=2):
             with open(temp_extended_file, 'r', encoding='utf-8') as f:
                 extended_data = json.load(f)
 
-        # Filter out existing URLs
-        scraping_status["status_message"] = "Filtering for new entries..."
-        new_records = [r for r in extended_data if r.get('Url') not in existing_urls]
-
-        if not new_records:
-            scraping_status["status_message"] = "No new records found (all URLs already in database)"
-            scraping_status["is_running"] = False
-            scraping_status["last_run"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-            # Clean up temp files
-            for temp_file in [temp_raw_file, temp_cleaned_file, temp_extended_file]:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            return
-
-        # Add to database
-        scraping_status["status_message"] = f"Adding {len(new_records)} new records to {dbname}..."
-        records_added = add_new_records_to_db(new_records, dbname=dbname)
+        # Add to database; URLs already present are skipped server-side
+        scraping_status["status_message"] = f"Adding {len(extended_data)} scraped records to {dbname}..."
+        records_added = add_new_records_to_db(extended_data, dbname=dbname)
 
         scraping_status["records_added"] = records_added
-        scraping_status["status_message"] = f"Successfully added {records_added} new records!"
+        if records_added:
+            scraping_status["status_message"] = f"Successfully added {records_added} new records!"
+        else:
+            scraping_status["status_message"] = "No new records found (all URLs already in database)"
         scraping_status["last_run"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
         # Clean up temp files
@@ -3,6 +3,7 @@ Module to load GradCafe data from JSON files into PostgreSQL database.
 """
 import json
 import os
+import re
 import sys
 import tempfile
 from datetime import datetime
@@ -15,6 +16,11 @@ from dotenv import load_dotenv
 # Load environment variables from .env file (don't override existing vars for testing)
 load_dotenv(override=False)
 
+# "delete" empties gradcafe_main in place; "shadow" loads a copy and swaps it in by rename
+LOAD_MODE = os.getenv('LOAD_MODE', 'delete')
+LIVE_TABLE = 'gradcafe_main'
+SHADOW_TABLE = 'gradcafe_main_shadow'
+
 
 def _get_env_conn_params(dbname):
     """Read connection settings from environment variables without hardcoded credentials."""
@@ -90,18 +96,75 @@ def get_db_params(dbname='gradcafe_sample'):
 
     return conn_params
 
-def load_data(dbname=None, file_path=None):  # pylint: disable=too-many-statements,too-many-locals,too-many-branches
+def _prepare_shadow(cur):
+    """Create an empty, index-free copy of gradcafe_main to load into."""
+    cur.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE};")
+    cur.execute(f"CREATE TABLE {SHADOW_TABLE} (LIKE {LIVE_TABLE} INCLUDING DEFAULTS);")
+
+
+def _swap_in_shadow(cur):
+    """
+    Index and analyze the loaded shadow table, then swap it in for gradcafe_main.
+
+    The live table's keys and indexes are rebuilt on the shadow only now that
+    the data is in place (one sort per index instead of per-row maintenance).
+    Readers keep using the old table until the caller commits; the renames
+    take their exclusive lock only for the final, metadata-only step.
+    """
+    cur.execute("""
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('p', 'u');
+    """, (LIVE_TABLE,))
+    constraints = cur.fetchall()
+    cur.execute("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = %s::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid);
+    """, (LIVE_TABLE,))
+    indexes = cur.fetchall()
+
+    # Build under temporary names; the originals still belong to the live table
+    for name, definition in constraints:
+        cur.execute(f'ALTER TABLE {SHADOW_TABLE} ADD CONSTRAINT "{name}_shadow" {definition};')
+    for name, definition in indexes:
+        definition = definition.replace(f"INDEX {name} ON ", f"INDEX {name}_shadow ON ", 1)
+        definition = re.sub(rf" ON (\S+\.)?{LIVE_TABLE} ", f" ON {SHADOW_TABLE} ", definition, count=1)
+        cur.execute(definition)
+    cur.execute(f"ANALYZE {SHADOW_TABLE};")
+
+    cur.execute("SELECT pg_get_serial_sequence(%s, 'p_id');", (LIVE_TABLE,))
+    sequence = cur.fetchone()[0]
+    cur.execute(f"ALTER TABLE {LIVE_TABLE} RENAME TO {LIVE_TABLE}_old;")
+    cur.execute(f"ALTER TABLE {SHADOW_TABLE} RENAME TO {LIVE_TABLE};")
+    # Keep the p_id sequence alive when the old table is dropped
+    cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {LIVE_TABLE}.p_id;")
+    cur.execute(f"DROP TABLE {LIVE_TABLE}_old;")
+    for name, _ in constraints:
+        cur.execute(f'ALTER TABLE {LIVE_TABLE} RENAME CONSTRAINT "{name}_shadow" TO "{name}";')
+    for name, _ in indexes:
+        cur.execute(f'ALTER INDEX "{name}_shadow" RENAME TO "{name}";')
+
+
+def load_data(dbname=None, file_path=None, mode=None):  # pylint: disable=too-many-statements,too-many-locals,too-many-branches
     """
     Load data into specified database from specified file
 
     Args:
         dbname: Database name (default: 'gradcafe_sample')
         file_path: Path to JSON file (default: 'module_3/sample_data/llm_extend_applicant_data.json')
+        mode: 'delete' to replace rows in place, or 'shadow' to load into a
+            shadow table and swap it in atomically (default: LOAD_MODE)
     """
     # 1. Database connection parameters
     if dbname is None:
         dbname = 'gradcafe_sample'
 
+    mode = mode or LOAD_MODE
+    if mode not in ('delete', 'shadow'):
+        raise ValueError(f"Invalid load mode: {mode}. Use 'delete' or 'shadow'.")
+    target_table = SHADOW_TABLE if mode == 'shadow' else LIVE_TABLE
+
     if file_path is None:
         default_candidates = [
             'src/sample_data/llm_extend_applicant_data.json',
@@ -133,7 +196,9 @@ def load_data(dbname=None, file_path=None):  # pylint: disable=too-many-statemen
         # Fail fast on lock waits instead of hanging CI jobs
         cur.execute("SET lock_timeout = '5s';")
 
-        # 2. Prepare table structure
+        # 2. Prepare table structure.  Committed on its own so a shadow load
+        # never holds a lock on the live table while it copies rows; the
+        # column is only added (ACCESS EXCLUSIVE) when it is really missing.
         print("Cleaning up and preparing table schema...")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS gradcafe_main (
@@ -155,8 +220,26 @@ def load_data(dbname=None, file_path=None):  # pylint: disable=too-many-statemen
                 raw_data JSONB
             );
         """)
-        cur.execute("ALTER TABLE gradcafe_main ADD COLUMN IF NOT EXISTS raw_data JSONB;")
-        cur.execute("DELETE FROM gradcafe_main;")
+        cur.execute("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_schema = current_schema()
+                      AND table_name = 'gradcafe_main' AND column_name = 'raw_data'
+                ) THEN
+                    ALTER TABLE gradcafe_main ADD COLUMN raw_data JSONB;
+                END IF;
+            END
+            $$;
+        """)
+        # The scraper's duplicate check probes url once per staged row
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_gradcafe_url ON gradcafe_main (url);")
+        conn.commit()
+        if mode == 'shadow':
+            _prepare_shadow(cur)
+        else:
+            cur.execute("DELETE FROM gradcafe_main;")
 
         # 3. Load and parse JSON file
         print(f"Loading data from: {file_path}")
@@ -386,13 +469,15 @@ def load_data(dbname=None, file_path=None):  # pylint: disable=too-many-statemen
             data_to_insert.append(row)
 
         # 5. Execute batch insert
-        insert_query = """
-            INSERT INTO gradcafe_main (program, comments, date_added, url, status, term, us_or_international,
+        insert_query = f"""
+            INSERT INTO {target_table} (program, comments, date_added, url, status, term, us_or_international,
                                        gpa, gre, gre_v, gre_aw, degree, llm_generated_program,
                                        llm_generated_university, raw_data)
             VALUES %s
         """
         execute_values(cur, insert_query, data_to_insert)
+        if mode == 'shadow':
+            _swap_in_shadow(cur)
 
         conn.commit()
         print(f"Success! Total records imported: {len(records)}")
@@ -300,9 +300,12 @@ def apply_llm_standardization(input_file: str, output_file: Optional[str] = None
 
         sys.path.insert(0, str(llm_dir))
 
-        # Try to import LLM functions
+        # Try to import LLM functions (llama_cpp itself is loaded lazily)
         try:
-            from app import _call_llm
+            from app import _call_llm, llm_dependencies_missing
+            missing = llm_dependencies_missing()
+            if missing:
+                raise ImportError(f"No module named {', '.join(missing)}")
         except ImportError as e:
             print(f"⚠️  LLM dependencies not installed: {e}")
             print("   To use LLM standardization, run:")
@@ -3,16 +3,26 @@
 
 from __future__ import annotations
 
+import codecs
+import hashlib
 import json
 import os
+import queue
 import re
 import sys
 import difflib
-from typing import Any, Dict, List, Tuple
+import importlib.util
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
 
-from flask import Flask, jsonify, request
-from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+# llama_cpp / huggingface_hub are imported lazily (see _new_llm / _model_path)
+# so CLI help and rule-only callers never pay for them.
+if TYPE_CHECKING:
+    from llama_cpp import Llama, LlamaGrammar
 
 app = Flask(__name__)
 
@@ -26,15 +36,48 @@ MODEL_FILE = os.getenv(
     "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
 )
 
+# Local GGUF file; when set (or present under MODEL_DIR) no network is touched
+MODEL_PATH = os.getenv("MODEL_PATH", "")
+MODEL_DIR = os.getenv("MODEL_DIR", "models")
+USE_MMAP = os.getenv("USE_MMAP", "1") != "0"
+WARMUP = os.getenv("WARMUP", "1") != "0"
+
 N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
+# >1 → serve /standardize from a pool of model instances (N_THREADS split evenly)
+N_INSTANCES = int(os.getenv("N_INSTANCES", "1"))
+# Micro-batching: gather rows from concurrent requests for this long (0 → off)
+BATCH_WINDOW_MS = float(os.getenv("BATCH_WINDOW_MS", "5"))
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "64"))
+# Prompt packing: standardize up to PACK_SIZE program strings per completion (1 → off)
+PACK_SIZE = int(os.getenv("PACK_SIZE", "1"))
+# Constrain decoding to the two-key JSON schema (0 → free-form + regex fallback)
+JSON_GRAMMAR = os.getenv("JSON_GRAMMAR", "1") != "0"
+MAX_TOKENS_PER_ROW = int(os.getenv("MAX_TOKENS_PER_ROW", "96"))
+# Batch CLI: fsync the output file every N rows, report progress every N seconds
+FSYNC_EVERY = int(os.getenv("FSYNC_EVERY", "500"))
+PROGRESS_SECONDS = float(os.getenv("PROGRESS_SECONDS", "10"))
 
 CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
 CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
+# Greedy array matcher for packed (multi-row) replies
+JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# GBNF grammars: the model can only emit the exact object (or array of objects)
+# and generation ends at the closing brace/bracket instead of running on.
+_GBNF_COMMON = r"""
+row    ::= "{" ws prog ws "," ws uni ws "}"
+prog   ::= "\"standardized_program\"" ws ":" ws string
+uni    ::= "\"standardized_university\"" ws ":" ws string
+string ::= "\"" ( [^"\\\x00-\x1F] | "\\" ["\\/bfnrt] )* "\""
+ws     ::= [ ]?
+"""
+ROW_GBNF = "root ::= row\n" + _GBNF_COMMON
+ROWS_GBNF = 'root ::= "[" ws row ( ws "," ws row )* ws "]"\n' + _GBNF_COMMON
 
 # ---------------- Canonical lists + abbrev maps ----------------
 def _read_lines(path: str) -> List[str]:
@@ -49,6 +92,30 @@ def _read_lines(path: str) -> List[str]:
 CANON_UNIS = _read_lines(CANON_UNIS_PATH)
 CANON_PROGS = _read_lines(CANON_PROGS_PATH)
 
+
+def _canon_mtimes() -> Tuple[float, float]:
+    """Modification times of the two canonical list files (0.0 if missing)."""
+    return tuple(  # type: ignore[return-value]
+        os.path.getmtime(path) if os.path.exists(path) else 0.0
+        for path in (CANON_UNIS_PATH, CANON_PROGS_PATH)
+    )
+
+
+_CANON_MTIMES = _canon_mtimes()
+
+
+def _reload_canon_if_changed() -> bool:
+    """Re-read the canonical lists if either file changed on disk."""
+    global CANON_UNIS, CANON_PROGS, _CANON_MTIMES
+    mtimes = _canon_mtimes()
+    if mtimes == _CANON_MTIMES:
+        return False
+    CANON_UNIS = _read_lines(CANON_UNIS_PATH)
+    CANON_PROGS = _read_lines(CANON_PROGS_PATH)
+    _CANON_MTIMES = mtimes
+    return True
+
+
 ABBREV_UNI: Dict[str, str] = {
     r"(?i)^mcg(\.|ill)?$": "McGill University",
     r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
@@ -110,33 +177,247 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+PACKED_SYSTEM_PROMPT = (
+    SYSTEM_PROMPT
+    + "\nWhen the input instead provides a list under key `programs`, apply the "
+    "same rules to every entry and return a JSON array ONLY, with exactly one "
+    "object per input entry, in the same order.\n"
+)
+
+PACKED_FEW_SHOT: Tuple[Dict[str, List[str]], List[Dict[str, str]]] = (
+    {"programs": [x_in["program"] for x_in, _ in FEW_SHOTS]},
+    [x_out for _, x_out in FEW_SHOTS],
+)
+
 _LLM: Llama | None = None
+_MODEL_PATH: str | None = None
+_GRAMMARS: Dict[str, LlamaGrammar] = {}
 
 
-def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
-    global _LLM
-    if _LLM is not None:
-        return _LLM
+def _grammar(gbnf: str) -> LlamaGrammar | None:
+    """Parse (once) and return a llama.cpp grammar, or None when disabled."""
+    if not JSON_GRAMMAR:
+        return None
+    if gbnf not in _GRAMMARS:
+        from llama_cpp import LlamaGrammar  # pylint: disable=import-outside-toplevel
+
+        _GRAMMARS[gbnf] = LlamaGrammar.from_string(gbnf, verbose=False)
+    return _GRAMMARS[gbnf]
+
+
+class Metrics:
+    """Thread-safe counters for generated tokens and parse fallbacks."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.completions = 0
+        self.rows = 0
+        self.completion_tokens = 0
+        self.fallbacks = 0
+        self.packed_retries = 0
+
+    def record_completion(self, out: Dict[str, Any]) -> None:
+        """Count one chat completion and the tokens it generated."""
+        tokens = int((out.get("usage") or {}).get("completion_tokens") or 0)
+        with self._lock:
+            self.completions += 1
+            self.completion_tokens += tokens
+
+    def record_rows(self, rows: int) -> None:
+        """Count ``rows`` program strings that got their final result."""
+        with self._lock:
+            self.rows += rows
+
+    def record_fallback(self) -> None:
+        """Count a row whose reply was unparseable (rules-only result)."""
+        with self._lock:
+            self.fallbacks += 1
 
-    model_path = hf_hub_download(
+    def record_packed_retry(self) -> None:
+        """Count a packed entry that had to be re-run on its own."""
+        with self._lock:
+            self.packed_retries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals plus tokens-per-row and fallback rate."""
+        with self._lock:
+            rows = max(self.rows, 1)
+            return {
+                "grammar": JSON_GRAMMAR,
+                "completions": self.completions,
+                "rows": self.rows,
+                "completion_tokens": self.completion_tokens,
+                "tokens_per_row": round(self.completion_tokens / rows, 2),
+                "fallbacks": self.fallbacks,
+                "fallback_rate": round(self.fallbacks / rows, 4),
+                "packed_retries": self.packed_retries,
+            }
+
+
+METRICS = Metrics()
+
+
+def llm_dependencies_missing() -> List[str]:
+    """Names of LLM packages that are not installed (checked without importing)."""
+    return [
+        name
+        for name in ("llama_cpp", "huggingface_hub")
+        if importlib.util.find_spec(name) is None
+    ]
+
+
+def _model_path() -> str:
+    """Resolve the GGUF file: MODEL_PATH, then MODEL_DIR, then Hugging Face."""
+    global _MODEL_PATH
+    if _MODEL_PATH is not None:
+        return _MODEL_PATH
+
+    if MODEL_PATH:
+        if not os.path.isfile(MODEL_PATH):
+            raise FileNotFoundError(f"MODEL_PATH does not exist: {MODEL_PATH}")
+        _MODEL_PATH = MODEL_PATH
+        return _MODEL_PATH
+
+    local = os.path.join(MODEL_DIR, MODEL_FILE)
+    if os.path.isfile(local):
+        _MODEL_PATH = local
+        return _MODEL_PATH
+
+    from huggingface_hub import hf_hub_download  # pylint: disable=import-outside-toplevel
+
+    _MODEL_PATH = hf_hub_download(
         repo_id=MODEL_REPO,
         filename=MODEL_FILE,
-        local_dir="models",
+        local_dir=MODEL_DIR,
         local_dir_use_symlinks=False,
         force_filename=MODEL_FILE,
     )
+    return _MODEL_PATH
 
-    _LLM = Llama(
-        model_path=model_path,
+
+def _new_llm(n_threads: int = N_THREADS) -> Llama:
+    """Initialize a fresh llama.cpp instance using ``n_threads`` CPU threads."""
+    from llama_cpp import Llama  # pylint: disable=import-outside-toplevel
+
+    return Llama(
+        model_path=_model_path(),
         n_ctx=N_CTX,
-        n_threads=N_THREADS,
+        n_threads=n_threads,
         n_gpu_layers=N_GPU_LAYERS,
+        use_mmap=USE_MMAP,
         verbose=False,
     )
+
+
+def _load_llm() -> Llama:
+    """Return the shared single-instance model, loading it on first use."""
+    global _LLM
+    if _LLM is None:
+        _LLM = _new_llm(N_THREADS)
     return _LLM
 
 
+class ModelPool:
+    """K llama.cpp instances fed from one shared request queue.
+
+    Each instance runs on its own thread with ``n_threads // K`` CPU threads,
+    so concurrent HTTP clients are spread across instances instead of
+    serializing on a single model.
+    """
+
+    def __init__(self, n_instances: int, n_threads: int = N_THREADS) -> None:
+        self.n_instances = max(1, n_instances)
+        self.threads_per_instance = max(1, n_threads // self.n_instances)
+        self._jobs: "queue.Queue[Tuple[List[str], Future, bool]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._busy_seconds = [0.0] * self.n_instances
+        self._rows = [0] * self.n_instances
+        self._active = [False] * self.n_instances
+
+        # Load every instance up front so a bad model path fails fast
+        self.llms = [
+            _new_llm(self.threads_per_instance) for _ in range(self.n_instances)
+        ]
+        self._workers = [
+            threading.Thread(
+                target=self._run, args=(idx, llm), name=f"llm-{idx}", daemon=True
+            )
+            for idx, llm in enumerate(self.llms)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _run(self, idx: int, llm: Llama) -> None:
+        """Worker loop: pull one job (a row or a packed group) and standardize it."""
+        while True:
+            program_texts, fut, single = self._jobs.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._active[idx] = True
+            t0 = time.monotonic()
+            try:
+                results = _call_llm_packed(program_texts, llm=llm)
+                fut.set_result(results[0] if single else results)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                fut.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._active[idx] = False
+                    self._busy_seconds[idx] += time.monotonic() - t0
+                    self._rows[idx] += len(program_texts)
+
+    def submit(self, program_text: str) -> Future:
+        """Queue one program string; the future resolves to ``_call_llm`` output."""
+        fut: Future = Future()
+        self._jobs.put(([program_text], fut, True))
+        return fut
+
+    def submit_packed(self, program_texts: List[str]) -> Future:
+        """Queue a packed group; the future resolves to a list of results."""
+        fut: Future = Future()
+        self._jobs.put((list(program_texts), fut, False))
+        return fut
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth plus per-instance row counts and utilization."""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        with self._lock:
+            instances = [
+                {
+                    "instance": idx,
+                    "busy": self._active[idx],
+                    "rows": self._rows[idx],
+                    "busy_seconds": round(self._busy_seconds[idx], 3),
+                    "utilization": round(self._busy_seconds[idx] / elapsed, 4),
+                }
+                for idx in range(self.n_instances)
+            ]
+        return {
+            "instances": self.n_instances,
+            "threads_per_instance": self.threads_per_instance,
+            "queue_depth": self._jobs.qsize(),
+            "uptime_seconds": round(elapsed, 3),
+            "per_instance": instances,
+        }
+
+
+_POOL: ModelPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> ModelPool | None:
+    """Return the shared model pool when ``N_INSTANCES > 1``, else None."""
+    global _POOL
+    if N_INSTANCES <= 1:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ModelPool(N_INSTANCES, N_THREADS)
+    return _POOL
+
+
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
     s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
@@ -205,11 +486,9 @@ def _post_normalize_university(uni: str) -> str:
     return match or u or "Unknown"
 
 
-def _call_llm(program_text: str) -> Dict[str, str]:
-    """Query the tiny LLM and return standardized fields."""
-    llm = _load_llm()
-
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+def _few_shot_messages(system_prompt: str) -> List[Dict[str, str]]:
+    """System prompt followed by the single-row few-shot exchanges."""
+    messages = [{"role": "system", "content": system_prompt}]
     for x_in, x_out in FEW_SHOTS:
         messages.append(
             {"role": "user", "content": json.dumps(x_in, ensure_ascii=False)}
@@ -220,6 +499,35 @@ def _call_llm(program_text: str) -> Dict[str, str]:
                 "content": json.dumps(x_out, ensure_ascii=False),
             }
         )
+    return messages
+
+
+def _validated_fields(obj: Any) -> Tuple[str, str] | None:
+    """Return (program, university) if ``obj`` is a usable model answer."""
+    if not isinstance(obj, dict):
+        return None
+    std_prog = obj.get("standardized_program")
+    std_uni = obj.get("standardized_university")
+    if not isinstance(std_prog, str) or not isinstance(std_uni, str):
+        return None
+    if not std_prog.strip():
+        return None
+    return std_prog.strip(), std_uni.strip()
+
+
+def _normalized_result(std_prog: str, std_uni: str) -> Dict[str, str]:
+    """Apply the post-normalization layer and build the result dict."""
+    return {
+        "standardized_program": _post_normalize_program(std_prog),
+        "standardized_university": _post_normalize_university(std_uni),
+    }
+
+
+def _complete_row(program_text: str, llm: Llama | None = None) -> Dict[str, str]:
+    """Run one single-row completion; the caller accounts for the row."""
+    llm = llm or _load_llm()
+
+    messages = _few_shot_messages(SYSTEM_PROMPT)
     messages.append(
         {
             "role": "user",
@@ -230,25 +538,280 @@ def _call_llm(program_text: str) -> Dict[str, str]:
     out = llm.create_chat_completion(
         messages=messages,
         temperature=0.0,
-        max_tokens=128,
+        max_tokens=MAX_TOKENS_PER_ROW,
         top_p=1.0,
+        grammar=_grammar(ROW_GBNF),
     )
+    METRICS.record_completion(out)
 
     text = (out["choices"][0]["message"]["content"] or "").strip()
     try:
-        match = JSON_OBJ_RE.search(text)
-        obj = json.loads(match.group(0) if match else text)
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            match = JSON_OBJ_RE.search(text)
+            obj = json.loads(match.group(0) if match else text)
         std_prog = str(obj.get("standardized_program", "")).strip()
         std_uni = str(obj.get("standardized_university", "")).strip()
     except Exception:
+        METRICS.record_fallback()
         std_prog, std_uni = _split_fallback(program_text)
 
-    std_prog = _post_normalize_program(std_prog)
-    std_uni = _post_normalize_university(std_uni)
-    return {
-        "standardized_program": std_prog,
-        "standardized_university": std_uni,
-    }
+    return _normalized_result(std_prog, std_uni)
+
+
+def _call_llm(program_text: str, llm: Llama | None = None) -> Dict[str, str]:
+    """Query the tiny LLM and return standardized fields."""
+    result = _complete_row(program_text, llm=llm)
+    METRICS.record_rows(1)
+    return result
+
+
+def _call_llm_packed(
+    program_texts: List[str],
+    llm: Llama | None = None,
+) -> List[Dict[str, str]]:
+    """Standardize several program strings with one chat completion.
+
+    The model is asked for a JSON array with one object per input.  Entries
+    that are missing or fail validation are retried one row at a time with
+    ``_call_llm``, so a bad packed reply never loses rows.
+    """
+    if len(program_texts) <= 1:
+        return [_call_llm(text, llm=llm) for text in program_texts]
+    llm = llm or _load_llm()
+
+    x_in, x_out = PACKED_FEW_SHOT
+    messages = _few_shot_messages(PACKED_SYSTEM_PROMPT)
+    messages.append({"role": "user", "content": json.dumps(x_in, ensure_ascii=False)})
+    messages.append(
+        {"role": "assistant", "content": json.dumps(x_out, ensure_ascii=False)}
+    )
+    messages.append(
+        {
+            "role": "user",
+            "content": json.dumps({"programs": program_texts}, ensure_ascii=False),
+        }
+    )
+
+    out = llm.create_chat_completion(
+        messages=messages,
+        temperature=0.0,
+        max_tokens=MAX_TOKENS_PER_ROW * len(program_texts) + 8,
+        top_p=1.0,
+        grammar=_grammar(ROWS_GBNF),
+    )
+    METRICS.record_completion(out)
+
+    text = (out["choices"][0]["message"]["content"] or "").strip()
+    try:
+        try:
+            items = json.loads(text)
+        except ValueError:
+            match = JSON_ARR_RE.search(text)
+            items = json.loads(match.group(0) if match else text)
+    except Exception:
+        items = []
+    if not isinstance(items, list) or len(items) != len(program_texts):
+        # Misaligned replies cannot be trusted row by row
+        items = []
+
+    results: List[Dict[str, str]] = []
+    for idx, program_text in enumerate(program_texts):
+        fields = _validated_fields(items[idx]) if idx < len(items) else None
+        if fields is None:
+            METRICS.record_packed_retry()
+            results.append(_complete_row(program_text, llm=llm))
+        else:
+            results.append(_normalized_result(*fields))
+    METRICS.record_rows(len(program_texts))
+    return results
+
+
+def _standardize_many(
+    program_texts: List[str],
+    pack_size: int | None = None,
+    llm: Llama | None = None,
+) -> List[Dict[str, str]]:
+    """Standardize a list of strings in packed groups of ``pack_size``."""
+    size = max(1, pack_size or PACK_SIZE)
+    results: List[Dict[str, str]] = []
+    for start in range(0, len(program_texts), size):
+        results.extend(_call_llm_packed(program_texts[start:start + size], llm=llm))
+    return results
+
+
+_READY = threading.Event()
+_STARTUP_LOCK = threading.Lock()
+STARTUP: Dict[str, Any] = {}
+
+
+def _warmup(llm: Llama) -> None:
+    """Run one tiny completion so weights are paged in before real traffic."""
+    messages = _few_shot_messages(SYSTEM_PROMPT)
+    messages.append({"role": "user", "content": json.dumps(FEW_SHOTS[0][0])})
+    llm.create_chat_completion(messages=messages, temperature=0.0, max_tokens=1)
+
+
+def _ensure_ready(warmup: bool | None = None) -> None:
+    """Load the model(s), optionally warm them up, then mark the service ready.
+
+    Safe to call from several threads: the first caller does the work and the
+    rest block until it finishes.
+    """
+    if _READY.is_set():
+        return
+    with _STARTUP_LOCK:
+        if _READY.is_set():
+            return
+        t0 = time.perf_counter()
+        pool = _get_pool()
+        llms = pool.llms if pool else [_load_llm()]
+        STARTUP["model_path"] = _model_path()
+        STARTUP["load_seconds"] = round(time.perf_counter() - t0, 3)
+        do_warmup = WARMUP if warmup is None else warmup
+        if do_warmup:
+            t1 = time.perf_counter()
+            for llm in llms:
+                _warmup(llm)
+            STARTUP["warmup_seconds"] = round(time.perf_counter() - t1, 3)
+        _READY.set()
+
+
+class MicroBatcher:
+    """Gather rows from concurrent requests for a few ms and dispatch them together.
+
+    Identical program strings inside one batch are standardized once and the
+    result is fanned out to every waiting request.  With a model pool the
+    batch is spread across instances; otherwise rows run on the shared model.
+    """
+
+    def __init__(self, window_ms: float, max_rows: int) -> None:
+        self.window_s = max(window_ms, 0.0) / 1000.0
+        self.max_rows = max(1, max_rows)
+        self._pending: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._rows_in = 0
+        self._rows_dispatched = 0
+        self._thread = threading.Thread(
+            target=self._run, name="llm-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, program_text: str) -> Future:
+        """Queue one program string; the future resolves to ``_call_llm`` output."""
+        fut: Future = Future()
+        self._pending.put((program_text, fut))
+        return fut
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        """Block for the first row, then keep gathering until the window closes."""
+        batch = [self._pending.get()]
+        deadline = time.monotonic() + self.window_s
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Dispatcher loop: collect, dedupe, dispatch, fan results out."""
+        while True:
+            waiters: Dict[str, List[Future]] = {}
+            for program_text, fut in self._collect():
+                waiters.setdefault(program_text, []).append(fut)
+            with self._lock:
+                self._batches += 1
+                self._rows_in += sum(len(futs) for futs in waiters.values())
+                self._rows_dispatched += len(waiters)
+            self._dispatch(waiters)
+
+    @staticmethod
+    def _resolve(group: List[List[Future]], result: Future) -> None:
+        """Copy a finished packed result (or error) to every waiting request."""
+        exc = result.exception()
+        for idx, futures in enumerate(group):
+            for fut in futures:
+                if exc is not None:
+                    fut.set_exception(exc)
+                else:
+                    fut.set_result(dict(result.result()[idx]))
+
+    def _dispatch(self, waiters: Dict[str, List[Future]]) -> None:
+        """Send one deduped batch to the pool, or run it on the shared model.
+
+        Unique strings are grouped ``PACK_SIZE`` at a time so each group costs
+        one completion when prompt packing is enabled.
+        """
+        pool = _get_pool()
+        texts = list(waiters)
+        size = max(1, PACK_SIZE)
+        for start in range(0, len(texts), size):
+            chunk = texts[start:start + size]
+            group = [waiters[text] for text in chunk]
+            if pool is not None:
+                pool.submit_packed(chunk).add_done_callback(
+                    lambda done, grp=group: self._resolve(grp, done)
+                )
+                continue
+            done: Future = Future()
+            try:
+                done.set_result(_call_llm_packed(chunk))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                done.set_exception(exc)
+            self._resolve(group, done)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts and how many rows deduplication saved."""
+        with self._lock:
+            return {
+                "window_ms": self.window_s * 1000.0,
+                "max_rows": self.max_rows,
+                "pending": self._pending.qsize(),
+                "batches": self._batches,
+                "rows_in": self._rows_in,
+                "rows_dispatched": self._rows_dispatched,
+                "rows_deduped": self._rows_in - self._rows_dispatched,
+            }
+
+
+_BATCHER: MicroBatcher | None = None
+_BATCHER_LOCK = threading.Lock()
+
+
+def _get_batcher() -> MicroBatcher | None:
+    """Return the shared micro-batcher when ``BATCH_WINDOW_MS > 0``, else None."""
+    global _BATCHER
+    if BATCH_WINDOW_MS <= 0:
+        return None
+    with _BATCHER_LOCK:
+        if _BATCHER is None:
+            _BATCHER = MicroBatcher(BATCH_WINDOW_MS, MAX_BATCH_ROWS)
+    return _BATCHER
+
+
+def _standardize_iter(program_texts: List[str]) -> Iterator[Dict[str, str]]:
+    """Yield standardized fields in input order as each row becomes ready."""
+    scheduler = _get_batcher() or _get_pool()
+    if scheduler is None:
+        for program_text in program_texts:
+            yield _call_llm(program_text)
+        return
+    futures = [scheduler.submit(program_text) for program_text in program_texts]
+    for fut in futures:
+        yield fut.result()
+
+
+def _wants_stream() -> bool:
+    """True when the client asked for NDJSON (``?stream=1`` or Accept header)."""
+    if request.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return True
+    return request.accept_mimetypes.best == "application/x-ndjson"
 
 
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
@@ -262,25 +825,202 @@ def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
 
 @app.get("/")
 def health() -> Any:
-    """Simple liveness check."""
-    return jsonify({"ok": True})
+    """Readiness check: 503 until the model is loaded and warmed up."""
+    ready = _READY.is_set()
+    return jsonify({"ok": ready, "ready": ready, **STARTUP}), 200 if ready else 503
 
 
 @app.post("/standardize")
 def standardize() -> Any:
-    """Standardize rows from an HTTP request and return JSON."""
+    """Standardize rows from an HTTP request and return JSON (or NDJSON)."""
     payload = request.get_json(force=True, silent=True)
     rows = _normalize_input(payload)
 
-    out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        row["llm-generated-university"] = result["standardized_university"]
-        out.append(row)
+    texts = [(row or {}).get("program") or "" for row in rows]
+    _ensure_ready()
+    results = _standardize_iter(texts)
+
+    def _annotated() -> Iterator[Dict[str, Any]]:
+        for row, result in zip(rows, results):
+            row["llm-generated-program"] = result["standardized_program"]
+            row["llm-generated-university"] = result["standardized_university"]
+            yield row
+
+    if _wants_stream():
+        lines = (json.dumps(row, ensure_ascii=False) + "\n" for row in _annotated())
+        return Response(
+            stream_with_context(lines), mimetype="application/x-ndjson"
+        )
+
+    return jsonify({"rows": list(_annotated())})
+
+
+@app.get("/pool")
+def pool_stats() -> Any:
+    """Report queue depth and per-instance utilization of the model pool."""
+    pool = _get_pool()
+    if pool is None:
+        return jsonify({"enabled": False, "instances": 1})
+    return jsonify({"enabled": True, **pool.stats()})
 
-    return jsonify({"rows": out})
+
+@app.post("/normalize")
+def normalize() -> Any:
+    """Re-apply only the post-normalization layer to already-stored values.
+
+    Body: ``{"programs": [...], "universities": [...]}`` of distinct strings.
+    Returns ``{"programs": {old: new}, "universities": {old: new}}``.  No
+    model is involved, so this is cheap enough to remap a whole table after
+    the canonical lists are edited.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    reloaded = _reload_canon_if_changed()
+    programs = [p for p in payload.get("programs") or [] if isinstance(p, str)]
+    universities = [u for u in payload.get("universities") or [] if isinstance(u, str)]
+    return jsonify(
+        {
+            "canon_reloaded": reloaded,
+            "programs": {p: _post_normalize_program(p) for p in set(programs)},
+            "universities": {
+                u: _post_normalize_university(u) for u in set(universities)
+            },
+        }
+    )
+
+
+@app.get("/stats")
+def stats() -> Any:
+    """Scheduler statistics: model pool and micro-batcher."""
+    pool = _get_pool()
+    batcher = _get_batcher()
+    return jsonify(
+        {
+            "pool": pool.stats() if pool else None,
+            "batcher": batcher.stats() if batcher else None,
+            "metrics": METRICS.snapshot(),
+        }
+    )
+
+
+LLM_OUTPUT_KEYS = ("llm-generated-program", "llm-generated-university")
+
+
+def _row_key(row: Dict[str, Any]) -> str:
+    """Resume key for a row: its URL, else a hash of its input fields."""
+    for key in ("url", "Url", "URL"):
+        if row.get(key):
+            return f"url:{row[key]}"
+    content = {k: v for k, v in row.items() if k not in LLM_OUTPUT_KEYS}
+    digest = hashlib.sha1(
+        json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return f"sha1:{digest}"
+
+
+def _scan_done_rows(out_path: str) -> Tuple[set, int]:
+    """Keys of rows already in an output JSONL plus the size to keep.
+
+    A run killed mid-write can leave a partial last line (no trailing
+    newline, or one that does not parse); it is left out of the size so the
+    caller can truncate it before appending.  An unparseable line with more
+    lines after it was not torn by a crash: it is logged and skipped, and
+    everything after it is kept.
+    """
+    done: set = set()
+    valid_bytes = 0
+    if not os.path.exists(out_path):
+        return done, valid_bytes
+    bad_line = None  # (line number, size) of the last unparseable line
+    with open(out_path, "rb") as f:
+        for lineno, raw in enumerate(f, 1):
+            if bad_line is not None:
+                print(
+                    f"[standardize] skipping unparseable line {bad_line[0]} of {out_path}",
+                    file=sys.stderr,
+                    flush=True,
+                )
+                valid_bytes += bad_line[1]
+                bad_line = None
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                bad_line = (lineno, len(raw))
+                continue
+            if isinstance(row, dict):
+                done.add(_row_key(row))
+            valid_bytes += len(raw)
+    return done, valid_bytes
+
+
+def _iter_input_rows(path: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[Any, int]]:
+    """Yield ``(row, bytes_read)`` from a JSON array or NDJSON file incrementally.
+
+    JSON arrays are decoded element by element from fixed-size chunks, so
+    the whole file is never held in memory.  The legacy ``{"rows": [...]}``
+    wrapper is still accepted but is loaded in one go.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "rb") as f:
+        head = f.read(chunk_size)
+        first = head.lstrip()[:1]
+        f.seek(0)
+
+        if first == b"{":
+            first_line = f.readline()
+            try:
+                obj = json.loads(first_line)
+            except ValueError:
+                obj = None
+            if isinstance(obj, dict) and not isinstance(obj.get("rows"), list):
+                # NDJSON: one object per line
+                f.seek(0)
+                for raw in f:
+                    if raw.strip():
+                        yield json.loads(raw), f.tell()
+                return
+            f.seek(0)
+            for row in _normalize_input(json.load(f)):
+                yield row, f.tell()
+            return
+
+        if first != b"[":
+            return
+
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        buf = ""
+        pos = 0
+        started = False
+        while True:
+            chunk = f.read(chunk_size)
+            buf = buf[pos:] + utf8.decode(chunk, final=not chunk)
+            pos = 0
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if not started and pos < len(buf) and buf[pos] == "[":
+                    started = True
+                    pos += 1
+                    continue
+                if pos < len(buf) and buf[pos] == "]":
+                    return
+                try:
+                    row, end = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    break  # element spans the chunk boundary; read more
+                pos = end
+                yield row, f.tell()
+            if not chunk:
+                if buf[pos:].strip():
+                    raise ValueError(f"Truncated JSON array in {path}")
+                return
+
+
+def _fmt_eta(seconds: float) -> str:
+    """Format seconds as HH:MM:SS."""
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
 
 
 def _cli_process_file(
@@ -288,11 +1028,17 @@ def _cli_process_file(
     out_path: str | None,
     append: bool,
     to_stdout: bool,
+    resume: bool = False,
+    fsync_every: int | None = None,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
+    """Process a JSON/NDJSON file and write JSONL incrementally.
+
+    With ``resume`` the output file is scanned first and rows whose key
+    (URL, else content hash) is already present are skipped, so an
+    interrupted run picks up where it stopped.
+    """
     # Validate input path to prevent path traversal
     from pathlib import Path
-    import os
     
     # Define allowed directories (current working directory and subdirectories)
     cwd = Path.cwd()
@@ -309,10 +1055,8 @@ def _cli_process_file(
         raise ValueError(
             f"Access denied: {in_path} is outside the working directory"
         ) from exc
-    
-    with open(abs_in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
 
+    done: set = set()
     sink = sys.stdout if to_stdout else None
     if not to_stdout:
         # Validate output path to prevent path traversal
@@ -327,21 +1071,75 @@ def _cli_process_file(
             ) from exc
         if not abs_out_path.parent.exists():
             raise ValueError(f"Output directory does not exist: {abs_out_path.parent}")
-        mode = "a" if append else "w"
-        sink = open(abs_out_path, mode, encoding="utf-8")
+        if resume:
+            done, valid_bytes = _scan_done_rows(str(abs_out_path))
+            if abs_out_path.exists():
+                os.truncate(abs_out_path, valid_bytes)  # drop a torn last line
+        mode = "a" if append or resume else "w"
+        sink = open(abs_out_path, mode, encoding="utf-8", buffering=1 << 20)
 
     assert sink is not None  # for type-checkers
 
-    try:
-        for row in rows:
-            program_text = (row or {}).get("program") or ""
-            result = _call_llm(program_text)
+    fsync_every = max(1, fsync_every or FSYNC_EVERY)
+    total_bytes = max(abs_in_path.stat().st_size, 1)
+    started = time.monotonic()
+    last_report = started
+    written = skipped = since_sync = 0
+
+    def _sync() -> None:
+        sink.flush()
+        if sink is not sys.stdout:
+            os.fsync(sink.fileno())
+
+    def _report(bytes_read: int, final: bool = False) -> None:
+        elapsed = time.monotonic() - started
+        frac = min(bytes_read / total_bytes, 1.0)
+        eta = elapsed * (1 - frac) / frac if frac > 0 else 0.0
+        rate = written / elapsed if elapsed > 0 else 0.0
+        print(
+            f"[standardize] {written} written, {skipped} skipped | "
+            f"{frac:6.1%} | {rate:.1f} rows/s | "
+            + (f"done in {_fmt_eta(elapsed)}" if final else f"ETA {_fmt_eta(eta)}"),
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def _flush_chunk(chunk: List[Dict[str, Any]]) -> None:
+        nonlocal written, since_sync
+        texts = [(row or {}).get("program") or "" for row in chunk]
+        for row, result in zip(chunk, _call_llm_packed(texts)):
             row["llm-generated-program"] = result["standardized_program"]
             row["llm-generated-university"] = result["standardized_university"]
 
             json.dump(row, sink, ensure_ascii=False)
             sink.write("\n")
-            sink.flush()
+        written += len(chunk)
+        since_sync += len(chunk)
+        if since_sync >= fsync_every:
+            _sync()
+            since_sync = 0
+
+    bytes_read = 0
+    try:
+        size = max(1, PACK_SIZE)
+        chunk: List[Dict[str, Any]] = []
+        for row, bytes_read in _iter_input_rows(str(abs_in_path)):
+            row = row or {}
+            if done and _row_key(row) in done:
+                skipped += 1
+                continue
+            chunk.append(row)
+            if len(chunk) >= size:
+                _flush_chunk(chunk)
+                chunk = []
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_SECONDS:
+                _report(bytes_read)
+                last_report = now
+        if chunk:
+            _flush_chunk(chunk)
+        _sync()
+        _report(total_bytes, final=True)
     finally:
         if sink is not sys.stdout:
             sink.close()
@@ -379,15 +1177,66 @@ if __name__ == "__main__":
         action="store_true",
         help="Write JSON Lines to stdout instead of a file.",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip rows already present in the output file (by URL or "
+        "content hash) and append the rest.",
+    )
+    parser.add_argument(
+        "--fsync-every",
+        type=int,
+        default=None,
+        help="fsync the output file every N rows. Defaults to FSYNC_EVERY.",
+    )
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=None,
+        help="Serve from K model instances (N_THREADS split evenly). "
+        "Defaults to N_INSTANCES.",
+    )
+    parser.add_argument(
+        "--pack-size",
+        type=int,
+        default=None,
+        help="Standardize up to N program strings per completion. "
+        "Defaults to PACK_SIZE.",
+    )
+    parser.add_argument(
+        "--model-path",
+        default=None,
+        help="Local GGUF file to load (no network). Defaults to MODEL_PATH.",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Skip the warmup completion before reporting ready.",
+    )
     args = parser.parse_args()
+    if args.resume and args.stdout:
+        parser.error("--resume needs an output file to scan; drop --stdout")
+
+    if args.model_path is not None:
+        MODEL_PATH = args.model_path
+    if args.no_warmup:
+        WARMUP = False
+    if args.instances is not None:
+        N_INSTANCES = args.instances
+    if args.pack_size is not None:
+        PACK_SIZE = args.pack_size
 
     if args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
-        app.run(host="0.0.0.0", port=port, debug=False)
+        # Load + warm up in the background; GET / answers 503 until done
+        threading.Thread(target=_ensure_ready, name="llm-startup", daemon=True).start()
+        app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
     else:
         _cli_process_file(
             in_path=args.file,
             out_path=args.out,
             append=bool(args.append),
             to_stdout=bool(args.stdout),
+            resume=bool(args.resume),
+            fsync_every=args.fsync_every,
         )
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""Throughput benchmarks for the tiny LLM standardizer in app.py."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import app as standardizer
+
+
+def _load_texts(path: str, repeat: int) -> List[str]:
+    """Read program strings from a JSON input file, repeated ``repeat`` times."""
+    with open(path, "r", encoding="utf-8") as f:
+        rows = standardizer._normalize_input(json.load(f))
+    texts = [(row or {}).get("program") or "" for row in rows]
+    return texts * max(1, repeat)
+
+
+def _agreement(results: List[Dict[str, str]], baseline: List[Dict[str, str]]) -> float:
+    """Fraction of rows whose two standardized fields match the baseline."""
+    if not baseline:
+        return 1.0
+    same = sum(1 for got, want in zip(results, baseline) if got == want)
+    return same / len(baseline)
+
+
+def bench_packing(texts: List[str], sizes: List[int]) -> None:
+    """Report rows/sec per pack size and agreement against single-row mode."""
+    standardizer._load_llm()  # keep model load out of the timings
+
+    t0 = time.perf_counter()
+    baseline = standardizer._standardize_many(texts, pack_size=1)
+    base_elapsed = time.perf_counter() - t0
+
+    print(f"{'pack':>5} {'rows':>6} {'seconds':>9} {'rows/sec':>9} {'agree':>7}")
+    print(
+        f"{1:>5} {len(texts):>6} {base_elapsed:>9.2f} "
+        f"{len(texts) / base_elapsed:>9.2f} {1.0:>7.1%}"
+    )
+    for size in sizes:
+        if size <= 1:
+            continue
+        t0 = time.perf_counter()
+        results = standardizer._standardize_many(texts, pack_size=size)
+        elapsed = time.perf_counter() - t0
+        print(
+            f"{size:>5} {len(texts):>6} {elapsed:>9.2f} "
+            f"{len(texts) / elapsed:>9.2f} {_agreement(results, baseline):>7.1%}"
+        )
+    print("metrics:", json.dumps(standardizer.METRICS.snapshot()))
+
+
+def bench_startup() -> None:
+    """Cold-start costs: import, model load, first token, warmup, first row."""
+    code = (
+        "import time; t0 = time.perf_counter(); import app; "
+        "print(time.perf_counter() - t0)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    import_s = float(proc.stdout.strip().splitlines()[-1])
+
+    t0 = time.perf_counter()
+    llm = standardizer._load_llm()
+    load_s = time.perf_counter() - t0
+
+    messages = standardizer._few_shot_messages(standardizer.SYSTEM_PROMPT)
+    messages.append({"role": "user", "content": json.dumps({"program": "Physics, MIT"})})
+    t0 = time.perf_counter()
+    first_token_s = None
+    for _ in llm.create_chat_completion(
+        messages=messages, temperature=0.0, max_tokens=16, stream=True
+    ):
+        if first_token_s is None:
+            first_token_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    standardizer._warmup(llm)
+    warmup_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    standardizer._call_llm("Information, McG")
+    first_row_s = time.perf_counter() - t0
+
+    print(f"model:            {standardizer._model_path()}")
+    print(f"import app:       {import_s * 1000:9.1f} ms")
+    print(f"model load:       {load_s * 1000:9.1f} ms")
+    print(f"first token:      {(first_token_s or 0.0) * 1000:9.1f} ms")
+    print(f"warmup:           {warmup_s * 1000:9.1f} ms")
+    print(f"first row (warm): {first_row_s * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    packing = sub.add_parser(
+        "packing",
+        help="Rows/sec and agreement of packed vs single-row prompts.",
+    )
+    packing.add_argument("--file", default="sample_data.json")
+    packing.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="Repeat the input rows N times to get a stable timing.",
+    )
+    packing.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[2, 4, 8],
+        help="Pack sizes to compare against single-row mode.",
+    )
+
+    sub.add_parser(
+        "startup",
+        help="Import time, model load, first-token latency and warmup cost.",
+    )
+
+    args = parser.parse_args()
+    if args.command == "packing":
+        bench_packing(_load_texts(args.file, args.repeat), args.sizes)
+    elif args.command == "startup":
+        bench_startup()
@@ -118,66 +118,6 @@ def test_clean_string_non_string():
     assert result is None
 
 
-@pytest.mark.db
-def test_get_existing_urls():
-    """Test get_existing_urls retrieves URLs from database."""
-    from data_updater import get_existing_urls
-    import psycopg2
-    
-    # Get database connection parameters
-    conn_params = get_test_db_params()
-    
-    try:
-        conn = psycopg2.connect(**conn_params)
-        conn.autocommit = True
-        cur = conn.cursor()
-        cur.execute("SET lock_timeout = '5s';")
-        
-        # Setup table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS gradcafe_main (
-                p_id SERIAL PRIMARY KEY,
-                program TEXT,
-                comments TEXT,
-                date_added DATE,
-                url TEXT UNIQUE,
-                status TEXT,
-                term TEXT,
-                us_or_international TEXT,
-                gpa FLOAT,
-                gre FLOAT,
-                gre_v FLOAT,
-                gre_aw FLOAT,
-                degree TEXT,
-                llm_generated_program TEXT,
-                llm_generated_university TEXT,
-                raw_data JSONB
-            );
-        """)
-        cur.execute("ALTER TABLE gradcafe_main ADD COLUMN IF NOT EXISTS raw_data JSONB;")
-        cur.execute("DELETE FROM gradcafe_main;")
-        
-        # Insert test URLs
-        cur.execute("""
-            INSERT INTO gradcafe_main (url) VALUES ('http://test1.com'), ('http://test2.com');
-        """)
-        conn.commit()
-        
-        # Test function
-        urls = get_existing_urls(dbname='gradcafe_test')
-        assert isinstance(urls, set)
-        assert 'http://test1.com' in urls
-        assert 'http://test2.com' in urls
-        
-        # Cleanup
-        cur.execute("DELETE FROM gradcafe_main;")
-        cur.close()
-        conn.close()
-    except Exception as e:
-        # If test database doesn't exist, skip this test
-        pytest.skip(f"Test database not available: {e}")
-
-
 @pytest.mark.db
 def test_get_scraping_status():
     """Test get_scraping_status returns status dict."""
@@ -328,34 +268,12 @@ class TestDataUpdaterOldFormat:
 class TestScrapingWorkflow:
     """Test the scraping and background update workflow"""
     
-    def test_get_existing_urls_success(self, test_db):
-        """Test retrieving existing URLs from database"""
-        # First add some records
-        records = [
-            {'applicant_status': 'Accepted', 'url': 'http://test1.com', 'program': 'CS'},
-            {'applicant_status': 'Rejected', 'url': 'http://test2.com', 'program': 'EE'}
-        ]
-        add_new_records_to_db(records, dbname='gradcafe_test')
-        
-        # Now get existing URLs
-        from data_updater import get_existing_urls
-        urls = get_existing_urls(dbname='gradcafe_test')
-        assert 'http://test1.com' in urls
-        assert 'http://test2.com' in urls
-    
-    def test_get_existing_urls_database_error(self):
-        """Test error handling when database doesn't exist"""
-        from data_updater import get_existing_urls
-        urls = get_existing_urls(dbname='nonexistent_database')
-        assert urls == set()
-    
     @patch('data_updater.GradCafeScraper')
     @patch('data_updater.GradCafeDataCleaner')
     @patch('data_updater.apply_llm_standardization')
-    @patch('data_updater.get_existing_urls')
     @patch('data_updater.add_new_records_to_db')
     def test_scrape_and_update_background_success(
-        self, mock_add_records, mock_get_urls, mock_llm, 
+        self, mock_add_records, mock_llm, 
         mock_cleaner_class, mock_scraper_class, test_db
     ):
         """Test successful background scraping workflow"""
@@ -373,7 +291,6 @@ class TestScrapingWorkflow:
         mock_cleaner_class.return_value = mock_cleaner
         
         mock_llm.return_value = True
-        mock_get_urls.return_value = set()  # No existing URLs
         mock_add_records.return_value = 1
         
         # Create temporary extended file for the function to read
@@ -444,18 +361,17 @@ class TestScrapingWorkflow:
         
         with tempfile.TemporaryDirectory() as tmpdir:
             with patch('data_updater.os.path.dirname', return_value=tmpdir):
-                with patch('data_updater.get_existing_urls', return_value=set()):
-                    with patch('data_updater.add_new_records_to_db', return_value=1):
-                        scrape_and_update_background(dbname='gradcafe_test', max_pages=1)
+                with patch('data_updater.add_new_records_to_db', return_value=1):
+                    scrape_and_update_background(dbname='gradcafe_test', max_pages=1)
         
         assert "Successfully added" in scraping_status["status_message"]
     
     @patch('data_updater.GradCafeScraper')
     @patch('data_updater.GradCafeDataCleaner')
     @patch('data_updater.apply_llm_standardization')
-    @patch('data_updater.get_existing_urls')
+    @patch('data_updater.add_new_records_to_db')
     def test_scrape_and_update_background_no_new_records(
-        self, mock_get_urls, mock_llm, mock_cleaner_class, 
+        self, mock_add_records, mock_llm, mock_cleaner_class, 
         mock_scraper_class, test_db
     ):
         """Test when all scraped URLs already exist in database"""
@@ -468,7 +384,7 @@ class TestScrapingWorkflow:
         mock_cleaner_class.return_value = mock_cleaner
         
         mock_llm.return_value = True
-        mock_get_urls.return_value = {'http://existing.com'}  # URL already exists
+        mock_add_records.return_value = 0  # URL already exists, nothing inserted
         
         with tempfile.TemporaryDirectory() as tmpdir:
             extended_file = os.path.join(tmpdir, 'temp_extended_data.json')
@@ -578,6 +494,22 @@ class TestEdgeCasesDataUpdater:
         count = add_new_records_to_db(mixed_records, dbname='gradcafe_test')
         assert count == 2
     
+    def test_add_records_duplicate_urls_in_one_batch(self, test_db):
+        """Test two records with the same url in one batch insert one row"""
+        records = [
+            {'applicant_status': 'Accepted', 'url': 'http://test-dup.com', 'program': 'CS'},
+            {'applicant_status': 'Rejected', 'url': 'http://test-dup.com', 'program': 'CS'},
+            {'applicant_status': 'Accepted', 'url': None, 'program': 'EE'},
+        ]
+
+        count = add_new_records_to_db(records, dbname='gradcafe_test')
+        assert count == 2
+
+        cur = test_db.cursor()
+        cur.execute("SELECT COUNT(*) FROM gradcafe_main WHERE url = 'http://test-dup.com';")
+        assert cur.fetchone()[0] == 1
+        cur.close()
+
     def test_add_records_with_none_values(self, test_db):
         """Test handling records with None/null values"""
         records = [
@@ -0,0 +1,80 @@
+"""
+Tests for the llm_hosting batch CLI's --resume scan.
+
+These tests verify:
+- A torn last line is truncated before appending
+- An unparseable line in the middle is logged and skipped, not truncated
+"""
+import importlib.util
+import json
+import os
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(__file__), '..', 'src', 'module_2_code',
+                        'llm_hosting', 'app.py')
+
+
+@pytest.fixture(scope='module')
+def llm_app():
+    """The llm_hosting app module (src/app is the Flask package, so load it by path)."""
+    spec = importlib.util.spec_from_file_location('llm_hosting_app', APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _line(url):
+    return json.dumps({'url': url, 'program': 'Computer Science'}) + '\n'
+
+
+@pytest.mark.cli
+def test_scan_drops_only_a_torn_last_line(llm_app, tmp_path):
+    """A last line without a newline is left out of the size to keep."""
+    out = tmp_path / 'out.jsonl'
+    out.write_text(_line('u1') + _line('u2') + '{"url": "u3", "prog')
+
+    done, valid_bytes = llm_app._scan_done_rows(str(out))
+
+    assert done == {'url:u1', 'url:u2'}
+    assert valid_bytes == len(_line('u1') + _line('u2'))
+
+
+@pytest.mark.cli
+def test_scan_drops_an_unparseable_last_line(llm_app, tmp_path):
+    """A complete but unparseable last line is treated as torn too."""
+    out = tmp_path / 'out.jsonl'
+    out.write_text(_line('u1') + '{"url": "u2"\n')
+
+    done, valid_bytes = llm_app._scan_done_rows(str(out))
+
+    assert done == {'url:u1'}
+    assert valid_bytes == len(_line('u1'))
+
+
+@pytest.mark.cli
+def test_resume_skips_a_corrupt_middle_line(llm_app, tmp_path, monkeypatch, capsys):
+    """Rows after a corrupt middle line are kept and not reprocessed."""
+    rows = [{'url': f'u{i}', 'program': 'Computer Science'} for i in range(1, 5)]
+    (tmp_path / 'in.json').write_text(json.dumps(rows))
+    out = tmp_path / 'in.json.jsonl'
+    kept = _line('u1') + 'not json\n' + _line('u3')
+    out.write_text(kept + '{"url": "u4", "pro')
+
+    calls = []
+
+    def fake_llm(texts, llm=None):
+        calls.append(len(texts))
+        return [{'standardized_program': t, 'standardized_university': 'X'} for t in texts]
+
+    monkeypatch.setattr(llm_app, '_call_llm_packed', fake_llm)
+    monkeypatch.chdir(tmp_path)
+
+    llm_app._cli_process_file('in.json', None, append=False, to_stdout=False, resume=True)
+
+    text = out.read_text()
+    assert text.startswith(kept)
+    appended = [json.loads(line)['url'] for line in text[len(kept):].splitlines()]
+    assert appended == ['u2', 'u4']
+    assert sum(calls) == 2
+    assert 'skipping unparseable line 2' in capsys.readouterr().err
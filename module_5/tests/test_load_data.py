@@ -593,3 +593,131 @@ class TestLoadDataHelperFunctions:
             assert gre is None
         finally:
             os.unlink(temp_file)
+
+
+@pytest.mark.db
+class TestLoadDataShadowMode:
+    """Test the shadow-table reload and rename swap"""
+
+    def _write(self, urls):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump([{'applicant_status': 'Accepted', 'program': 'CS', 'url': u} for u in urls], f)
+            return f.name
+
+    def test_shadow_reload_replaces_rows_and_keeps_keys(self, test_db):
+        """Test two shadow reloads swap in the new rows with the same constraints"""
+        first = self._write(['http://shadow-1.com', 'http://shadow-2.com'])
+        second = self._write(['http://shadow-3.com'])
+        try:
+            load_data(dbname='gradcafe_test', file_path=first, mode='shadow')
+            load_data(dbname='gradcafe_test', file_path=second, mode='shadow')
+
+            conn = psycopg2.connect(**get_test_db_params())
+            cur = conn.cursor()
+            cur.execute("SELECT url FROM gradcafe_main")
+            urls = [row[0] for row in cur.fetchall()]
+            cur.execute("""
+                SELECT contype FROM pg_constraint
+                WHERE conrelid = 'gradcafe_main'::regclass ORDER BY contype
+            """)
+            kinds = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT to_regclass('gradcafe_main_shadow'), to_regclass('gradcafe_main_old')")
+            leftovers = cur.fetchone()
+            cur.execute("SELECT pg_get_serial_sequence('gradcafe_main', 'p_id')")
+            sequence = cur.fetchone()[0]
+            cur.close()
+            conn.close()
+
+            assert urls == ['http://shadow-3.com']
+            assert kinds == ['p', 'u']
+            assert leftovers == (None, None)
+            assert sequence is not None
+        finally:
+            os.unlink(first)
+            os.unlink(second)
+
+    def test_url_index_survives_reloads(self, test_db):
+        """Test load_data creates idx_gradcafe_url and a shadow swap keeps it"""
+        path = self._write(['http://index-1.com'])
+        try:
+            conn = psycopg2.connect(**get_test_db_params())
+            cur = conn.cursor()
+            query = """SELECT indexdef FROM pg_indexes
+                       WHERE tablename = 'gradcafe_main' AND indexname = 'idx_gradcafe_url'"""
+            load_data(dbname='gradcafe_test', file_path=path)
+            cur.execute(query)
+            after_load = cur.fetchone()
+            load_data(dbname='gradcafe_test', file_path=path, mode='shadow')
+            cur.execute(query)
+            after_swap = cur.fetchone()
+            cur.close()
+            conn.close()
+
+            assert after_load is not None and '(url)' in after_load[0]
+            assert after_swap is not None and '(url)' in after_swap[0]
+        finally:
+            os.unlink(path)
+
+    def test_shadow_load_does_not_block_readers(self, test_db):
+        """Test gradcafe_main stays readable while rows are loaded into the shadow"""
+        import load_data as load_data_module
+
+        seed = self._write(['http://reader-1.com'])
+        reload_file = self._write(['http://reader-2.com', 'http://reader-3.com'])
+        seen = []
+        real_swap = load_data_module._swap_in_shadow
+
+        def _read_then_swap(cur):
+            # The loader's transaction is still open here: every row is in the
+            # shadow table and nothing has been swapped yet
+            reader = psycopg2.connect(**get_test_db_params())
+            try:
+                reader_cur = reader.cursor()
+                reader_cur.execute("SET lock_timeout = '1s';")
+                reader_cur.execute("SELECT url FROM gradcafe_main")
+                seen.extend(row[0] for row in reader_cur.fetchall())
+                reader_cur.close()
+            finally:
+                reader.close()
+            real_swap(cur)
+
+        try:
+            load_data(dbname='gradcafe_test', file_path=seed)
+            with patch('load_data._swap_in_shadow', side_effect=_read_then_swap):
+                load_data(dbname='gradcafe_test', file_path=reload_file, mode='shadow')
+
+            conn = psycopg2.connect(**get_test_db_params())
+            cur = conn.cursor()
+            cur.execute("SELECT url FROM gradcafe_main ORDER BY url")
+            urls = [row[0] for row in cur.fetchall()]
+            cur.close()
+            conn.close()
+
+            assert seen == ['http://reader-1.com']
+            assert urls == ['http://reader-2.com', 'http://reader-3.com']
+        finally:
+            os.unlink(seed)
+            os.unlink(reload_file)
+
+    def test_shadow_failure_leaves_live_table(self, test_db):
+        """Test a failed shadow load rolls back without touching gradcafe_main"""
+        good = self._write(['http://live-1.com'])
+        try:
+            load_data(dbname='gradcafe_test', file_path=good)
+            load_data(dbname='gradcafe_test', file_path='/nonexistent/file.json', mode='shadow')
+
+            conn = psycopg2.connect(**get_test_db_params())
+            cur = conn.cursor()
+            cur.execute("SELECT url FROM gradcafe_main")
+            urls = [row[0] for row in cur.fetchall()]
+            cur.close()
+            conn.close()
+
+            assert urls == ['http://live-1.com']
+        finally:
+            os.unlink(good)
+
+    def test_invalid_mode_rejected(self):
+        """Test an unknown load mode raises before connecting"""
+        with pytest.raises(ValueError, match="Invalid load mode"):
+            load_data(dbname='gradcafe_test', file_path='unused.json', mode='truncate')
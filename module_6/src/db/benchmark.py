@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""Bulk-load benchmarks for load_data.py against a live PostgreSQL database."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, Iterator, List
+
+import load_data
+
+# The question catalogue lives with the web service in the source tree.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "web"))
+import query_data  # noqa: E402  (added to sys.path above)
+
+BENCH_TABLE = "gradcafe_bench"
+
+
+def iter_synthetic_records(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Yield ``count`` new-format applicant records with unique URLs."""
+    rng = random.Random(seed)
+    statuses = ["Accepted", "Rejected", "Interview", "Wait listed"]
+    programs = [
+        "Computer Science, Johns Hopkins University",
+        "Mathematics, McGill University",
+        "Physics, University of British Columbia",
+        "Information Studies, University of Toronto",
+    ]
+    universities = [
+        "Johns Hopkins University",
+        "McGill University",
+        "University of British Columbia",
+        "University of Toronto",
+        None,
+    ]
+    for i in range(count):
+        yield {
+            "program": rng.choice(programs),
+            "comments": "synthetic\trow\nwith escapes \\ " * rng.randint(0, 2),
+            "date_added": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+            "url": f"https://www.thegradcafe.com/result/bench-{i}",
+            "applicant_status": rng.choice(statuses),
+            "semester_year_start": rng.choice(["Fall 2025", "Spring 2026", "Fall 2026"]),
+            "citizenship": rng.choice(["American", "International", None]),
+            "gpa": f"GPA {rng.uniform(2.5, 4.0):.2f}",
+            "gre": f"GRE {rng.randint(290, 340)}",
+            "gre_v": rng.randint(140, 170),
+            "gre_aw": round(rng.uniform(2.5, 6.0), 1),
+            "masters_or_phd": rng.choice(["Masters", "PhD"]),
+            "llm-generated-university": rng.choice(universities),
+            "result_id": i,
+            "scraped_at": "2026-01-15T12:00:00Z",
+        }
+
+
+def synthetic_records(count: int, seed: int = 0) -> List[Dict]:
+    """Generate ``count`` new-format applicant records with unique URLs."""
+    return list(iter_synthetic_records(count, seed))
+
+
+def _reset_table(cur) -> None:
+    """(Re)create the scratch table with the same columns and indexes as gradcafe_main."""
+    cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+    cur.execute(f"CREATE TABLE {BENCH_TABLE} (LIKE gradcafe_main INCLUDING ALL);")
+
+
+def _time_load(conn, rows: List[tuple], loader: Callable) -> float:
+    """Load ``rows`` into a fresh scratch table with ``loader`` and return seconds."""
+    cur = conn.cursor()
+    _reset_table(cur)
+    conn.commit()
+    t0 = time.perf_counter()
+    loader(cur, rows)
+    conn.commit()
+    elapsed = time.perf_counter() - t0
+    cur.close()
+    return elapsed
+
+
+def bench_copy(records: List[Dict], dbname: str | None, repeat: int) -> None:
+    """Rows/sec of the execute_values path vs COPY FROM STDIN + merge."""
+    rows = [load_data.record_to_row(r) for r in records]
+    conn = load_data.get_db_connection(dbname)
+    try:
+        load_data.ensure_schema(conn)
+        paths = {
+            "execute_values": lambda cur, r: load_data.insert_rows(cur, r, BENCH_TABLE),
+            "copy": lambda cur, r: load_data.copy_rows(cur, r, BENCH_TABLE),
+        }
+        print(f"{'path':>15} {'rows':>9} {'seconds':>9} {'rows/sec':>11}")
+        for name, loader in paths.items():
+            best = min(_time_load(conn, rows, loader) for _ in range(max(1, repeat)))
+            print(f"{name:>15} {len(rows):>9} {best:>9.2f} {len(rows) / best:>11.0f}")
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def _run_sql(dbname: str | None, action: Callable) -> None:
+    """Run ``action(cur)`` on a short-lived connection (none is held across fork)."""
+    conn = load_data.get_db_connection(dbname)
+    try:
+        load_data.ensure_schema(conn)
+        cur = conn.cursor()
+        action(cur)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def bench_parallel(records: List[Dict], dbname: str | None, max_processes: int) -> None:
+    """Rows/sec of load_parallel() for 1..max_processes worker processes."""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+        path = f.name
+    try:
+        print(f"{'procs':>5} {'rows':>9} {'seconds':>9} {'rows/sec':>11} {'speedup':>8}")
+        base = None
+        for processes in range(1, max(1, max_processes) + 1):
+            _run_sql(dbname, _reset_table)
+            t0 = time.perf_counter()
+            inserted, _ = load_data.load_parallel(path, dbname, processes, BENCH_TABLE)
+            elapsed = time.perf_counter() - t0
+            base = base or elapsed
+            print(f"{processes:>5} {inserted:>9} {elapsed:>9.2f} "
+                  f"{inserted / elapsed:>11.0f} {base / elapsed:>7.2f}x")
+        _run_sql(dbname, lambda cur: cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};"))
+    finally:
+        os.unlink(path)
+
+
+def bench_raw_data(records: List[Dict], dbname: str | None) -> None:
+    """Table and index size with full raw_data, then after compact_raw_data()."""
+    rows = [load_data.record_to_row(r) for r in records]
+    _run_sql(dbname, _reset_table)
+    _run_sql(dbname, lambda cur: load_data.copy_rows(cur, rows, BENCH_TABLE))
+    updated, before, after = load_data.compact_raw_data(dbname, BENCH_TABLE)
+    print(f"compacted {updated} of {len(rows)} rows (RAW_DATA_MODE={load_data.RAW_DATA_MODE})")
+    print(f"{'part':>8} {'full MB':>10} {'lean MB':>10} {'saved':>7}")
+    for part in ("heap", "indexes", "total"):
+        saved = 1 - after[part] / before[part] if before[part] else 0.0
+        print(f"{part:>8} {before[part] / 2**20:>10.1f} {after[part] / 2**20:>10.1f} {saved:>7.1%}")
+    _run_sql(dbname, lambda cur: cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};"))
+
+
+# Index sets compared by bench_indexes(), as load_data (suffix, definition)
+# pairs.  Both keep url UNIQUE and the primary key.
+INDEXES_BEFORE = (("url", "(url)"), ("date", "(date_added)"))
+INDEXES_AFTER = (("date", "(date_added)"),) + load_data.WORKLOAD_INDEXES
+
+
+def _create_bench_table(cur, indexes) -> None:
+    """Scratch copy of gradcafe_main's columns and keys with the given extra indexes."""
+    cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+    cur.execute(f"CREATE TABLE {BENCH_TABLE} (LIKE gradcafe_main INCLUDING DEFAULTS INCLUDING GENERATED);")
+    cur.execute(f"ALTER TABLE {BENCH_TABLE} ADD PRIMARY KEY (p_id), ADD UNIQUE (url);")
+    load_data.create_indexes(cur, indexes, BENCH_TABLE)
+
+
+def _time_question(cur, key: str, repeat: int) -> tuple:
+    """Best-of-``repeat`` milliseconds and top scan node of one catalogued question."""
+    _, template, params = query_data.QUESTIONS[key]
+    query = query_data.sql.SQL(template).format(table=query_data.sql.Identifier(BENCH_TABLE))
+    cur.execute(query_data.sql.SQL("EXPLAIN (FORMAT JSON) ") + query, params)
+    node = cur.fetchone()[0][0]["Plan"]
+    while "Scan" not in node["Node Type"] and node.get("Plans"):
+        node = node["Plans"][0]
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        cur.execute(query, params)
+        cur.fetchall()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, node["Node Type"]
+
+
+def _time_scalar_pass(cur, repeat: int) -> float:
+    """Best-of-``repeat`` milliseconds of the single FILTER-aggregate pass."""
+    query = query_data.sql.SQL(query_data.SCALAR_SQL).format(
+        table=query_data.sql.Identifier(BENCH_TABLE))
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        cur.execute(query, query_data.SCALAR_PARAMS)
+        cur.fetchall()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def bench_indexes(records: Callable[[], Iterable[Dict]], dbname: str | None, repeat: int) -> None:
+    """
+    Load time, index size and per-question latency with the old index set
+    (duplicate url index) vs the covering/partial workload indexes.
+
+    ``records`` is called once per variant so large synthetic inputs are
+    streamed rather than held in memory.  The table is vacuumed after each
+    load so the visibility map allows index-only scans.
+    """
+    conn = load_data.get_db_connection(dbname)
+    try:
+        load_data.ensure_schema(conn)
+        timings = {}
+        for variant, indexes in (("before", INDEXES_BEFORE), ("after", INDEXES_AFTER)):
+            cur = conn.cursor()
+            _create_bench_table(cur, indexes)
+            conn.commit()
+            rows = (load_data.record_to_row(r) for r in records())
+            t0 = time.perf_counter()
+            inserted, _ = load_data.copy_rows(cur, rows, BENCH_TABLE)
+            conn.commit()
+            load_s = time.perf_counter() - t0
+            conn.autocommit = True
+            cur.execute(f"VACUUM ANALYZE {BENCH_TABLE};")
+            conn.autocommit = False
+            sizes = load_data.table_sizes(cur, BENCH_TABLE)
+            print(f"{variant}: loaded {inserted} rows in {load_s:.1f}s "
+                  f"({inserted / load_s:.0f} rows/sec), indexes {sizes['indexes'] / 2**20:.1f} MB")
+            timings[variant] = {key: _time_question(cur, key, repeat) for key in query_data.QUESTIONS}
+            timings[variant]["scalar pass"] = (_time_scalar_pass(cur, repeat), "Seq Scan")
+            conn.rollback()
+            cur.close()
+
+        print(f"{'question':>12} {'before ms':>10} {'after ms':>10} {'speedup':>8}  after plan")
+        for key, (after_ms, plan) in timings["after"].items():
+            before_ms = timings["before"][key][0]
+            print(f"{key:>12} {before_ms:>10.1f} {after_ms:>10.1f} "
+                  f"{before_ms / after_ms:>7.2f}x  {plan}")
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE};")
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def _load_records(path: str | None, rows: int) -> List[Dict]:
+    """Records from a JSON array file, or ``rows`` synthetic ones when no file is given."""
+    if not path:
+        return synthetic_records(rows)
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    return records if isinstance(records, list) else [records]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dbname", default=None, help="Override the database name.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    copy = sub.add_parser("copy", help="execute_values vs COPY FROM STDIN rows/sec.")
+    copy.add_argument("--file", default=None, help="JSON array of records (default: synthetic).")
+    copy.add_argument("--rows", type=int, default=200_000, help="Synthetic row count.")
+    copy.add_argument("--repeat", type=int, default=3, help="Best of N runs per path.")
+
+    parallel = sub.add_parser("parallel", help="load_parallel() scaling across 1..N processes.")
+    parallel.add_argument("--file", default=None, help="JSON array of records (default: synthetic).")
+    parallel.add_argument("--rows", type=int, default=1_000_000, help="Synthetic row count.")
+    parallel.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                          help="Largest process count to try.")
+
+    raw = sub.add_parser("rawdata", help="Size reduction of lean raw_data after compaction.")
+    raw.add_argument("--file", default=None, help="JSON array of records (default: synthetic).")
+    raw.add_argument("--rows", type=int, default=500_000, help="Synthetic row count.")
+
+    indexes = sub.add_parser("indexes", help="Old vs covering/partial index set: load and query times.")
+    indexes.add_argument("--file", default=None, help="JSON array of records (default: synthetic).")
+    indexes.add_argument("--rows", type=int, default=5_000_000, help="Synthetic row count.")
+    indexes.add_argument("--repeat", type=int, default=3, help="Best of N runs per question.")
+
+    args = parser.parse_args()
+    if args.command == "copy":
+        bench_copy(_load_records(args.file, args.rows), args.dbname, args.repeat)
+    elif args.command == "parallel":
+        bench_parallel(_load_records(args.file, args.rows), args.dbname, args.processes)
+    elif args.command == "rawdata":
+        bench_raw_data(_load_records(args.file, args.rows), args.dbname)
+    elif args.command == "indexes":
+        if args.file:
+            loaded = _load_records(args.file, args.rows)
+            bench_indexes(lambda: loaded, args.dbname, args.repeat)
+        else:
+            bench_indexes(lambda: iter_synthetic_records(args.rows), args.dbname, args.repeat)
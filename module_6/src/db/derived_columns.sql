@@ -0,0 +1,30 @@
+-- gradcafe_main's derived column, computed by PostgreSQL from the row itself
+-- so every writer (COPY, execute_values, UPDATE, psql) keeps it current.
+-- Shared by the db container's init scripts, load_data.ensure_schema and the
+-- worker (the worker image copies this file next to consumer.py).
+--
+-- program_category classifies the program for the CS questions (q8/q9):
+-- "computer science" itself, then the aliases the old ILIKE patterns matched.
+
+-- Databases from before it was generated have a plain column filled by the
+-- row converters; drop it so it can be re-added as generated below (one
+-- table rewrite, then this is a no-op).  university_key was never read.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'gradcafe_main'
+                 AND column_name = 'program_category' AND is_generated = 'NEVER') THEN
+        ALTER TABLE gradcafe_main DROP COLUMN program_category;
+    END IF;
+END $$;
+ALTER TABLE gradcafe_main DROP COLUMN IF EXISTS university_key;
+
+ALTER TABLE gradcafe_main
+    ADD COLUMN IF NOT EXISTS program_category TEXT GENERATED ALWAYS AS (
+        CASE
+            WHEN program ILIKE '%computer science%' THEN 'computer_science'
+            WHEN program ILIKE ANY (ARRAY['%comp sci%', '% cs %',
+                                          '%software engineering%', '%informatics%'])
+                THEN 'cs_related'
+            ELSE 'other'
+        END) STORED;
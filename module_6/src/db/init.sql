@@ -19,15 +19,51 @@ CREATE TABLE IF NOT EXISTS gradcafe_main (
     llm_generated_university TEXT,
     raw_data                JSONB
 );
+-- program_category is a generated column added by
+-- derived_columns.sql, which runs next (01-derived-columns.sql)
 
 -- Watermark table for idempotent incremental scraping
 CREATE TABLE IF NOT EXISTS ingestion_watermarks (
     source      TEXT PRIMARY KEY,
     last_seen   TEXT,
-    updated_at  TIMESTAMPTZ DEFAULT now()
+    updated_at  TIMESTAMPTZ DEFAULT now(),
+    -- Per-file ingestion state (file loads only)
+    file_size     BIGINT,
+    file_mtime_ns BIGINT,
+    content_hash  TEXT,
+    byte_offset   BIGINT
 );
 
--- Index for efficient URL-based duplicate checks
-CREATE INDEX IF NOT EXISTS idx_gradcafe_url ON gradcafe_main (url);
+-- The NOTIFY trigger on ingestion_watermarks is in watermark_notify.sql
+-- (03-watermark-notify.sql)
+
+-- Rows rejected during batched inserts, with the database error text
+CREATE TABLE IF NOT EXISTS ingestion_quarantine (
+    id          SERIAL PRIMARY KEY,
+    source      TEXT,
+    url         TEXT,
+    raw_record  TEXT,
+    error       TEXT,
+    created_at  TIMESTAMPTZ DEFAULT now()
+);
+
+-- Materialized /analysis answers (one row), rewritten by the worker
+CREATE TABLE IF NOT EXISTS analytics_summary (
+    id          SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    results     JSONB NOT NULL,
+    computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- gradcafe_main's row count (gradcafe_stats) is kept by row_counter.sql,
+-- which runs after derived_columns.sql (02-row-counter.sql)
+
+-- URL duplicate checks use the index behind url UNIQUE.  Indexes older schemas
+-- created and no query reads are dropped from existing databases by
+-- load_data.ensure_workload_indexes (UNUSED_INDEXES), which the worker also runs.
 -- Index for date-based watermark queries
 CREATE INDEX IF NOT EXISTS idx_gradcafe_date ON gradcafe_main (date_added);
+-- The summary answers every scalar question in one sequential scan; these
+-- serve the two grouped questions (q5, q11) as index-only scans
+CREATE INDEX IF NOT EXISTS idx_gradcafe_status ON gradcafe_main (status);
+CREATE INDEX IF NOT EXISTS idx_gradcafe_accepted_university ON gradcafe_main (llm_generated_university) INCLUDE (gpa)
+    WHERE status = 'Accepted' AND llm_generated_university IS NOT NULL AND gpa IS NOT NULL;
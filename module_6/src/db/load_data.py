@@ -2,9 +2,13 @@
 Module to load GradCafe data from JSON files into PostgreSQL database.
 Extended with watermark table for idempotent incremental ingestion.
 """
+import codecs
+import hashlib
+import io
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -15,6 +19,57 @@ from dotenv import load_dotenv
 # Load environment variables (don't override existing vars)
 load_dotenv(override=False)
 
+# Bytes read from disk per step when streaming a JSON array.
+READ_CHUNK_BYTES = int(os.getenv("READ_CHUNK_BYTES", str(1 << 16)))
+
+# Rows buffered in memory per COPY round-trip.
+COPY_CHUNK_ROWS = int(os.getenv("COPY_CHUNK_ROWS", "50000"))
+
+# "full" stores the whole source record in raw_data; "lean" keeps only the
+# keys that are not already promoted to their own column.
+RAW_DATA_MODE = os.getenv("RAW_DATA_MODE", "full").lower()
+
+# Source keys (new and legacy formats) that record_to_row() maps to columns.
+PROMOTED_KEYS = frozenset({
+    "program", "comments", "date_added", "url", "applicant_status",
+    "semester_year_start", "citizenship", "gpa", "gre", "gre_v", "gre_aw",
+    "masters_or_phd", "llm-generated-program", "llm-generated-university",
+    "Acceptance Date", "Rejection Date", "University", "Program", "Notes", "Url",
+    "Term", "US/International", "GPA", "GRE General", "GRE Verbal",
+    "GRE Analytical Writing", "Degree", "LLM Generated Program", "LLM Generated University",
+})
+
+# Worker processes for load_data(); 1 keeps the single-connection path.
+LOAD_PROCESSES = int(os.getenv("LOAD_PROCESSES", "1"))
+
+# Insert columns in the order produced by record_to_row().
+ROW_COLUMNS = (
+    "program", "comments", "date_added", "url", "status", "term", "us_or_international",
+    "gpa", "gre", "gre_v", "gre_aw", "degree", "llm_generated_program",
+    "llm_generated_university", "raw_data",
+)
+
+# Indexes for the queries production runs.  /analysis and the worker's
+# summary answer q1-q4 and q6-q10 with one FILTER-aggregate sequential scan
+# (query_data.SCALAR_SQL) that no index helps; only the grouped q5 (counts
+# by status) and q11 (accepted applicants by university) run on their own,
+# and both are index-only scans of a vacuumed table.
+WORKLOAD_INDEXES = (
+    ("status", "(status)"),
+    ("accepted_university",
+     "(llm_generated_university) INCLUDE (gpa) "
+     "WHERE status = 'Accepted' AND llm_generated_university IS NOT NULL AND gpa IS NOT NULL"),
+)
+
+# Index suffixes earlier schemas created that no production query reads;
+# each still cost a write on every COPY merge, so ensure_workload_indexes()
+# drops them (ensure_schema() and the worker both call it; a fresh database
+# from init.sql never had them).  url duplicated the index behind url UNIQUE.
+UNUSED_INDEXES = (
+    "url", "program_trgm", "degree_trgm", "program_category", "university_key",
+    "status_scores", "term", "citizenship",
+)
+
 
 def get_db_connection(dbname=None):
     """
@@ -52,7 +107,7 @@ def ensure_schema(conn):
             program                 TEXT,
             comments                TEXT,
             date_added              DATE,
-            url                     TEXT,
+            url                     TEXT UNIQUE,
             status                  TEXT,
             term                    TEXT,
             us_or_international     TEXT,
@@ -67,6 +122,7 @@ def ensure_schema(conn):
         );
     """)
     cur.execute("ALTER TABLE gradcafe_main ADD COLUMN IF NOT EXISTS raw_data JSONB;")
+    run_schema_file(cur, "derived_columns.sql")
 
     # Watermark table for incremental scraping idempotence
     cur.execute("""
@@ -76,13 +132,100 @@ def ensure_schema(conn):
             updated_at  TIMESTAMPTZ DEFAULT now()
         );
     """)
+    # Per-file ingestion state (see plan_file_load)
+    cur.execute("""
+        ALTER TABLE ingestion_watermarks
+            ADD COLUMN IF NOT EXISTS file_size     BIGINT,
+            ADD COLUMN IF NOT EXISTS file_mtime_ns BIGINT,
+            ADD COLUMN IF NOT EXISTS content_hash  TEXT,
+            ADD COLUMN IF NOT EXISTS byte_offset   BIGINT;
+    """)
 
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_gradcafe_url ON gradcafe_main (url);")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_gradcafe_date ON gradcafe_main (date_added);")
+    ensure_watermark_notify(cur)
+
+    # Rows rejected during batched inserts (see the worker's seed_from_json)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_quarantine (
+            id          SERIAL PRIMARY KEY,
+            source      TEXT,
+            url         TEXT,
+            raw_record  TEXT,
+            error       TEXT,
+            created_at  TIMESTAMPTZ DEFAULT now()
+        );
+    """)
+
+    # Materialized /analysis answers, rewritten by the worker (one row)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_summary (
+            id          SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            results     JSONB NOT NULL,
+            computed_at TIMESTAMPTZ DEFAULT now()
+        );
+    """)
+
+    ensure_row_counter(cur)
+    ensure_workload_indexes(cur)
     conn.commit()
     cur.close()
 
 
+def run_schema_file(cur, name):
+    """
+    Execute one of the SQL files kept next to this module.
+
+    They hold DDL that init.sql, ensure_schema() and the worker all need
+    (the db container runs them as init scripts, the worker image copies
+    them), so it is written once.
+    """
+    cur.execute(Path(__file__).with_name(name).read_text(encoding="utf-8"))
+
+
+def ensure_watermark_notify(cur):
+    """
+    NOTIFY 'ingestion_watermarks' with the row as JSON on every watermark write
+    (watermark_notify.sql).
+
+    The notification is delivered when the writing transaction commits; the
+    web service LISTENs and pushes it to open pages (see web/events.py).
+    """
+    run_schema_file(cur, "watermark_notify.sql")
+
+
+def ensure_row_counter(cur):
+    """
+    Keep gradcafe_main's row count in the gradcafe_stats slots (row_counter.sql).
+
+    Statement-level triggers add each INSERT/DELETE's row count to one of
+    the slots, chosen by backend pid, so concurrent writers rarely wait on
+    the same counter row; readers take the SUM.
+    """
+    run_schema_file(cur, "row_counter.sql")
+
+
+def ensure_workload_indexes(cur):
+    """
+    Bring gradcafe_main's indexes in line with init.sql: drop UNUSED_INDEXES
+    and create the date index and WORKLOAD_INDEXES if they are missing.
+    """
+    for suffix in UNUSED_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS idx_gradcafe_{suffix};")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_gradcafe_date ON gradcafe_main (date_added);")
+    create_indexes(cur, WORKLOAD_INDEXES)
+
+
+def create_indexes(cur, indexes, table="gradcafe_main"):
+    """
+    Create ``(suffix, definition)`` indexes on ``table`` if they are missing.
+
+    Indexes on gradcafe_main are named ``idx_gradcafe_<suffix>``; on any other
+    table (benchmark or scratch copies) ``idx_<table>_<suffix>``.
+    """
+    prefix = "idx_gradcafe" if table == "gradcafe_main" else f"idx_{table}"
+    for suffix, definition in indexes:
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {prefix}_{suffix} ON {table} {definition};")
+
+
 def parse_date(date_str):
     """Convert various date formats to YYYY-MM-DD for PostgreSQL."""
     if not date_str or not isinstance(date_str, str):
@@ -117,6 +260,21 @@ def clean_string(value):
     return value
 
 
+def raw_data_json(r, mode=None):
+    """
+    Serialize a source record for the raw_data column.
+
+    In "lean" mode promoted keys are dropped (None if nothing is left).
+    ``\\u0000`` escapes are stripped because JSONB rejects them; json.dumps
+    never emits a literal NUL, so one replace pass is enough.
+    """
+    if (mode or RAW_DATA_MODE) == "lean":
+        r = {k: v for k, v in r.items() if k not in PROMOTED_KEYS}
+        if not r:
+            return None
+    return json.dumps(r).replace("\\u0000", "")
+
+
 def record_to_row(r):
     """Convert a JSON record (old or new format) to a DB row tuple."""
     is_new_format = any(k in r for k in ("applicant_status", "citizenship", "semester_year_start"))
@@ -179,19 +337,546 @@ def record_to_row(r):
         clean_string(degree) if isinstance(degree, str) else None,
         clean_string(llm_program),
         clean_string(llm_university),
-        json.dumps(r).replace("\x00", "").replace("\\u0000", ""),
+        raw_data_json(r),
     )
 
 
-def load_data(file_path=None, dbname=None, skip_if_populated=True):
+def _iter_json_values(f, chunk_size):
+    """Decode consecutive JSON values from a binary file without reading it whole.
+
+    Leading ``[``, separating commas/whitespace and a closing ``]`` are skipped,
+    so this handles JSON arrays as well as concatenated or pretty-printed
+    objects.  The buffer never holds more than one chunk plus one element.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    while True:
+        chunk = f.read(chunk_size)
+        buf = buf[pos:] + utf8.decode(chunk, final=not chunk).replace("\x00", "")
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,[]":
+                pos += 1
+            if pos >= len(buf):
+                break
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # value spans the chunk boundary; read more
+            pos = end
+            yield value
+        if not chunk:
+            if buf[pos:].strip():
+                raise ValueError("Truncated JSON input")
+            return
+
+
+def _detect_ndjson(f, chunk_size):
+    """Return (is_empty, is_ndjson) for a binary file, leaving it at offset 0."""
+    head = f.read(chunk_size).lstrip()
+    f.seek(0)
+    if not head:
+        return True, False
+    ndjson = False
+    if head[:1] == b"{":
+        try:
+            json.loads(f.readline().decode("utf-8").replace("\x00", ""))
+            ndjson = True
+        except ValueError:
+            pass
+        f.seek(0)
+    return False, ndjson
+
+
+def _iter_ndjson(lines):
+    """Yield dict records from an iterable of NDJSON byte lines, skipping bad ones."""
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace").replace("\x00", "").strip()
+        if line:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def iter_records(file_path, chunk_size=None):
+    """
+    Yield records from a JSON array or NDJSON file in bounded memory.
+
+    JSON arrays (and single or concatenated objects) are decoded element by
+    element from ``chunk_size``-byte reads; NDJSON is read line by line and
+    malformed lines are skipped.  NUL characters are stripped, as before.
+    """
+    chunk_size = chunk_size or READ_CHUNK_BYTES
+    with open(file_path, "rb") as f:
+        empty, ndjson = _detect_ndjson(f, chunk_size)
+        if empty:
+            return
+        if ndjson:
+            yield from _iter_ndjson(f)
+            return
+        for value in _iter_json_values(f, chunk_size):
+            if isinstance(value, dict):
+                yield value
+
+
+def _copy_field(value):
+    """Render one value in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    text = value if isinstance(value, str) else str(value)
+    return (text.replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r"))
+
+
+def _copy_into(cur, rows, stage):
+    """COPY a list of row tuples into ``stage`` through an in-memory text buffer."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_copy_field(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {stage} ({', '.join(ROW_COLUMNS)}) FROM STDIN", buf)
+
+
+def _merge_stage(cur, stage, table):
+    """Merge ``stage`` into ``table`` skipping known URLs; return rows inserted."""
+    columns = ", ".join(ROW_COLUMNS)
+    cur.execute(
+        f"""WITH ins AS (
+                INSERT INTO {table} ({columns})
+                SELECT {columns} FROM {stage}
+                ON CONFLICT (url) DO NOTHING
+                RETURNING 1
+            )
+            SELECT count(*) FROM ins;"""
+    )
+    return cur.fetchone()[0]
+
+
+def _copy_chunk(cur, rows, table):
+    """COPY one chunk of row tuples into the staging table and merge it into ``table``."""
+    _copy_into(cur, rows, "gradcafe_stage")
+    inserted = _merge_stage(cur, "gradcafe_stage", table)
+    cur.execute("TRUNCATE gradcafe_stage;")
+    return inserted
+
+
+def copy_rows(cur, rows, table="gradcafe_main", chunk_rows=None):
+    """
+    Bulk-load row tuples with COPY FROM STDIN via a temp staging table.
+
+    Rows (any iterable of record_to_row() tuples) are buffered in chunks of
+    ``chunk_rows``, streamed into the session-local ``gradcafe_stage`` table and
+    merged into ``table`` with ``ON CONFLICT (url) DO NOTHING``.  The caller
+    owns the transaction.
+
+    Returns:
+        (inserted, seen): rows merged into ``table`` and rows read from ``rows``.
+    """
+    chunk_rows = chunk_rows or COPY_CHUNK_ROWS
+    columns = ", ".join(ROW_COLUMNS)
+    cur.execute(
+        f"""CREATE TEMP TABLE IF NOT EXISTS gradcafe_stage AS
+            SELECT {columns} FROM {table} WITH NO DATA;"""
+    )
+    inserted = seen = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            inserted += _copy_chunk(cur, chunk, table)
+            seen += len(chunk)
+            chunk = []
+    if chunk:
+        inserted += _copy_chunk(cur, chunk, table)
+        seen += len(chunk)
+    return inserted, seen
+
+
+def insert_rows(cur, rows, table="gradcafe_main"):
+    """Insert row tuples with a single execute_values statement (pre-COPY path)."""
+    execute_values(
+        cur,
+        f"""INSERT INTO {table} ({", ".join(ROW_COLUMNS)})
+            VALUES %s
+            ON CONFLICT (url) DO NOTHING""",
+        rows,
+    )
+    return cur.rowcount
+
+
+# ── Parallel partitioned load ───────────────────────────────────────────────
+
+def partition_file(file_path, parts):
+    """
+    Split a JSON array or NDJSON file into byte ranges on record boundaries.
+
+    NDJSON splits on any line start.  Arrays are split on lines that open a
+    top-level element, i.e. ``{`` at the indentation of the first element (raw
+    newlines never occur inside JSON strings, so this is unambiguous for
+    pretty-printed files).  Arrays written on a single line are not split.
+
+    Returns:
+        (ranges, ndjson): list of (start, end) offsets and the detected format.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        empty, ndjson = _detect_ndjson(f, READ_CHUNK_BYTES)
+        if empty:
+            return [], ndjson
+        first = 0
+        prefix = b""
+        if not ndjson:
+            while True:
+                first = f.tell()
+                line = f.readline()
+                if not line or b"{" in line:
+                    break
+            prefix = line[:line.find(b"{") + 1]
+            if not line or prefix.strip() != b"{":
+                return [(0, size)], ndjson  # single-line array: not splittable
+
+        def _is_boundary(line):
+            if ndjson:
+                return bool(line.strip())
+            return line.startswith(prefix)
+
+        bounds = [first]
+        for k in range(1, max(1, parts)):
+            f.seek(first + k * (size - first) // parts)
+            f.readline()  # skip the partial line
+            while True:
+                pos = f.tell()
+                line = f.readline()
+                if not line:
+                    pos = size
+                    break
+                if _is_boundary(line):
+                    break
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:])), ndjson
+
+
+class _RangeReader:
+    """Binary file wrapper whose read() stops at a fixed end offset."""
+
+    def __init__(self, f, end):
+        self._f = f
+        self._end = end
+
+    def read(self, size):
+        """Read at most ``size`` bytes without crossing the end offset."""
+        remaining = self._end - self._f.tell()
+        if remaining <= 0:
+            return b""
+        return self._f.read(min(size, remaining))
+
+    def readline(self):
+        """Read the next line if it starts before the end offset."""
+        if self._f.tell() >= self._end:
+            return b""
+        return self._f.readline()
+
+
+def _iter_range(file_path, start, end, ndjson):
+    """Yield records whose text lies in bytes [start, end) of ``file_path``."""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        if ndjson:
+            yield from _iter_ndjson(iter(_RangeReader(f, end).readline, b""))
+            return
+        for value in _iter_json_values(_RangeReader(f, end), READ_CHUNK_BYTES):
+            if isinstance(value, dict):
+                yield value
+
+
+def _stage_range(task):
+    """
+    Process-pool worker: parse one byte range and COPY it into its own stage.
+
+    Each worker opens its own connection and UNLOGGED staging table, so
+    decoding, record_to_row() and COPY all run in parallel.  Returns the
+    number of rows staged.
+    """
+    file_path, start, end, ndjson, stage, dbname, table = task
+    conn = get_db_connection(dbname)
+    try:
+        cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS {stage};")
+        cur.execute(
+            f"""CREATE UNLOGGED TABLE {stage} AS
+                SELECT {", ".join(ROW_COLUMNS)} FROM {table} WITH NO DATA;"""
+        )
+        staged = 0
+        chunk = []
+        for record in _iter_range(file_path, start, end, ndjson):
+            chunk.append(record_to_row(record))
+            if len(chunk) >= COPY_CHUNK_ROWS:
+                _copy_into(cur, chunk, stage)
+                staged += len(chunk)
+                chunk = []
+        if chunk:
+            _copy_into(cur, chunk, stage)
+            staged += len(chunk)
+        conn.commit()
+        cur.close()
+        return staged
+    finally:
+        conn.close()
+
+
+def _drop_stages(dbname, stages):
+    """Best-effort removal of leftover per-process staging tables."""
+    conn = get_db_connection(dbname)
+    try:
+        cur = conn.cursor()
+        for stage in stages:
+            cur.execute(f"DROP TABLE IF EXISTS {stage};")
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def load_parallel(file_path, dbname=None, processes=None, table="gradcafe_main"):
+    """
+    Load a large file with a process pool, then merge the stages in one step.
+
+    The file is split with partition_file(); each range is parsed and COPYed
+    by its own process into an UNLOGGED staging table, and a single
+    transaction merges all stages into ``table`` (ON CONFLICT (url) DO NOTHING)
+    and drops them.
+
+    Returns:
+        (inserted, staged): rows merged into ``table`` and rows read from the file.
+    """
+    processes = processes or os.cpu_count() or 1
+    ranges, ndjson = partition_file(file_path, processes)
+    stages = [f"gradcafe_stage_{os.getpid()}_{i}" for i in range(len(ranges))]
+    tasks = [
+        (file_path, start, end, ndjson, stage, dbname, table)
+        for (start, end), stage in zip(ranges, stages)
+    ]
+    # Connect only after the pool is done so no connection is shared by fork().
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            staged = sum(pool.map(_stage_range, tasks))
+    except Exception:
+        _drop_stages(dbname, stages)
+        raise
+
+    conn = get_db_connection(dbname)
+    try:
+        cur = conn.cursor()
+        inserted = sum(_merge_stage(cur, stage, table) for stage in stages)
+        for stage in stages:
+            cur.execute(f"DROP TABLE {stage};")
+        conn.commit()
+        cur.close()
+        return inserted, staged
+    except Exception:
+        conn.rollback()
+        _drop_stages(dbname, stages)
+        raise
+    finally:
+        conn.close()
+
+
+# ── Incremental file ingestion ──────────────────────────────────────────────
+
+def file_source(file_path):
+    """Watermark key for a loaded file."""
+    return f"file:{os.path.abspath(file_path)}"
+
+
+def _hash_prefix(file_path, length):
+    """SHA-256 of the first ``length`` bytes of ``file_path``."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(1 << 20, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def plan_file_load(cur, file_path, source=None):
+    """
+    Decide how much of ``file_path`` still needs loading.
+
+    Unchanged files (same size and mtime as recorded) are skipped without
+    being read.  If the bytes up to the recorded offset still hash the same,
+    an NDJSON file resumes at that offset (only the appended tail is read)
+    and a JSON array with identical content is skipped.  Anything else is
+    loaded from the start.
+
+    Returns:
+        None to skip, else (start_offset, ndjson, known) where ``known`` says
+        whether the file had a watermark.
+    """
+    cur.execute(
+        """SELECT file_size, file_mtime_ns, content_hash, byte_offset
+           FROM ingestion_watermarks WHERE source = %s;""",
+        (source or file_source(file_path),),
+    )
+    mark = cur.fetchone()
+    stat = os.stat(file_path)
+    with open(file_path, "rb") as f:
+        _, ndjson = _detect_ndjson(f, READ_CHUNK_BYTES)
+    if not mark or mark[3] is None:
+        return 0, ndjson, False
+    size, mtime_ns, digest, offset = mark
+    if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+        return None
+    if offset <= stat.st_size and _hash_prefix(file_path, offset) == digest:
+        if ndjson:
+            return offset, ndjson, True
+        if offset == stat.st_size:
+            return None
+    return 0, ndjson, True
+
+
+def iter_records_from(file_path, start, ndjson, progress):
+    """
+    Yield records from byte ``start`` and track how far input was consumed.
+
+    ``progress["offset"]`` ends at the end of the last complete NDJSON line
+    (a torn final line that does not parse is left for the next run), or
+    at the file size for JSON arrays.
+    """
+    if not ndjson:
+        yield from iter_records(file_path)
+        progress["offset"] = os.path.getsize(file_path)
+        return
+    progress["offset"] = start
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                try:
+                    json.loads(raw)
+                except ValueError:
+                    return  # still being written
+            progress["offset"] += len(raw)
+            yield from _iter_ndjson([raw])
+
+
+def save_file_watermark(cur, file_path, offset, source=None):
+    """Record size, mtime, prefix hash and consumed offset for ``file_path``."""
+    stat = os.stat(file_path)
+    cur.execute(
+        """INSERT INTO ingestion_watermarks
+               (source, last_seen, updated_at, file_size, file_mtime_ns, content_hash, byte_offset)
+           VALUES (%s, %s, now(), %s, %s, %s, %s)
+           ON CONFLICT (source) DO UPDATE
+           SET last_seen     = EXCLUDED.last_seen,
+               updated_at    = now(),
+               file_size     = EXCLUDED.file_size,
+               file_mtime_ns = EXCLUDED.file_mtime_ns,
+               content_hash  = EXCLUDED.content_hash,
+               byte_offset   = EXCLUDED.byte_offset;""",
+        (source or file_source(file_path), file_path, stat.st_size, stat.st_mtime_ns,
+         _hash_prefix(file_path, offset), offset),
+    )
+
+
+def table_sizes(cur, table="gradcafe_main"):
+    """Heap, index and total on-disk bytes for ``table``."""
+    cur.execute(
+        "SELECT pg_relation_size(%s), pg_indexes_size(%s), pg_total_relation_size(%s);",
+        (table, table, table),
+    )
+    heap, indexes, total = cur.fetchone()
+    return {"heap": heap, "indexes": indexes, "total": total}
+
+
+def compact_raw_data(dbname=None, table="gradcafe_main", batch_size=None, vacuum_full=True):
+    """
+    Migrate existing rows to lean raw_data and reclaim the space.
+
+    Promoted keys are removed from raw_data in keyset-paginated batches (one
+    commit per batch), empty objects become NULL, then the table is
+    vacuumed (FULL by default, which rewrites it and takes an exclusive lock).
+
+    Returns:
+        (updated, before, after): rows rewritten and table_sizes() before/after.
+    """
+    batch_size = batch_size or COPY_CHUNK_ROWS
+    keys = sorted(PROMOTED_KEYS)
+    conn = get_db_connection(dbname)
+    try:
+        cur = conn.cursor()
+        before = table_sizes(cur, table)
+        last_id = 0
+        updated = 0
+        while True:
+            cur.execute(
+                f"""SELECT max(p_id) FROM (
+                        SELECT p_id FROM {table} WHERE p_id > %s ORDER BY p_id LIMIT %s
+                    ) AS page;""",
+                (last_id, batch_size),
+            )
+            upper = cur.fetchone()[0]
+            if upper is None:
+                break
+            cur.execute(
+                f"""UPDATE {table}
+                    SET raw_data = NULLIF(raw_data - %s::text[], '{{}}'::jsonb)
+                    WHERE p_id > %s AND p_id <= %s
+                      AND raw_data ?| %s::text[];""",
+                (keys, last_id, upper, keys),
+            )
+            updated += cur.rowcount
+            conn.commit()
+            last_id = upper
+        conn.autocommit = True
+        cur.execute(f"VACUUM {'FULL ' if vacuum_full else ''}ANALYZE {table};")
+        after = table_sizes(cur, table)
+        cur.close()
+        return updated, before, after
+    finally:
+        conn.close()
+
+
+def invalidate_analytics_summary(cur):
+    """
+    Drop the materialized /analysis answers after loading new rows.
+
+    This script cannot recompute them (the question catalogue lives in the
+    web and worker services), so the web falls back to live queries until
+    the next recompute_analytics task rewrites the row.
+    """
+    cur.execute("DELETE FROM analytics_summary;")
+
+
+def load_data(file_path=None, dbname=None, skip_if_populated=True, processes=None):
     """
     Load applicant data from a JSON file into the PostgreSQL database.
 
     Args:
         file_path: Path to the JSON data file (defaults to DATA_FILE env var).
         dbname: Override database name (uses DATABASE_URL by default).
-        skip_if_populated: Skip insert if table already has rows.
+        skip_if_populated: Honour the file's watermark (skip it if unchanged,
+            read only the appended tail of NDJSON).  A file without a
+            watermark is always read from the start, even into a populated
+            table; rows whose url is already present are skipped by the
+            merge.  False re-reads the whole file regardless.
+        processes: Worker processes (defaults to LOAD_PROCESSES); above 1 uses
+            load_parallel().
     """
+    processes = processes or LOAD_PROCESSES
     if file_path is None:
         file_path = os.getenv("DATA_FILE", "/data/applicant_data.json")
 
@@ -215,56 +900,58 @@ def load_data(file_path=None, dbname=None, skip_if_populated=True):
         ensure_schema(conn)
         cur = conn.cursor()
 
-        if skip_if_populated:
-            cur.execute("SELECT COUNT(*) FROM gradcafe_main;")
-            count = cur.fetchone()[0]
-            if count > 0:
-                print(f"Database already contains {count} records. Skipping initial load.")
-                cur.close()
-                return
-
-        print(f"Loading data from: {file_path}")
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read().replace("\x00", "")
+        plan = plan_file_load(cur, file_path)
+        if plan is None and skip_if_populated:
+            print(f"{file_path} is unchanged since the last load. Skipping.")
+            cur.close()
+            return
+        if plan is None or not skip_if_populated:
+            with open(file_path, "rb") as f:
+                _, ndjson = _detect_ndjson(f, READ_CHUNK_BYTES)
+            start = 0
+        else:
+            start, ndjson, _ = plan
 
-        try:
-            records = json.loads(content)
-            if not isinstance(records, list):
-                records = [records]
-        except json.JSONDecodeError:
-            records = []
-            for line in content.strip().split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        records.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-
-        print(f"Detected {len(records)} records. Starting import...")
-        data_to_insert = [record_to_row(r) for r in records]
-
-        # Insert with ON CONFLICT DO NOTHING if url is provided as natural key
-        insert_query = """
-            INSERT INTO gradcafe_main (
-                program, comments, date_added, url, status, term, us_or_international,
-                gpa, gre, gre_v, gre_aw, degree, llm_generated_program,
-                llm_generated_university, raw_data
-            )
-            VALUES %s
-        """
-        execute_values(cur, insert_query, data_to_insert)
+        print(f"Loading data from: {file_path} (from byte {start})")
+        if processes > 1 and start == 0:
+            cur.close()
+            conn.close()  # forked workers must not inherit a live connection
+            inserted, seen = load_parallel(file_path, dbname, processes)
+            conn = get_db_connection(dbname)
+            cur = conn.cursor()
+            save_file_watermark(cur, file_path, os.path.getsize(file_path))
+            if inserted:
+                invalidate_analytics_summary(cur)
+            conn.commit()
+            print(f"Success! Imported {inserted} of {seen} records with {processes} processes.")
+            return
+        # Records are parsed lazily and COPYed in COPY_CHUNK_ROWS-sized chunks
+        # into a staging table, merged with ON CONFLICT (url) DO NOTHING.
+        progress = {"offset": start}
+        records = iter_records_from(file_path, start, ndjson, progress)
+        inserted, seen = copy_rows(cur, (record_to_row(r) for r in records))
+        save_file_watermark(cur, file_path, progress["offset"])
+        if inserted:
+            invalidate_analytics_summary(cur)
         conn.commit()
-        print(f"Success! Imported {len(data_to_insert)} records.")
+        print(f"Success! Imported {inserted} of {seen} records.")
         cur.close()
     except Exception as exc:  # pylint: disable=broad-exception-caught
         print(f"Error during data load: {exc}")
-        conn.rollback()
+        if not conn.closed:
+            conn.rollback()
         raise
     finally:
         conn.close()
 
 
 if __name__ == "__main__":
-    file_arg = sys.argv[1] if len(sys.argv) > 1 else None
-    load_data(file_path=file_arg, skip_if_populated=True)
+    if len(sys.argv) > 1 and sys.argv[1] == "--compact-raw-data":
+        rows_updated, size_before, size_after = compact_raw_data()
+        print(f"Compacted raw_data in {rows_updated} rows.")
+        for part in ("heap", "indexes", "total"):
+            print(f"  {part:<8} {size_before[part] / 2**20:10.1f} MB -> "
+                  f"{size_after[part] / 2**20:10.1f} MB")
+    else:
+        file_arg = sys.argv[1] if len(sys.argv) > 1 else None
+        load_data(file_path=file_arg, skip_if_populated=True)
@@ -0,0 +1,61 @@
+-- gradcafe_main's row count, kept by statement-level triggers so /worker_status
+-- never runs COUNT(*).  Shared by the db container's init scripts,
+-- load_data.ensure_schema and the worker (the worker image copies this file
+-- next to consumer.py).
+--
+-- The count is sharded over gradcafe_stats rows ("slots") and read as their
+-- SUM.  Each trigger adds the size of its INSERT/DELETE transition table to
+-- the slot picked by its backend pid (one UPDATE per statement, not per row).
+-- A slot's row lock is held until commit, so with a single row every writer
+-- (seed chunks, scrapes, concurrent COPYs) queued behind the others; with
+-- slots, writers in different sessions almost always update different rows.
+-- TRUNCATE zeroes every slot.
+
+-- Before sharding this was a one-row table keyed by id; recreate it
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'gradcafe_stats'
+                 AND column_name = 'id') THEN
+        DROP TABLE gradcafe_stats;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS gradcafe_stats (
+    slot        SMALLINT PRIMARY KEY,
+    row_count   BIGINT NOT NULL DEFAULT 0,
+    updated_at  TIMESTAMPTZ DEFAULT now()
+);
+-- 16 slots; slot 0 starts from a real count the first time
+INSERT INTO gradcafe_stats (slot, row_count)
+SELECT s, CASE WHEN s = 0 THEN (SELECT COUNT(*) FROM gradcafe_main) ELSE 0 END
+FROM generate_series(0, 15) AS s
+WHERE NOT EXISTS (SELECT 1 FROM gradcafe_stats);
+
+CREATE OR REPLACE FUNCTION gradcafe_stats_count() RETURNS trigger AS $$
+DECLARE
+    my_slot INTEGER := pg_backend_pid() % (SELECT COUNT(*) FROM gradcafe_stats);
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE gradcafe_stats
+        SET row_count = row_count + (SELECT COUNT(*) FROM new_rows), updated_at = now()
+        WHERE slot = my_slot;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE gradcafe_stats
+        SET row_count = row_count - (SELECT COUNT(*) FROM old_rows), updated_at = now()
+        WHERE slot = my_slot;
+    ELSE
+        UPDATE gradcafe_stats SET row_count = 0, updated_at = now();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER gradcafe_stats_insert AFTER INSERT ON gradcafe_main
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION gradcafe_stats_count();
+CREATE OR REPLACE TRIGGER gradcafe_stats_delete AFTER DELETE ON gradcafe_main
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION gradcafe_stats_count();
+CREATE OR REPLACE TRIGGER gradcafe_stats_truncate AFTER TRUNCATE ON gradcafe_main
+    FOR EACH STATEMENT EXECUTE FUNCTION gradcafe_stats_count();
@@ -0,0 +1,18 @@
+-- Announce every ingestion_watermarks write on channel 'ingestion_watermarks'
+-- with the row as JSON.  The notification is delivered when the writing
+-- transaction commits; the web service LISTENs and relays it to open pages
+-- as a task_completed event (see web/events.py).  Shared by the db
+-- container's init scripts, load_data.ensure_schema and the worker (the
+-- worker image copies this file next to consumer.py).
+
+CREATE OR REPLACE FUNCTION ingestion_watermarks_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('ingestion_watermarks', json_build_object(
+        'source', NEW.source, 'last_seen', NEW.last_seen, 'updated_at', NEW.updated_at)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER ingestion_watermarks_notify
+    AFTER INSERT OR UPDATE ON ingestion_watermarks
+    FOR EACH ROW EXECUTE FUNCTION ingestion_watermarks_notify();
@@ -5,10 +5,15 @@ Buttons (Pull Data / Update Analysis) publish tasks to RabbitMQ
 and immediately return HTTP 202 "request queued" instead of doing
 synchronous work.  The worker container processes those tasks.
 """
+import hashlib
+import json
+import queue
+
 from flask import Flask, jsonify, render_template, request
 from dotenv import load_dotenv
 
-from query_data import run_all_queries
+from events import EVENTS_HEARTBEAT_SECONDS, EVENTS_RECONNECT_SECONDS, TASK_EVENTS
+from query_data import cached_analysis, data_version
 from publisher import publish_task
 
 load_dotenv(override=False)
@@ -22,13 +27,19 @@ DATABASE_INFO = {
 }
 
 
-def create_app(query_func=None, config=None):
+def create_app(query_func=None, config=None, version_func=None, events=None):
     """
     Application factory.
 
     Args:
-        query_func: Overridable query function (for testing).
-        config:     Optional dict of Flask config overrides.
+        query_func:   Overridable query function (for testing).
+        config:       Optional dict of Flask config overrides.
+        version_func: Overridable data-version probe behind the ETag /
+                      Last-Modified validators.  Defaults to
+                      query_data.data_version when query_func is not
+                      overridden; otherwise validators are off.
+        events:       Overridable task-event hub behind /events
+                      (defaults to events.TASK_EVENTS).
     """
     # When loaded as the app/ package, __name__ == 'app' and root_path is
     # the app/ directory itself, so templates/ and static/ are direct children.
@@ -37,7 +48,49 @@ def create_app(query_func=None, config=None):
     if config:
         app.config.update(config)
 
-    _query_func = query_func or run_all_queries
+    _query_func = query_func or cached_analysis
+    _version_func = version_func or (data_version if query_func is None else None)
+    _events = events or TASK_EVENTS
+
+    # ------------------------------------------------------------------ #
+    #  Conditional GET                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _validators(scope, dbname):
+        """(ETag, Last-Modified) of ``scope`` at the current data version."""
+        if _version_func is None:
+            return None, None
+        try:
+            version = _version_func(dbname)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return None, None
+        if version is None:
+            return None, None
+        tag = "|".join([scope, str(dbname), *(str(part) for part in version)])
+        return hashlib.sha1(tag.encode("utf-8")).hexdigest()[:20], version[0]
+
+    def _not_modified(etag, last_modified):
+        """Whether the request's validators still match the current version."""
+        if etag is None:
+            return False
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+        since = request.if_modified_since
+        return bool(since and last_modified and last_modified.replace(microsecond=0) <= since)
+
+    def _with_validators(response, etag, last_modified):
+        """Attach ETag / Last-Modified (when known) to ``response``."""
+        if etag:
+            response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        return response
+
+    def _response_304(etag, last_modified, cache_control):
+        """Empty 304 carrying the same validators and caching policy."""
+        response = app.response_class(status=304)
+        response.headers["Cache-Control"] = cache_control
+        return _with_validators(response, etag, last_modified)
 
     # ------------------------------------------------------------------ #
     #  Routes                                                              #
@@ -46,11 +99,17 @@ def create_app(query_func=None, config=None):
     @app.route("/")
     @app.route("/analysis")
     def index():
-        """Main analysis page – runs all SQL queries and renders results."""
+        """Main analysis page – renders the materialized analysis answers."""
         dbname = request.args.get("db", "gradcafe")
         if dbname not in DATABASE_INFO:
             dbname = "gradcafe"
 
+        # Revalidate on every load, but answer unchanged data with a bare 304
+        cache_control = "no-cache"
+        etag, last_modified = _validators("analysis", dbname)
+        if _not_modified(etag, last_modified):
+            return _response_304(etag, last_modified, cache_control)
+
         results = _query_func(dbname=dbname)
         resp = render_template(
             "results.html",
@@ -60,9 +119,9 @@ def create_app(query_func=None, config=None):
         )
         from flask import make_response  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
         response = make_response(resp)
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
+        response.headers["Cache-Control"] = cache_control
         response.headers["Pragma"] = "no-cache"
-        return response
+        return _with_validators(response, etag, last_modified)
 
     @app.route("/pull-data", methods=["POST"])
     @app.route("/pull_data", methods=["POST"])
@@ -148,57 +207,75 @@ def create_app(query_func=None, config=None):
     def worker_status():
         """
         Report the current database row count and last ingestion watermark.
-        The frontend polls this to show a live status banner.
+        The frontend polls this to show a live status banner, sending
+        If-None-Match so unchanged status costs one probe and a 304.
         """
+        etag, last_modified = _validators("worker_status", None)
+        if _not_modified(etag, last_modified):
+            return _response_304(etag, last_modified, "no-cache")
         try:
-            from query_data import get_db_connection  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
-            conn = get_db_connection()
-            cur = conn.cursor()
-
-            cur.execute("SELECT COUNT(*) FROM gradcafe_main;")
-            total_records = cur.fetchone()[0]
-
-            cur.execute(
-                "SELECT source, last_seen, updated_at FROM ingestion_watermarks "
-                "ORDER BY updated_at DESC LIMIT 1;"
-            )
-            wm = cur.fetchone()
-
-            cur.execute(
-                "SELECT last_seen, updated_at FROM ingestion_watermarks WHERE source = %s;",
-                ("gradcafe_scraped",),
-            )
-            scrape_wm = cur.fetchone()
-
-            cur.execute(
-                "SELECT last_seen, updated_at FROM ingestion_watermarks WHERE source = %s;",
-                ("recompute",),
-            )
-            recompute_wm = cur.fetchone()
-            cur.close()
-            conn.close()
-
-            return jsonify({
-                "ok": True,
-                "total_records": total_records,
-                "last_updated": wm[2].isoformat() if wm else None,
-                "last_seen": wm[1] if wm else None,
-                "last_source": wm[0] if wm else None,
-                "scrape_last_seen": scrape_wm[0] if scrape_wm else None,
-                "scrape_last_updated": (
-                    scrape_wm[1].isoformat() if scrape_wm else None
-                ),
-                "recompute_last_seen": recompute_wm[0] if recompute_wm else None,
-                "recompute_last_updated": (
-                    recompute_wm[1].isoformat() if recompute_wm else None
-                ),
-                "seeded": total_records > 0,
-            })
+            from query_data import worker_status as _worker_status  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+            return _with_validators(jsonify({"ok": True, **_worker_status()}),
+                                    etag, last_modified)
         except Exception as exc:  # pylint: disable=broad-exception-caught
             return jsonify(
                 {"ok": False, "error": str(exc), "total_records": 0, "seeded": False}
             )
 
+    @app.route("/events", methods=["GET"])
+    def task_events():
+        """
+        Server-Sent Events stream of finished worker tasks.
+
+        Each ingestion_watermarks update (committed by the worker or the
+        loader) arrives as a ``task_completed`` event whose data is the
+        watermark's source, last_seen and updated_at.  Idle streams get a
+        comment every EVENTS_HEARTBEAT_SECONDS.
+        """
+        client = _events.subscribe()
+        heartbeat = app.config.get("EVENTS_HEARTBEAT_SECONDS", EVENTS_HEARTBEAT_SECONDS)
+
+        def _stream():
+            try:
+                yield f"retry: {int(EVENTS_RECONNECT_SECONDS * 1000)}\n\n"
+                while True:
+                    try:
+                        event = client.get(timeout=heartbeat)
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
+                    else:
+                        yield f"event: task_completed\ndata: {json.dumps(event)}\n\n"
+            finally:
+                _events.unsubscribe(client)
+
+        response = app.response_class(_stream(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    @app.route("/events_stats", methods=["GET"])
+    def events_stats():
+        """Subscribers and counters of the task-event listener."""
+        return jsonify(_events.stats())
+
+    @app.route("/pool_stats", methods=["GET"])
+    def pool_stats():
+        """Connection pool sizes and counters for every database in use."""
+        from query_data import pool_stats as _pool_stats  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        return jsonify(_pool_stats())
+
+    @app.route("/latency_stats", methods=["GET"])
+    def latency_stats():
+        """p50/p95/max latency of the /worker_status query."""
+        from query_data import latency_stats as _latency_stats  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        return jsonify(_latency_stats())
+
+    @app.route("/cache_stats", methods=["GET"])
+    def cache_stats():
+        """Hit/miss counters of the analysis result cache."""
+        from query_data import RESULT_CACHE  # noqa: PLC0415  # pylint: disable=import-outside-toplevel
+        return jsonify(RESULT_CACHE.stats())
+
     return app
 
 
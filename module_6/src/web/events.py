@@ -0,0 +1,133 @@
+"""
+Push notifications of finished worker tasks for the GradCafe web service.
+
+Every write to ingestion_watermarks fires a NOTIFY on the
+'ingestion_watermarks' channel (see db/init.sql); PostgreSQL delivers it
+when the writing transaction commits.  One background thread per web
+process LISTENs on a dedicated connection and fans each notification out
+to the queues of all connected /events (Server-Sent Events) clients.
+"""
+import json
+import os
+import queue
+import select
+import threading
+
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from query_data import get_db_connection
+
+EVENTS_CHANNEL = "ingestion_watermarks"
+# Idle SSE streams send a comment this often so proxies keep them open
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# Events buffered per client; a client that falls further behind loses the oldest
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+# Wait this long before re-opening the LISTEN connection after it fails
+EVENTS_RECONNECT_SECONDS = float(os.getenv("EVENTS_RECONNECT_SECONDS", "5"))
+
+
+def _parse(payload):
+    """Decode a NOTIFY payload; non-JSON payloads are passed on as the source."""
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        event = None
+    return event if isinstance(event, dict) else {"source": payload}
+
+
+class TaskEventHub:
+    """Single LISTEN connection fanned out to per-client queues.
+
+    The listener thread starts with the first subscriber and stops once the
+    last one leaves, so a process without open pages holds no connection.
+    """
+
+    def __init__(self, connect=None, channel=EVENTS_CHANNEL, poll_seconds=1.0):
+        self._connect = connect or get_db_connection
+        self._channel = channel
+        self._poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._thread = None
+        self._stop = None     # stop flag of the current listener thread
+        self._counts = {"published": 0, "dropped": 0, "reconnects": 0}
+
+    def subscribe(self):
+        """Register a client and return the queue its events arrive on."""
+        client = queue.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(client)
+            # A stopping thread keeps its own (set) flag; the new one gets a fresh one
+            if self._stop is None or self._stop.is_set():
+                self._stop = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name="task-events", daemon=True
+                )
+                self._thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        """Forget a client; the listener stops with the last one."""
+        with self._lock:
+            self._subscribers.discard(client)
+            if not self._subscribers and self._stop is not None:
+                self._stop.set()
+
+    def publish(self, event):
+        """Hand ``event`` to every subscriber, dropping the oldest when a queue is full."""
+        with self._lock:
+            clients = list(self._subscribers)
+            self._counts["published"] += 1
+        for client in clients:
+            while True:
+                try:
+                    client.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        client.get_nowait()
+                    except queue.Empty:
+                        pass
+                    with self._lock:
+                        self._counts["dropped"] += 1
+
+    def stats(self):
+        """Subscriber count, listener state and published/dropped/reconnect counters."""
+        with self._lock:
+            return {
+                **self._counts,
+                "subscribers": len(self._subscribers),
+                "listening": bool(self._thread and self._thread.is_alive()
+                                  and not self._stop.is_set()),
+            }
+
+    def _run(self, stop):
+        """Listener thread: (re)connect and relay notifications until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                self._listen(stop)
+            except Exception:  # pylint: disable=broad-exception-caught
+                with self._lock:
+                    self._counts["reconnects"] += 1
+                stop.wait(EVENTS_RECONNECT_SECONDS)
+
+    def _listen(self, stop):
+        """LISTEN on one connection and publish each notification it receives."""
+        conn = self._connect()
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            cur = conn.cursor()
+            cur.execute(f"LISTEN {self._channel};")
+            cur.close()
+            while not stop.is_set():
+                ready, _, _ = select.select([conn], [], [], self._poll_seconds)
+                if not ready:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.publish(_parse(conn.notifies.pop(0).payload))
+        finally:
+            conn.close()
+
+
+TASK_EVENTS = TaskEventHub()
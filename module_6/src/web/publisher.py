@@ -1,8 +1,9 @@
 """
 RabbitMQ publisher for the GradCafe web service.
 
-Publishes task messages to the 'tasks' exchange / 'tasks_q' queue
-so the worker can process them asynchronously.
+Publishes task messages to the 'tasks' exchange so the worker can process
+them asynchronously.  Most kinds land on 'tasks_q'; the LLM tasks go to
+'standardize_q', which a separate worker consumes.
 """
 import json
 import os
@@ -13,6 +14,9 @@ import pika
 EXCHANGE = "tasks"
 QUEUE = "tasks_q"
 ROUTING_KEY = "tasks"
+STANDARDIZE_QUEUE = "standardize_q"
+STANDARDIZE_ROUTING_KEY = "standardize"
+STANDARDIZE_TASKS = frozenset({"standardize_records", "restandardize"})
 
 
 def _open_channel():
@@ -32,6 +36,12 @@ def _open_channel():
     ch.exchange_declare(exchange=EXCHANGE, exchange_type="direct", durable=True)
     ch.queue_declare(queue=QUEUE, durable=True)
     ch.queue_bind(exchange=EXCHANGE, queue=QUEUE, routing_key=ROUTING_KEY)
+    ch.queue_declare(queue=STANDARDIZE_QUEUE, durable=True)
+    ch.queue_bind(
+        exchange=EXCHANGE,
+        queue=STANDARDIZE_QUEUE,
+        routing_key=STANDARDIZE_ROUTING_KEY,
+    )
 
     return conn, ch
 
@@ -50,6 +60,7 @@ def publish_task(
       - payload arbitrary dict (defaults to {})
 
     Messages are persistent (delivery_mode=2) so they survive broker restarts.
+    Kinds in STANDARDIZE_TASKS are routed to the standardize queue.
 
     Args:
         kind:    Task kind string.
@@ -72,7 +83,9 @@ def publish_task(
     try:
         ch.basic_publish(
             exchange=EXCHANGE,
-            routing_key=ROUTING_KEY,
+            routing_key=(
+                STANDARDIZE_ROUTING_KEY if kind in STANDARDIZE_TASKS else ROUTING_KEY
+            ),
             body=body,
             properties=pika.BasicProperties(
                 delivery_mode=2,          # persistent message
@@ -4,13 +4,33 @@ Adapted for Docker environment – uses DATABASE_URL for connections.
 """
 import os
 import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 
 import psycopg2
-from psycopg2 import sql
+from psycopg2 import errorcodes, errors, sql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
 from dotenv import load_dotenv
 
 load_dotenv(override=False)
 
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", "10"))
+# Wait this long for a free connection once POOL_MAX_SIZE are checked out
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+# Close connections idle longer than this (down to POOL_MIN_SIZE) or older than the lifetime
+POOL_IDLE_SECONDS = float(os.getenv("DB_POOL_IDLE_SECONDS", "300"))
+POOL_LIFETIME_SECONDS = float(os.getenv("DB_POOL_LIFETIME_SECONDS", "1800"))
+# Ping a connection with SELECT 1 before reuse when it sat idle this long
+POOL_CHECK_SECONDS = float(os.getenv("DB_POOL_CHECK_SECONDS", "30"))
+# Recent samples kept per tracked operation for latency percentiles
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "1000"))
+
+UndefinedTable = errors.lookup(errorcodes.UNDEFINED_TABLE)
+
 
 def get_db_connection(dbname=None):
     """
@@ -35,54 +55,232 @@ def get_db_connection(dbname=None):
     return psycopg2.connect(**conn_params)
 
 
-def _run_query(dbname, query_template, params=()):
-    """Execute a query and return the first row."""
-    conn = get_db_connection(dbname)
-    cur = conn.cursor()
-    q = sql.SQL(query_template).format(table=sql.Identifier("gradcafe_main"))
-    cur.execute(q, params)
-    result = cur.fetchone()
-    query_str = cur.mogrify(q, params).decode("utf-8")
-    cur.close()
-    conn.close()
-    return result, query_str
+# ── Connection pool ───────────────────────────────────────────────────────────
 
+class ConnectionPool:
+    """Thread-safe pool of connections to one database.
 
-def question_1(dbname=None):
-    """How many entries have applied for Fall 2026?"""
-    result, query_str = _run_query(
-        dbname,
-        "SELECT COUNT(*) FROM {table} WHERE term = %s",
-        ("Fall 2026",),
-    )
-    return {
-        "question": "How many entries do you have in your database who have applied for Fall 2026?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else 0,
-    }
+    Idle connections are reused most-recent first, so under light load the
+    cold tail ages out through ``POOL_IDLE_SECONDS`` while ``min_size`` stay
+    open.  Every connection is retired after ``POOL_LIFETIME_SECONDS``.
+    """
 
+    def __init__(self, dbname=None, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE):
+        self.dbname = dbname
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self._cond = threading.Condition()
+        self._idle = []           # [(conn, created_at, last_used)], newest last
+        self._checked_out = {}    # id(conn) -> created_at
+        self._size = 0            # idle + checked out + being opened
+        self._counts = {
+            "created": 0,
+            "reused": 0,
+            "closed": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "failed_checks": 0,
+        }
 
-def question_2(dbname=None):
-    """What percentage of entries are from international students?"""
-    result, query_str = _run_query(
-        dbname,
+    def _expired(self, created_at, last_used, now):
+        """Whether an idle connection is past its lifetime or idle timeout."""
+        if now - created_at >= POOL_LIFETIME_SECONDS:
+            return True
+        return now - last_used >= POOL_IDLE_SECONDS and self._size > self.min_size
+
+    def _take_idle(self):
+        """Pop the newest usable idle connection, retiring stale ones (lock held)."""
+        now = time.monotonic()
+        keep = []
+        for conn, created_at, last_used in self._idle:
+            if conn.closed or self._expired(created_at, last_used, now):
+                _close_quietly(conn)
+                self._size -= 1
+                self._counts["closed"] += 1
+            else:
+                keep.append((conn, created_at, last_used))
+        self._idle = keep
+        return self._idle.pop() if self._idle else None
+
+    def _reserve(self, deadline):
+        """Return an idle entry, or None once a slot for a new connection is reserved."""
+        with self._cond:
+            while True:
+                entry = self._take_idle()
+                if entry is not None:
+                    return entry
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                self._counts["waits"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    self._counts["timeouts"] += 1
+                    raise PoolError(
+                        f"no free connection to {self.dbname or 'default'} "
+                        f"within {POOL_TIMEOUT:g}s (max {self.max_size})"
+                    )
+
+    def acquire(self, timeout=POOL_TIMEOUT):
+        """Check out a healthy connection, opening one if below ``max_size``."""
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self._reserve(deadline)
+            if entry is None:
+                try:
+                    conn = get_db_connection(self.dbname)
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self._checked_out[id(conn)] = time.monotonic()
+                    self._counts["created"] += 1
+                return conn
+
+            conn, created_at, last_used = entry
+            if time.monotonic() - last_used >= POOL_CHECK_SECONDS and not _ping(conn):
+                _close_quietly(conn)
+                self._forget(failed_check=True)
+                continue
+            with self._cond:
+                self._checked_out[id(conn)] = created_at
+                self._counts["reused"] += 1
+            return conn
+
+    def release(self, conn):
+        """Return a connection; broken or expired ones are closed instead."""
+        with self._cond:
+            created_at = self._checked_out.pop(id(conn), None)
+        if created_at is None:
+            _close_quietly(conn)
+            return
+        reusable = not conn.closed and time.monotonic() - created_at < POOL_LIFETIME_SECONDS
+        if reusable and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                reusable = False
+        if not reusable:
+            _close_quietly(conn)
+            self._forget()
+            return
+        with self._cond:
+            self._idle.append((conn, created_at, time.monotonic()))
+            self._cond.notify()
+
+    def _forget(self, failed_check=False):
+        """Free the slot of a connection that was closed or never opened."""
+        with self._cond:
+            self._size -= 1
+            self._counts["closed"] += 1
+            if failed_check:
+                self._counts["failed_checks"] += 1
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection; checked-out ones close on release."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            for conn, _, _ in idle:
+                _close_quietly(conn)
+            self._size -= len(idle)
+            self._counts["closed"] += len(idle)
+
+    def stats(self):
+        """Current sizes plus lifetime counters."""
+        with self._cond:
+            return {
+                "dbname": self.dbname,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._checked_out),
+                **self._counts,
+            }
+
+
+def _ping(conn):
+    """Cheap liveness check for a connection that has been idle a while."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1;")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _close_quietly(conn):
+    """Close a connection, ignoring errors from an already-dead socket."""
+    try:
+        conn.close()
+    except psycopg2.Error:
+        pass
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(dbname=None):
+    """Return the process-wide pool for ``dbname``, creating it on first use."""
+    with _POOLS_LOCK:
+        if dbname not in _POOLS:
+            _POOLS[dbname] = ConnectionPool(dbname)
+        return _POOLS[dbname]
+
+
+@contextmanager
+def connection(dbname=None):
+    """Borrow a pooled connection for the duration of a ``with`` block."""
+    pool = get_pool(dbname)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def pool_stats():
+    """Stats of every pool created in this process, keyed by database name."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return {pool.dbname or "default": pool.stats() for pool in pools}
+
+
+def close_pools():
+    """Close and forget every pool (tests, and process shutdown)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+# ── Question catalogue ────────────────────────────────────────────────────────
+# Each entry is (question text, display SQL, params).  question_N() runs the
+# display SQL on its own; compute_analysis() answers every question in one
+# pass and shows the same SQL so the page reads per question.
+# The worker keeps a copy in src/worker/etl/query_data.py (separate build
+# context) to materialize analytics_summary; change both together.
+
+QUESTIONS = {
+    "q1": (
+        "How many entries do you have in your database who have applied for Fall 2026?",
+        "SELECT COUNT(*) FROM {table} WHERE term = %s",
+        ("Fall 2026",),
+    ),
+    "q2": (
+        "What percentage of entries are from international students?",
         """SELECT ROUND((COUNT(*) FILTER (WHERE us_or_international = %s) * 100.0
                          / NULLIF(COUNT(*), 0)), 2)
            FROM {table}
            WHERE us_or_international IS NOT NULL""",
         ("International",),
-    )
-    return {
-        "question": "What percentage of entries are from international students?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else 0,
-    }
-
-
-def question_3(dbname=None):
-    """What are the average GPA and GRE scores for accepted students?"""
-    result, query_str = _run_query(
-        dbname,
+    ),
+    "q3": (
+        "What are the average GPA and GRE scores for accepted applicants?",
         """SELECT ROUND(AVG(gpa)::numeric, 2),
                   ROUND(AVG(gre)::numeric, 2),
                   ROUND(AVG(gre_v)::numeric, 2),
@@ -90,185 +288,479 @@ def question_3(dbname=None):
            FROM {table}
            WHERE status = %s""",
         ("Accepted",),
-    )
-    if result:
+    ),
+    "q4": (
+        "What is the highest GPA among accepted applicants?",
+        "SELECT MAX(gpa) FROM {table} WHERE status = %s",
+        ("Accepted",),
+    ),
+    "q5": (
+        "What is the most common application status?",
+        "SELECT status, COUNT(*) AS cnt FROM {table} WHERE status IS NOT NULL "
+        "GROUP BY status ORDER BY cnt DESC LIMIT 1",
+        (),
+    ),
+    "q6": (
+        "What is the average GPA of rejected applicants?",
+        "SELECT ROUND(AVG(gpa)::numeric, 2) FROM {table} WHERE status = %s",
+        ("Rejected",),
+    ),
+    "q7": (
+        "How many entries are PhD applicants?",
+        "SELECT COUNT(*) FROM {table} WHERE degree ILIKE %s",
+        ("%PhD%",),
+    ),
+    "q8": (
+        "How many Computer Science program acceptances are there?",
+        "SELECT COUNT(*) FROM {table} WHERE status = %s AND program_category = %s",
+        ("Accepted", "computer_science"),
+    ),
+    "q9": (
+        "What is the total number of CS applications?",
+        # program_category is generated from the program text: "computer_science"
+        # for "Computer Science", "cs_related" for Comp Sci / CS / Software
+        # Engineering / Informatics (see db/derived_columns.sql).
+        "SELECT COUNT(*) FROM {table} WHERE program_category IN (%s, %s)",
+        ("computer_science", "cs_related"),
+    ),
+    "q10": (
+        "What is the total number of records in the database?",
+        "SELECT COUNT(*) FROM {table}",
+        (),
+    ),
+    "q11": (
+        "Which universities have the highest average GPA among accepted applicants?",
+        """SELECT
+                  CASE WHEN llm_generated_university = LOWER(llm_generated_university)
+                       THEN INITCAP(llm_generated_university)
+                       ELSE llm_generated_university
+                  END AS university_name,
+                  ROUND(AVG(gpa)::numeric, 2) AS avg_gpa,
+                  COUNT(*) AS acceptances
+           FROM {table}
+           WHERE status = 'Accepted'
+             AND llm_generated_university IS NOT NULL
+             AND gpa IS NOT NULL
+           GROUP BY university_name
+           ORDER BY avg_gpa DESC
+           LIMIT 10""",
+        (),
+    ),
+}
+
+# Every scalar question as one FILTER aggregate, so a single sequential scan
+# answers q1–q4 and q6–q10.  Column order must match SCALAR_COLUMNS.
+SCALAR_SQL = """
+    SELECT COUNT(*) FILTER (WHERE term = %(fall)s),
+           ROUND(COUNT(*) FILTER (WHERE us_or_international = %(intl)s) * 100.0
+                 / NULLIF(COUNT(*) FILTER (WHERE us_or_international IS NOT NULL), 0), 2),
+           ROUND((AVG(gpa) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           ROUND((AVG(gre) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           ROUND((AVG(gre_v) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           ROUND((AVG(gre_aw) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           MAX(gpa) FILTER (WHERE status = %(accepted)s),
+           ROUND((AVG(gpa) FILTER (WHERE status = %(rejected)s))::numeric, 2),
+           COUNT(*) FILTER (WHERE degree ILIKE %(phd)s),
+           COUNT(*) FILTER (WHERE status = %(accepted)s AND program_category = %(cs)s),
+           COUNT(*) FILTER (WHERE program_category IN (%(cs)s, %(cs_related)s)),
+           COUNT(*)
+    FROM {table}
+"""
+SCALAR_PARAMS = {
+    "fall": "Fall 2026",
+    "intl": "International",
+    "accepted": "Accepted",
+    "rejected": "Rejected",
+    "phd": "%PhD%",
+    "cs": "computer_science",
+    "cs_related": "cs_related",
+}
+# (question key, number of SCALAR_SQL columns it owns), in column order
+SCALAR_COLUMNS = (
+    ("q1", 1), ("q2", 1), ("q3", 4), ("q4", 1), ("q6", 1),
+    ("q7", 1), ("q8", 1), ("q9", 1), ("q10", 1),
+)
+
+
+def _table_sql(template):
+    """Bind the {table} placeholder of a query template to gradcafe_main."""
+    return sql.SQL(template).format(table=sql.Identifier("gradcafe_main"))
+
+
+def _format_answer(key, result):
+    """Shape a question's raw row (or rows, for q11) into its template answer."""
+    if key == "q3":
+        if not result:
+            return {"avg_gpa": None, "avg_gre": None, "avg_gre_v": None, "avg_gre_aw": None}
         return {
-            "question": "What are the average GPA and GRE scores for accepted applicants?",
-            "query": query_str.strip(),
-            "answer": {
-                "avg_gpa": result[0],
-                "avg_gre": result[1],
-                "avg_gre_v": result[2],
-                "avg_gre_aw": result[3],
-            },
+            "avg_gpa": result[0],
+            "avg_gre": result[1],
+            "avg_gre_v": result[2],
+            "avg_gre_aw": result[3],
         }
+    if key == "q5":
+        return f"{result[0]} ({result[1]} entries)" if result else "N/A"
+    if key == "q11":
+        return result
+    if key in ("q4", "q6"):
+        return result[0] if result else None
+    return result[0] if result else 0
+
+
+def _answer(cur, key, result):
+    """Build the ``{question, query, answer}`` dict the template renders."""
+    question, template, params = QUESTIONS[key]
+    query_str = cur.mogrify(_table_sql(template), params).decode("utf-8")
     return {
-        "question": "What are the average GPA and GRE scores for accepted applicants?",
+        "question": question,
         "query": query_str.strip(),
-        "answer": {"avg_gpa": None, "avg_gre": None, "avg_gre_v": None, "avg_gre_aw": None},
+        "answer": _format_answer(key, result),
     }
 
 
+def _ask(key, dbname=None):
+    """Run one catalogued question on its own and return its answer dict."""
+    _, template, params = QUESTIONS[key]
+    with connection(dbname) as conn:
+        cur = conn.cursor()
+        cur.execute(_table_sql(template), params)
+        result = cur.fetchall() if key == "q11" else cur.fetchone()
+        answer = _answer(cur, key, result)
+        cur.close()
+    return answer
+
+
+def question_1(dbname=None):
+    """How many entries have applied for Fall 2026?"""
+    return _ask("q1", dbname)
+
+
+def question_2(dbname=None):
+    """What percentage of entries are from international students?"""
+    return _ask("q2", dbname)
+
+
+def question_3(dbname=None):
+    """What are the average GPA and GRE scores for accepted students?"""
+    return _ask("q3", dbname)
+
+
 def question_4(dbname=None):
     """What is the highest GPA among accepted applicants?"""
-    result, query_str = _run_query(
-        dbname,
-        "SELECT MAX(gpa) FROM {table} WHERE status = %s",
-        ("Accepted",),
-    )
-    return {
-        "question": "What is the highest GPA among accepted applicants?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else None,
-    }
+    return _ask("q4", dbname)
 
 
 def question_5(dbname=None):
     """What is the most common application status?"""
-    conn = get_db_connection(dbname)
-    cur = conn.cursor()
-    q = sql.SQL(
-        "SELECT status, COUNT(*) AS cnt FROM {table} WHERE status IS NOT NULL "
-        "GROUP BY status ORDER BY cnt DESC LIMIT 1"
-    ).format(table=sql.Identifier("gradcafe_main"))
-    cur.execute(q)
-    result = cur.fetchone()
-    query_str = cur.mogrify(q).decode("utf-8")
-    cur.close()
-    conn.close()
-    return {
-        "question": "What is the most common application status?",
-        "query": query_str.strip(),
-        "answer": f"{result[0]} ({result[1]} entries)" if result else "N/A",
-    }
+    return _ask("q5", dbname)
 
 
 def question_6(dbname=None):
     """What is the average GPA of rejected applicants?"""
-    result, query_str = _run_query(
-        dbname,
-        "SELECT ROUND(AVG(gpa)::numeric, 2) FROM {table} WHERE status = %s",
-        ("Rejected",),
-    )
-    return {
-        "question": "What is the average GPA of rejected applicants?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else None,
-    }
+    return _ask("q6", dbname)
 
 
 def question_7(dbname=None):
     """How many entries are PhD applicants?"""
-    result, query_str = _run_query(
-        dbname,
-        "SELECT COUNT(*) FROM {table} WHERE degree ILIKE %s",
-        ("%PhD%",),
-    )
-    return {
-        "question": "How many entries are PhD applicants?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else 0,
-    }
+    return _ask("q7", dbname)
 
 
 def question_8(dbname=None):
     """How many CS-related program acceptances are there?"""
-    result, query_str = _run_query(
-        dbname,
-        "SELECT COUNT(*) FROM {table} WHERE status = %s AND program ILIKE %s",
-        ("Accepted", "%Computer Science%"),
-    )
-    return {
-        "question": "How many Computer Science program acceptances are there?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else 0,
-    }
+    return _ask("q8", dbname)
 
 
 def question_9(dbname=None):
     """How many total CS applications are there using original program text aliases?"""
-    result, query_str = _run_query(
-        dbname,
-        """SELECT COUNT(*)
-           FROM {table}
-           WHERE (
-                 program ILIKE %s OR
-                 program ILIKE %s OR
-                 program ILIKE %s OR
-                 program ILIKE %s OR
-                 program ILIKE %s
-             )""",
-        (
-            "%Computer Science%",
-            "%Comp Sci%",
-            "% CS %",
-            "%Software Engineering%",
-            "%Informatics%",
-        ),
-    )
-    return {
-        "question": "What is the total number of CS applications?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else 0,
-    }
+    return _ask("q9", dbname)
 
 
 def question_10(dbname=None):
     """What is the total number of records in the database?"""
-    result, query_str = _run_query(dbname, "SELECT COUNT(*) FROM {table}")
-    return {
-        "question": "What is the total number of records in the database?",
-        "query": query_str.strip(),
-        "answer": result[0] if result else 0,
-    }
+    return _ask("q10", dbname)
 
 
 def question_11(dbname=None):
     """Which universities have the highest average GPA for acceptances?"""
-    conn = get_db_connection(dbname)
-    cur = conn.cursor()
-    q = sql.SQL(
-        """SELECT
-                  CASE WHEN llm_generated_university = LOWER(llm_generated_university)
-                       THEN INITCAP(llm_generated_university)
-                       ELSE llm_generated_university
-                  END AS university_name,
-                  ROUND(AVG(gpa)::numeric, 2) AS avg_gpa,
-                  COUNT(*) AS acceptances
-           FROM {table}
-           WHERE status = 'Accepted'
-             AND llm_generated_university IS NOT NULL
-             AND gpa IS NOT NULL
-           GROUP BY university_name
-           ORDER BY avg_gpa DESC
-           LIMIT 10"""
-    ).format(table=sql.Identifier("gradcafe_main"))
-    cur.execute(q)
-    rows = cur.fetchall()
-    query_str = cur.mogrify(q).decode("utf-8")
-    cur.close()
-    conn.close()
-    return {
-        "question": "Which universities have the highest average GPA among accepted applicants?",
-        "query": query_str.strip(),
-        "answer": rows,
-    }
+    return _ask("q11", dbname)
+
+
+def compute_analysis(cur):
+    """
+    Answer every question on ``cur`` and return the results dict.
+
+    A single FILTER-aggregate scan answers every scalar question, then the
+    two grouped questions (q5, q11) run on the same cursor.
+    """
+    cur.execute(_table_sql(SCALAR_SQL), SCALAR_PARAMS)
+    scalars = cur.fetchone()
+    rows = {}
+    offset = 0
+    for key, width in SCALAR_COLUMNS:
+        rows[key] = scalars[offset:offset + width] if scalars else None
+        offset += width
+    cur.execute(_table_sql(QUESTIONS["q5"][1]))
+    rows["q5"] = cur.fetchone()
+    cur.execute(_table_sql(QUESTIONS["q11"][1]))
+    rows["q11"] = cur.fetchall()
+    return {key: _answer(cur, key, rows[key]) for key in QUESTIONS}
 
 
 def run_all_queries(dbname=None):
-    """Run all analysis queries and return results dict."""
+    """Run all analysis queries live on one pooled connection and read-only snapshot."""
     if dbname is None:
         dbname = os.getenv("DB_NAME", "gradcafe")
+    with connection(dbname) as conn:
+        cur = conn.cursor()
+        cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY;")
+        results = compute_analysis(cur)
+        cur.close()
+    return results
+
+
+def load_analysis(dbname=None):
+    """
+    Return the answers the worker materialized into analytics_summary.
+
+    The recompute_analytics task (and every task that changes the data)
+    rewrites that single row, so this is one primary-key lookup regardless
+    of table size.  Falls back to run_all_queries() until the first
+    summary has been written.
+    """
+    if dbname is None:
+        dbname = os.getenv("DB_NAME", "gradcafe")
+    with connection(dbname) as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT results FROM analytics_summary WHERE id = 1;")
+            row = cur.fetchone()
+        except UndefinedTable:
+            row = None
+        cur.close()
+    if row:
+        return row[0]
+    return run_all_queries(dbname)
+
+
+# ── Result cache ──────────────────────────────────────────────────────────────
+
+def latest_watermark(dbname=None):
+    """Newest ingestion_watermarks.updated_at – every data change advances it."""
+    with connection(dbname) as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT MAX(updated_at) FROM ingestion_watermarks;")
+            watermark = cur.fetchone()[0]
+        except UndefinedTable:
+            watermark = None
+        cur.close()
+    return watermark
+
+
+def data_version(dbname=None):
+    """
+    Return (latest watermark, summarized row count, live row count) for HTTP validators.
+
+    Tasks move the watermark, but a chunked seed commits rows (and bumps the
+    gradcafe_stats counter that /worker_status serves) before it does, so
+    the live count is part of the version too.  All three read small
+    tables; the probe never scans gradcafe_main.  Returns None on databases
+    without those tables, which turns validators off.
+    """
+    with connection(dbname) as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                """SELECT (SELECT MAX(updated_at) FROM ingestion_watermarks),
+                          (SELECT results->'q10'->>'answer' FROM analytics_summary
+                           WHERE id = 1),
+                          (SELECT SUM(row_count)::bigint FROM gradcafe_stats);"""
+            )
+            version = cur.fetchone()
+        except UndefinedTable:
+            version = None
+        cur.close()
+    return version
+
+
+class ResultCache:
+    """Per-database results, valid until the latest watermark moves.
+
+    Each lookup costs one probe of the small ingestion_watermarks table.
+    When the watermark has moved, the first request recomputes and any
+    concurrent requests for the same watermark wait for that result
+    instead of recomputing it themselves.
+    """
+
+    def __init__(self, compute):
+        self._compute = compute
+        self._lock = threading.Lock()
+        self._entries = {}    # dbname -> (watermark, results)
+        self._inflight = {}   # (dbname, watermark) -> threading.Event
+        self._counts = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def get(self, dbname):
+        """Return cached results for ``dbname``, recomputing once per new watermark."""
+        watermark = latest_watermark(dbname)
+        key = (dbname, watermark)
+        while True:
+            with self._lock:
+                entry = self._entries.get(dbname)
+                if entry and entry[0] == watermark:
+                    self._counts["hits"] += 1
+                    return entry[1]
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+                    self._counts["misses"] += 1
+                else:
+                    self._counts["coalesced"] += 1
+            if leader:
+                break
+            # Re-check once the leader finishes; if it failed, the next one leads
+            event.wait()
+
+        try:
+            results = self._compute(dbname=dbname)
+            with self._lock:
+                self._entries[dbname] = (watermark, results)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+        return results
+
+    def clear(self):
+        """Drop every cached result (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss/coalesced counters and the watermark of each cached entry."""
+        with self._lock:
+            return {
+                **self._counts,
+                "entries": {
+                    db or "default": str(watermark)
+                    for db, (watermark, _) in self._entries.items()
+                },
+            }
+
+
+RESULT_CACHE = ResultCache(load_analysis)
+
+
+def cached_analysis(dbname=None):
+    """load_analysis() through the process-wide watermark-keyed cache."""
+    if dbname is None:
+        dbname = os.getenv("DB_NAME", "gradcafe")
+    return RESULT_CACHE.get(dbname)
+
+
+# ── Worker status ─────────────────────────────────────────────────────────────
+
+class LatencyStats:
+    """Thread-safe timings of one operation: totals plus recent percentiles."""
+
+    def __init__(self, window=None):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window or LATENCY_WINDOW)
+        self._counts = {"count": 0, "errors": 0}
+        self._max = 0.0
+
+    def observe(self, seconds, error=False):
+        """Record one call that took ``seconds``."""
+        with self._lock:
+            self._counts["count"] += 1
+            self._counts["errors"] += int(error)
+            self._samples.append(seconds)
+            self._max = max(self._max, seconds)
+
+    def stats(self):
+        """Counts, max and p50/p95 over the recent window, in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            counts = dict(self._counts)
+            slowest = self._max
+
+        def _pct(fraction):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 3)
+
+        return {**counts, "p50_ms": _pct(0.50), "p95_ms": _pct(0.95),
+                "max_ms": round(slowest * 1000, 3)}
+
+
+# Row count from the trigger-maintained gradcafe_stats slots plus the latest,
+# scrape and recompute watermarks, all small-table lookups, in one round trip.
+# {row_count} is the gradcafe_stats lookup, or COUNT(*) on databases that
+# predate that table.
+STATUS_SQL = """
+    SELECT {row_count},
+           latest.source, latest.last_seen, latest.updated_at,
+           scrape.last_seen, scrape.updated_at,
+           recompute.last_seen, recompute.updated_at
+    FROM (SELECT 1) AS one
+    LEFT JOIN LATERAL (
+        SELECT source, last_seen, updated_at FROM ingestion_watermarks
+        ORDER BY updated_at DESC LIMIT 1
+    ) AS latest ON TRUE
+    LEFT JOIN ingestion_watermarks AS scrape ON scrape.source = 'gradcafe_scraped'
+    LEFT JOIN ingestion_watermarks AS recompute ON recompute.source = 'recompute'
+"""
+STATUS_ROW_COUNT = "(SELECT SUM(row_count)::bigint FROM gradcafe_stats)"
+STATUS_ROW_COUNT_FALLBACK = "(SELECT COUNT(*) FROM gradcafe_main)"
+
+STATUS_LATENCY = LatencyStats()
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def worker_status(dbname=None):
+    """
+    Row count and ingestion watermarks for the /worker_status banner.
+
+    One single-row query per call; its latency is recorded in
+    STATUS_LATENCY.  Databases without the gradcafe_stats slots (not yet
+    migrated by load_data.ensure_schema or the worker) fall back to COUNT(*).
+    """
+    started = time.perf_counter()
+    failed = True
+    try:
+        with connection(dbname) as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(STATUS_SQL.format(row_count=STATUS_ROW_COUNT))
+                row = cur.fetchone()
+            except UndefinedTable:
+                conn.rollback()
+                row = None
+            if row is None or row[0] is None:
+                cur.execute(STATUS_SQL.format(row_count=STATUS_ROW_COUNT_FALLBACK))
+                row = cur.fetchone()
+            cur.close()
+        failed = False
+    finally:
+        STATUS_LATENCY.observe(time.perf_counter() - started, error=failed)
+
+    total, source, last_seen, updated_at = row[0] or 0, row[1], row[2], row[3]
     return {
-        "q1": question_1(dbname),
-        "q2": question_2(dbname),
-        "q3": question_3(dbname),
-        "q4": question_4(dbname),
-        "q5": question_5(dbname),
-        "q6": question_6(dbname),
-        "q7": question_7(dbname),
-        "q8": question_8(dbname),
-        "q9": question_9(dbname),
-        "q10": question_10(dbname),
-        "q11": question_11(dbname),
+        "total_records": total,
+        "last_updated": _iso(updated_at),
+        "last_seen": last_seen,
+        "last_source": source,
+        "scrape_last_seen": row[4],
+        "scrape_last_updated": _iso(row[5]),
+        "recompute_last_seen": row[6],
+        "recompute_last_updated": _iso(row[7]),
+        "seeded": total > 0,
     }
+
+
+def latency_stats():
+    """Latency of every tracked operation, keyed by name."""
+    return {"worker_status": STATUS_LATENCY.stats()}
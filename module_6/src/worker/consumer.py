@@ -5,9 +5,14 @@ Connects to RabbitMQ, declares durable AMQP entities, and processes
 incoming task messages.  Supported task kinds:
   - scrape_new_data       → handle_scrape_new_data(conn, payload)
   - recompute_analytics   → handle_recompute_analytics(conn, payload)
+  - standardize_records   → handle_standardize_records(conn, payload)
+  - restandardize         → handle_restandardize(conn, payload)
 
 Design constraints:
   - basic_qos(prefetch_count=1)  – one message at a time
+  - LLM tasks (standardize_records, restandardize) are routed to their own
+    queue, consumed by a separate worker (WORKER_QUEUE=standardize_q), so a
+    long standardization run never holds up the next scrape
   - Database transaction per message; commit → ack, exception → nack
   - Watermark table tracks the "last_seen" key for idempotent scraping
 """
@@ -17,11 +22,13 @@ import os
 import sys
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import psycopg2
 from psycopg2.extras import execute_values
 import pika
+import requests
 from dotenv import load_dotenv
 
 # ── ETL helpers ─────────────────────────────────────────────────────────────
@@ -31,6 +38,24 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "etl", "module_2_code
 
 from scrape import GradCafeScraper          # noqa: E402  (added to sys.path above)
 from clean import GradCafeDataCleaner       # noqa: E402
+from query_data import compute_analysis     # noqa: E402
+
+# ── Loader helpers ──────────────────────────────────────────────────────────
+# The image copies src/db/load_data.py next to consumer.py (see Dockerfile);
+# a source checkout imports it from ../db.
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "db"))
+
+from load_data import (                     # noqa: E402
+    COPY_CHUNK_ROWS,
+    ROW_COLUMNS,
+    copy_rows,
+    ensure_workload_indexes as _ensure_workload_indexes,
+    iter_records_from,
+    plan_file_load,
+    raw_data_json,
+    run_schema_file as _execute_schema_file,
+    save_file_watermark,
+)
 
 load_dotenv(override=False)
 
@@ -45,6 +70,24 @@ EXCHANGE    = "tasks"
 QUEUE       = "tasks_q"
 ROUTING_KEY = "tasks"
 
+# Tasks that wait on the standardizer get their own queue and consumer.
+STANDARDIZE_QUEUE       = "standardize_q"
+STANDARDIZE_ROUTING_KEY = "standardize"
+STANDARDIZE_TASKS       = frozenset({"standardize_records", "restandardize"})
+
+# Queue this process consumes; the seed and schema setup run only for QUEUE.
+WORKER_QUEUE = os.getenv("WORKER_QUEUE", QUEUE)
+
+# ── LLM standardizer service ─────────────────────────────────────────────────
+STANDARDIZER_URL         = os.getenv("STANDARDIZER_URL", "http://standardizer:8000")
+STANDARDIZE_BATCH        = int(os.getenv("STANDARDIZE_BATCH", "200"))
+STANDARDIZE_REQUEST_ROWS = int(os.getenv("STANDARDIZE_REQUEST_ROWS", "25"))
+STANDARDIZER_CONCURRENCY = int(os.getenv("STANDARDIZER_CONCURRENCY", "4"))
+STANDARDIZER_TIMEOUT     = float(os.getenv("STANDARDIZER_TIMEOUT", "300"))
+NORMALIZE_REQUEST_VALUES = int(os.getenv("NORMALIZE_REQUEST_VALUES", "2000"))
+INSERT_BATCH_MIN         = int(os.getenv("INSERT_BATCH_MIN", "16"))
+INSERT_BATCH_MAX         = int(os.getenv("INSERT_BATCH_MAX", "4000"))
+
 # ── Database connection ──────────────────────────────────────────────────────
 
 def get_db_connection():
@@ -75,10 +118,95 @@ def ensure_watermark_table(conn):
             updated_at  TIMESTAMPTZ DEFAULT now()
         );
     """)
+    cur.execute("""
+        ALTER TABLE ingestion_watermarks
+            ADD COLUMN IF NOT EXISTS file_size     BIGINT,
+            ADD COLUMN IF NOT EXISTS file_mtime_ns BIGINT,
+            ADD COLUMN IF NOT EXISTS content_hash  TEXT,
+            ADD COLUMN IF NOT EXISTS byte_offset   BIGINT;
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_quarantine (
+            id          SERIAL PRIMARY KEY,
+            source      TEXT,
+            url         TEXT,
+            raw_record  TEXT,
+            error       TEXT,
+            created_at  TIMESTAMPTZ DEFAULT now()
+        );
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_summary (
+            id          SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            results     JSONB NOT NULL,
+            computed_at TIMESTAMPTZ DEFAULT now()
+        );
+    """)
+    conn.commit()
+    cur.close()
+
+
+def run_schema_file(conn, name):
+    """Execute a shared schema file from src/db and commit (see load_data.run_schema_file)."""
+    cur = conn.cursor()
+    _execute_schema_file(cur, name)
+    conn.commit()
+    cur.close()
+
+
+def ensure_derived_columns(conn):
+    """Make program_category a generated column (derived_columns.sql)."""
+    run_schema_file(conn, "derived_columns.sql")
+
+
+def ensure_watermark_notify(conn):
+    """
+    NOTIFY 'ingestion_watermarks' with the row as JSON on every watermark write
+    (watermark_notify.sql), so the web service can push task completion to
+    browsers when a handler commits.
+    """
+    run_schema_file(conn, "watermark_notify.sql")
+
+
+def ensure_row_counter(conn):
+    """Keep gradcafe_main's row count in the gradcafe_stats slots (row_counter.sql)."""
+    run_schema_file(conn, "row_counter.sql")
+
+
+def ensure_workload_indexes(conn):
+    """
+    Bring an existing database's indexes in line with db/init.sql: drop the
+    ones no production query reads and add the two the grouped questions
+    (q5, q11) scan index-only (load_data.ensure_workload_indexes).
+    """
+    cur = conn.cursor()
+    _ensure_workload_indexes(cur)
     conn.commit()
     cur.close()
 
 
+def refresh_analytics_summary(cur):
+    """
+    Materialize every /analysis answer into the single analytics_summary row.
+
+    Runs inside the caller's transaction, so the summary commits together
+    with the data change that made it stale.  Numeric answers are stored as
+    their text form ("41.50") so the page renders exactly as a live query.
+
+    Returns:
+        The results dict that was stored.
+    """
+    results = compute_analysis(cur)
+    cur.execute(
+        """INSERT INTO analytics_summary (id, results, computed_at)
+           VALUES (1, %s, now())
+           ON CONFLICT (id) DO UPDATE
+           SET results = EXCLUDED.results, computed_at = now();""",
+        (json.dumps(results, default=str),),
+    )
+    return results
+
+
 # ── Data helpers shared with load_data ──────────────────────────────────────
 
 def _parse_date(date_str):
@@ -184,17 +312,146 @@ def _record_to_row(r):
         _clean_str(degree) if isinstance(degree, str) else None,
         _clean_str(llm_program),
         _clean_str(llm_university),
-        json.dumps(r).replace("\x00", "").replace("\\u0000", ""),
+        raw_data_json(r),
     )
 
 
+def _iter_chunks(iterable, size):
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class AdaptiveBatch:
+    """
+    Batch size for the execute_values fallback, tuned by observed failures.
+
+    Clean batches double the size (up to INSERT_BATCH_MAX); a batch that
+    needed bisection halves it (down to INSERT_BATCH_MIN), so dirty stretches
+    of a file are retried in small batches and clean ones in large batches.
+    """
+
+    def __init__(self, size=500):
+        self.size = size
+
+    def record(self, failed: bool):
+        """Adjust the size after a batch with or without rejected rows."""
+        if failed:
+            self.size = max(INSERT_BATCH_MIN, self.size // 2)
+        else:
+            self.size = min(INSERT_BATCH_MAX, self.size * 2)
+
+
+def _quarantine_record(row):
+    """
+    Serialize a converted row as a {column: value} JSON object for replay.
+
+    The whole row is kept, not just raw_data: with RAW_DATA_MODE=lean the
+    promoted fields exist only in their columns.
+    """
+    record = dict(zip(ROW_COLUMNS, row))
+    if isinstance(record.get("raw_data"), str):
+        try:
+            record["raw_data"] = json.loads(record["raw_data"])
+        except ValueError:
+            pass
+    return json.dumps(record, default=str).replace("\\u0000", "")
+
+
+def _quarantine(cur, source, row, exc):
+    """Record a rejected row (url, full row as JSON, error text) in ingestion_quarantine."""
+    cur.execute("SAVEPOINT quarantine;")
+    try:
+        cur.execute(
+            """INSERT INTO ingestion_quarantine (source, url, raw_record, error)
+               VALUES (%s, %s, %s, %s);""",
+            (source, row[3], _quarantine_record(row), str(exc).strip()),
+        )
+        cur.execute("RELEASE SAVEPOINT quarantine;")
+    except Exception as q_exc:  # pylint: disable=broad-exception-caught
+        cur.execute("ROLLBACK TO SAVEPOINT quarantine;")
+        log.warning("seed_from_json: could not quarantine row %s – %s", row[3], q_exc)
+
+
+def _insert_bisect(cur, rows, insert_sql, source):
+    """
+    Insert ``rows`` under a savepoint, bisecting on failure.
+
+    A failing batch is split in half recursively, so each bad row is isolated
+    in O(log n) sub-batches and quarantined; good rows around it still go in.
+    Returns (inserted, rejected).
+    """
+    cur.execute("SAVEPOINT batch;")
+    try:
+        inserted = len(execute_values(cur, insert_sql + " RETURNING 1", rows,
+                                      page_size=len(rows), fetch=True))
+        cur.execute("RELEASE SAVEPOINT batch;")
+        return inserted, 0
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        cur.execute("ROLLBACK TO SAVEPOINT batch;")
+        cur.execute("RELEASE SAVEPOINT batch;")
+        if len(rows) == 1:
+            log.warning("seed_from_json: quarantining row %s – %s", rows[0][3], exc)
+            _quarantine(cur, source, rows[0], exc)
+            return 0, 1
+    mid = len(rows) // 2
+    left  = _insert_bisect(cur, rows[:mid], insert_sql, source)
+    right = _insert_bisect(cur, rows[mid:], insert_sql, source)
+    return left[0] + right[0], left[1] + right[1]
+
+
+def _insert_chunk(conn, cur, rows, target_table, insert_sql, offset=0, sizer=None, source=None):
+    """
+    COPY one chunk of rows and commit; fall back to bisecting execute_values.
+
+    A chunk COPY rejects is retried in adaptive batches (see AdaptiveBatch);
+    failing batches are bisected so bad rows are quarantined individually.
+    The chunk is committed once either way.  Returns the number of rows inserted.
+    """
+    try:
+        inserted, _ = copy_rows(cur, rows, target_table)
+        conn.commit()
+        return inserted
+    except Exception as copy_exc:  # pylint: disable=broad-exception-caught
+        log.warning("seed_from_json: COPY of rows %d-%d failed (%s) – falling back",
+                    offset, offset + len(rows), copy_exc)
+        conn.rollback()
+
+    sizer    = sizer or AdaptiveBatch()
+    inserted = 0
+    rejected = 0
+    start    = 0
+    while start < len(rows):
+        batch = rows[start : start + sizer.size]
+        ok, bad = _insert_bisect(cur, batch, insert_sql, source)
+        inserted += ok
+        rejected += bad
+        sizer.record(bad > 0)
+        start += len(batch)
+    conn.commit()
+    if rejected:
+        log.warning("seed_from_json: rows %d-%d – %d quarantined, batch size now %d",
+                    offset, offset + len(rows), rejected, sizer.size)
+    return inserted
+
+
 def seed_from_json():
     """
-    On first startup, populate gradcafe_main from SEED_JSON if the table is empty.
+    On startup, load new records from SEED_JSON into gradcafe_main.
 
     SEED_JSON is set via the docker-compose worker environment to the path of
     the mounted applicant_data.json (e.g. /data/applicant_data.json).
-    Skipped silently when the file is absent or the table already has rows.
+    The 'seed_json' watermark records the file's size, mtime, prefix hash and
+    consumed byte offset: an unchanged file is skipped without being read and
+    an appended NDJSON file is read from the recorded offset only.  A file
+    without a watermark is read in full even if the table already has rows;
+    the ON CONFLICT (url) merge skips the ones it already holds.
     """
     seed_file = os.getenv("SEED_JSON")
     if not seed_file or not os.path.exists(seed_file):
@@ -205,117 +462,67 @@ def seed_from_json():
     try:
         ensure_watermark_table(conn)
         cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM gradcafe_main;")
-        count = cur.fetchone()[0]
-        if count > 0:
-            log.info("seed_from_json: table already has %d rows – skipping seed", count)
-            # Ensure there is at least one watermark row so /worker_status shows a timestamp
-            cur.execute("SELECT COUNT(*) FROM ingestion_watermarks WHERE source = %s;", ("seed_json",))
-            if cur.fetchone()[0] == 0:
-                cur.execute(
-                    """INSERT INTO ingestion_watermarks (source, last_seen, updated_at)
-                       VALUES (%s, %s, now())
-                       ON CONFLICT (source) DO UPDATE
-                       SET last_seen = EXCLUDED.last_seen, updated_at = now();""",
-                    ("seed_json", seed_file),
-                )
-                conn.commit()
-                log.info("seed_from_json: wrote watermark for pre-existing seed")
+        plan = plan_file_load(cur, seed_file, "seed_json")
+        if plan is None:
+            log.info("seed_from_json: %s unchanged since last seed – skipping", seed_file)
             cur.close()
             return
+        start, ndjson, _ = plan
 
-        log.info("seed_from_json: loading from %s …", seed_file)
-        with open(seed_file, encoding="utf-8") as f:
-            raw = f.read().strip()
-
-        # Support both JSON array and newline-delimited JSON
-        try:
-            records = json.loads(raw)
-            if not isinstance(records, list):
-                records = [records]
-        except json.JSONDecodeError:
-            records = []
-            for line in raw.splitlines():
-                line = line.strip()
-                if line:
-                    try:
-                        records.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass
-
-        if not records:
-            log.warning("seed_from_json: no records parsed from %s", seed_file)
-            cur.close()
-            return
+        log.info("seed_from_json: loading from %s (byte %d) …", seed_file, start)
 
         target_table = os.getenv("TARGET_TABLE", "gradcafe_main")
         id_key       = os.getenv("ID_KEY", "url")
 
-        # Dedup against existing rows. Records may use either lower-case 'url'
+        # Records without an id are skipped. They may use either lower-case 'url'
         # (new format) or 'Url' (legacy module_2 format), so try all casings.
+        # Rows already in the table are skipped server-side by the merge.
         def _get_id(record):
             return (record.get(id_key)
                     or record.get(id_key.capitalize())
                     or record.get(id_key.upper()))
 
-        cur.execute(f"SELECT {id_key} FROM {target_table} WHERE {id_key} IS NOT NULL;")
-        existing = {row[0] for row in cur.fetchall()}
-        records = [r for r in records if _get_id(r) and _get_id(r) not in existing]
-
-        if not records:
-            log.info("seed_from_json: all records already present – skipping")
-            cur.close()
-            return
-
-        rows = []
-        for r in records:
-            try:
-                rows.append(_record_to_row(r))
-            except Exception as row_exc:  # pylint: disable=broad-exception-caught
-                log.warning("seed_from_json: skipping record – %s", row_exc)
-
-        INSERT_SQL = f"""INSERT INTO {target_table} (
-                   program, comments, date_added, url, status, term, us_or_international,
-                   gpa, gre, gre_v, gre_aw, degree, llm_generated_program,
-                   llm_generated_university, raw_data
-               ) VALUES %s
+        INSERT_SQL = f"""INSERT INTO {target_table} ({", ".join(ROW_COLUMNS)})
+               VALUES %s
                ON CONFLICT DO NOTHING"""
 
-        # Insert in batches of 500 so one bad row only skips that batch,
-        # not the entire dataset.
-        BATCH = 500
-        inserted = 0
-        for start in range(0, len(rows), BATCH):
-            batch = rows[start : start + BATCH]
-            try:
-                execute_values(cur, INSERT_SQL, batch)
-                conn.commit()
-                inserted += len(batch)
-            except Exception as batch_exc:  # pylint: disable=broad-exception-caught
-                log.warning("seed_from_json: batch %d-%d failed (%s) – trying row-by-row",
-                            start, start + len(batch), batch_exc)
-                conn.rollback()
-                for row in batch:
-                    try:
-                        execute_values(cur, INSERT_SQL, [row])
-                        conn.commit()
-                        inserted += 1
-                    except Exception as single_exc:  # pylint: disable=broad-exception-caught
-                        log.warning("seed_from_json: skipping row – %s", single_exc)
-                        conn.rollback()
-
-        log.info("seed_from_json: inserted %d / %d rows from %s", inserted, len(rows), seed_file)
-
-        # Update watermark so /worker_status shows a meaningful timestamp
-        cur.execute(
-            """INSERT INTO ingestion_watermarks (source, last_seen, updated_at)
-               VALUES (%s, %s, now())
-               ON CONFLICT (source) DO UPDATE
-               SET last_seen = EXCLUDED.last_seen, updated_at = now();""",
-            ("seed_json", seed_file),
-        )
+        # Records are parsed lazily (JSON array or NDJSON) and loaded in chunks
+        # of COPY_CHUNK_ROWS, so memory stays flat regardless of file size.
+        sizer      = AdaptiveBatch()
+        progress   = {"offset": start}
+        parsed     = 0
+        rows_total = 0
+        inserted   = 0
+        records_in = iter_records_from(seed_file, start, ndjson, progress)
+        for records in _iter_chunks(records_in, COPY_CHUNK_ROWS):
+            parsed += len(records)
+            rows = []
+            for r in records:
+                if not _get_id(r):
+                    continue
+                try:
+                    rows.append(_record_to_row(r))
+                except Exception as row_exc:  # pylint: disable=broad-exception-caught
+                    log.warning("seed_from_json: skipping record – %s", row_exc)
+            if rows:
+                inserted += _insert_chunk(conn, cur, rows, target_table, INSERT_SQL,
+                                          rows_total, sizer, seed_file)
+                rows_total += len(rows)
+
+        # Record how far the file was consumed (also gives /worker_status a timestamp)
+        save_file_watermark(cur, seed_file, progress["offset"], "seed_json")
+        if inserted:
+            refresh_analytics_summary(cur)
         conn.commit()
         cur.close()
+
+        if not parsed:
+            log.warning("seed_from_json: no new records parsed from %s", seed_file)
+        elif not rows_total:
+            log.info("seed_from_json: no records with an id")
+        else:
+            log.info("seed_from_json: inserted %d / %d rows from %s (through byte %d)",
+                     inserted, rows_total, seed_file, progress["offset"])
     except Exception as exc:  # pylint: disable=broad-exception-caught
         log.exception("seed_from_json: failed – %s", exc)
         conn.rollback()
@@ -379,31 +586,16 @@ def handle_scrape_new_data(conn, payload: dict):
         cur.close()
         return
 
-    # ── Get existing URLs to skip duplicates ─────────────────────────────────
-    cur.execute("SELECT url FROM gradcafe_main WHERE url IS NOT NULL;")
-    existing_urls = {row[0] for row in cur.fetchall()}
-
-    new_records = [r for r in cleaned_data if r.get("Url") not in existing_urls]
-    if not new_records:
+    # ── Stage + merge; URLs already present are skipped server-side ─────────
+    rows     = [_record_to_row(r) for r in cleaned_data]
+    inserted, _ = copy_rows(cur, rows)
+    if not inserted:
         log.info("scrape_new_data: no new records after dedup")
         _touch_scrape_watermark(since)
         conn.commit()
         cur.close()
         return
 
-    # ── Insert with ON CONFLICT safety ───────────────────────────────────────
-    rows = [_record_to_row(r) for r in new_records]
-    execute_values(
-        cur,
-        """INSERT INTO gradcafe_main (
-               program, comments, date_added, url, status, term, us_or_international,
-               gpa, gre, gre_v, gre_aw, degree, llm_generated_program,
-               llm_generated_university, raw_data
-           ) VALUES %s
-           ON CONFLICT DO NOTHING""",
-        rows,
-    )
-
     # ── Advance watermark ────────────────────────────────────────────────────
     cur.execute(
         "SELECT MAX(date_added::text) FROM gradcafe_main WHERE url IS NOT NULL;"
@@ -413,10 +605,15 @@ def handle_scrape_new_data(conn, payload: dict):
         _touch_scrape_watermark(max_date)
     else:
         _touch_scrape_watermark(since)
+    refresh_analytics_summary(cur)
 
     conn.commit()
     cur.close()
-    log.info("scrape_new_data: inserted %d new records; watermark → %s", len(rows), max_date)
+    log.info("scrape_new_data: inserted %d / %d scraped records; watermark → %s",
+             inserted, len(rows), max_date)
+
+    # LLM columns are filled by a separate task so scraping never waits on the model
+    _publish_followup("standardize_records")
 
 
 def handle_recompute_analytics(conn, payload: dict):  # pylint: disable=unused-argument
@@ -424,12 +621,15 @@ def handle_recompute_analytics(conn, payload: dict):  # pylint: disable=unused-a
     Refresh analytics summaries used by the UI.
 
     Runs ANALYZE on gradcafe_main so the query planner uses
-    up-to-date statistics, then writes a watermark so the frontend
+    up-to-date statistics, materializes every /analysis answer into
+    analytics_summary, then writes a watermark so the frontend
     can detect when the recompute has finished.
     """
     cur = conn.cursor()
     log.info("recompute_analytics: running ANALYZE gradcafe_main")
     cur.execute("ANALYZE gradcafe_main;")
+    results = refresh_analytics_summary(cur)
+    log.info("recompute_analytics: summary written (%s rows)", results["q10"]["answer"])
     cur.execute(
         """INSERT INTO ingestion_watermarks (source, last_seen, updated_at)
            VALUES ('recompute', now()::text, now())
@@ -441,15 +641,204 @@ def handle_recompute_analytics(conn, payload: dict):  # pylint: disable=unused-a
     log.info("recompute_analytics: complete")
 
 
+def _standardize_remote(rows):
+    """
+    POST one slice of (p_id, program) rows to the standardizer service.
+
+    Returns a list of (p_id, llm_program, llm_university) tuples.
+    """
+    resp = requests.post(
+        f"{STANDARDIZER_URL}/standardize",
+        json={"rows": [{"p_id": p_id, "program": program or ""} for p_id, program in rows]},
+        timeout=STANDARDIZER_TIMEOUT,
+    )
+    resp.raise_for_status()
+    return [
+        (r["p_id"], r.get("llm-generated-program"), r.get("llm-generated-university"))
+        for r in resp.json().get("rows", [])
+    ]
+
+
+def handle_standardize_records(conn, payload: dict):
+    """
+    Fill null llm_generated_program / llm_generated_university columns.
+
+    Rows are picked up in keyset-paginated batches of ``batch_size``.  Each
+    batch is split into slices that are sent to the standardizer service with
+    at most STANDARDIZER_CONCURRENCY requests in flight, and the results are
+    written back with a single bulk UPDATE … FROM (VALUES …) per batch.
+    Slices the service fails on are left null for the next run.
+    """
+    cur         = conn.cursor()
+    batch_size  = int(payload.get("batch_size", STANDARDIZE_BATCH))
+    max_batches = payload.get("max_batches")
+    last_id     = 0
+    batches     = 0
+    updated     = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, STANDARDIZER_CONCURRENCY)) as pool:
+        while True:
+            cur.execute(
+                """SELECT p_id, program FROM gradcafe_main
+                   WHERE (llm_generated_program IS NULL OR llm_generated_university IS NULL)
+                     AND p_id > %s
+                   ORDER BY p_id
+                   LIMIT %s;""",
+                (last_id, batch_size),
+            )
+            batch = cur.fetchall()
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            slices  = [batch[i:i + STANDARDIZE_REQUEST_ROWS]
+                       for i in range(0, len(batch), STANDARDIZE_REQUEST_ROWS)]
+            results = []
+            for fut in [pool.submit(_standardize_remote, s) for s in slices]:
+                try:
+                    results.extend(fut.result())
+                except (requests.RequestException, ValueError, KeyError) as exc:
+                    log.warning("standardize_records: slice failed – %s", exc)
+
+            if results:
+                execute_values(
+                    cur,
+                    """UPDATE gradcafe_main AS g
+                       SET llm_generated_program    = COALESCE(g.llm_generated_program, v.prog),
+                           llm_generated_university = COALESCE(g.llm_generated_university, v.uni)
+                       FROM (VALUES %s) AS v(p_id, prog, uni)
+                       WHERE g.p_id = v.p_id""",
+                    results,
+                    page_size=len(results),
+                )
+                updated += cur.rowcount
+            conn.commit()
+            batches += 1
+            log.info("standardize_records: batch %d → %d/%d rows (through p_id %d)",
+                     batches, len(results), len(batch), last_id)
+            if max_batches and batches >= int(max_batches):
+                break
+
+    cur.execute(
+        """INSERT INTO ingestion_watermarks (source, last_seen, updated_at)
+           VALUES ('standardize', %s, now())
+           ON CONFLICT (source) DO UPDATE
+           SET last_seen = EXCLUDED.last_seen, updated_at = now();""",
+        (str(last_id),),
+    )
+    if updated:
+        refresh_analytics_summary(cur)
+    conn.commit()
+    cur.close()
+    log.info("standardize_records: updated %d rows in %d batches", updated, batches)
+
+
+def _normalize_remote(programs, universities):
+    """
+    Ask the standardizer to re-apply its post-normalization to stored values.
+
+    Returns two {old: new} dicts (programs, universities).
+    """
+    resp = requests.post(
+        f"{STANDARDIZER_URL}/normalize",
+        json={"programs": programs, "universities": universities},
+        timeout=STANDARDIZER_TIMEOUT,
+    )
+    resp.raise_for_status()
+    body = resp.json()
+    return body.get("programs", {}), body.get("universities", {})
+
+
+def handle_restandardize(conn, payload: dict):  # pylint: disable=unused-argument
+    """
+    Re-apply canonical-list normalization to already-standardized rows.
+
+    Used after canon_programs.txt / canon_universities.txt are edited: no
+    model calls are made.  Each *distinct* stored value is mapped exactly
+    once by the standardizer's /normalize endpoint, only the values that
+    actually change are loaded into temp tables, and the table is rewritten
+    with a single set-based UPDATE.  Returns the number of rows changed.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT DISTINCT llm_generated_program FROM gradcafe_main
+           WHERE llm_generated_program IS NOT NULL;"""
+    )
+    programs = [r[0] for r in cur.fetchall()]
+    cur.execute(
+        """SELECT DISTINCT llm_generated_university FROM gradcafe_main
+           WHERE llm_generated_university IS NOT NULL;"""
+    )
+    universities = [r[0] for r in cur.fetchall()]
+
+    prog_map, uni_map = {}, {}
+    step = max(1, NORMALIZE_REQUEST_VALUES)
+    for i in range(0, max(len(programs), len(universities)), step):
+        progs, unis = _normalize_remote(programs[i:i + step], universities[i:i + step])
+        prog_map.update(progs)
+        uni_map.update(unis)
+
+    prog_changes = [(old, new) for old, new in prog_map.items() if new and new != old]
+    uni_changes  = [(old, new) for old, new in uni_map.items() if new and new != old]
+    log.info("restandardize: %d/%d programs and %d/%d universities remapped",
+             len(prog_changes), len(programs), len(uni_changes), len(universities))
+
+    changed = 0
+    if prog_changes or uni_changes:
+        cur.execute(
+            """CREATE TEMP TABLE restd_prog (old TEXT PRIMARY KEY, new TEXT NOT NULL)
+               ON COMMIT DROP;
+               CREATE TEMP TABLE restd_uni (old TEXT PRIMARY KEY, new TEXT NOT NULL)
+               ON COMMIT DROP;"""
+        )
+        if prog_changes:
+            execute_values(cur, "INSERT INTO restd_prog (old, new) VALUES %s", prog_changes)
+        if uni_changes:
+            execute_values(cur, "INSERT INTO restd_uni (old, new) VALUES %s", uni_changes)
+        cur.execute(
+            """UPDATE gradcafe_main AS g
+               SET llm_generated_program = COALESCE(
+                       (SELECT p.new FROM restd_prog p WHERE p.old = g.llm_generated_program),
+                       g.llm_generated_program),
+                   llm_generated_university = COALESCE(
+                       (SELECT u.new FROM restd_uni u WHERE u.old = g.llm_generated_university),
+                       g.llm_generated_university)
+               WHERE g.llm_generated_program IN (SELECT old FROM restd_prog)
+                  OR g.llm_generated_university IN (SELECT old FROM restd_uni);"""
+        )
+        changed = cur.rowcount
+
+    cur.execute(
+        """INSERT INTO ingestion_watermarks (source, last_seen, updated_at)
+           VALUES ('restandardize', %s, now())
+           ON CONFLICT (source) DO UPDATE
+           SET last_seen = EXCLUDED.last_seen, updated_at = now();""",
+        (str(changed),),
+    )
+    if changed:
+        refresh_analytics_summary(cur)
+    conn.commit()
+    cur.close()
+    log.info("restandardize: %d rows changed", changed)
+    return changed
+
+
 # ── Task dispatch map ────────────────────────────────────────────────────────
 TASK_MAP = {
     "scrape_new_data":     handle_scrape_new_data,
     "recompute_analytics": handle_recompute_analytics,
+    "standardize_records": handle_standardize_records,
+    "restandardize":       handle_restandardize,
 }
 
 
 # ── Consumer loop ────────────────────────────────────────────────────────────
 
+def _routing_key(kind):
+    """Routing key for a task kind: LLM tasks go to the standardize queue."""
+    return STANDARDIZE_ROUTING_KEY if kind in STANDARDIZE_TASKS else ROUTING_KEY
+
+
 def _open_channel():
     """Connect to RabbitMQ and return (connection, channel)."""
     url    = os.environ["RABBITMQ_URL"]
@@ -459,10 +848,39 @@ def _open_channel():
     ch.exchange_declare(exchange=EXCHANGE, exchange_type="direct", durable=True)
     ch.queue_declare(queue=QUEUE, durable=True)
     ch.queue_bind(exchange=EXCHANGE, queue=QUEUE, routing_key=ROUTING_KEY)
+    ch.queue_declare(queue=STANDARDIZE_QUEUE, durable=True)
+    ch.queue_bind(exchange=EXCHANGE, queue=STANDARDIZE_QUEUE,
+                  routing_key=STANDARDIZE_ROUTING_KEY)
     ch.basic_qos(prefetch_count=1)
     return conn, ch
 
 
+def _publish_followup(kind, payload=None):
+    """
+    Enqueue another task on the same durable exchange (routed by kind).
+
+    Failures are logged, not raised: the task that triggered the follow-up
+    has already committed its own work.
+    """
+    body = json.dumps(
+        {"kind": kind, "ts": datetime.now(timezone.utc).isoformat(), "payload": payload or {}},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    try:
+        rmq_conn, ch = _open_channel()
+        try:
+            ch.basic_publish(
+                exchange=EXCHANGE,
+                routing_key=_routing_key(kind),
+                body=body,
+                properties=pika.BasicProperties(delivery_mode=2, content_type="application/json"),
+            )
+        finally:
+            rmq_conn.close()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        log.warning("Could not enqueue follow-up task '%s': %s", kind, exc)
+
+
 def on_message(ch, method, _properties, body):
     """
     Callback invoked for each RabbitMQ message.
@@ -503,15 +921,30 @@ def on_message(ch, method, _properties, body):
 
 
 def run():
-    """Start the long-running consumer with automatic reconnect."""
-    seed_from_json()
+    """
+    Start the long-running consumer with automatic reconnect.
+
+    The main worker (WORKER_QUEUE=tasks_q) brings the schema up to date and
+    seeds before consuming; the standardize worker only consumes.
+    """
+    if WORKER_QUEUE == QUEUE:
+        conn = get_db_connection()
+        try:
+            ensure_derived_columns(conn)
+            ensure_workload_indexes(conn)
+            ensure_row_counter(conn)
+            ensure_watermark_table(conn)
+            ensure_watermark_notify(conn)
+        finally:
+            conn.close()
+        seed_from_json()
     retry_delay = 5
     while True:
         try:
             log.info("Connecting to RabbitMQ …")
             rmq_conn, ch = _open_channel()
-            ch.basic_consume(queue=QUEUE, on_message_callback=on_message)
-            log.info("Worker ready – waiting for tasks on '%s'.", QUEUE)
+            ch.basic_consume(queue=WORKER_QUEUE, on_message_callback=on_message)
+            log.info("Worker ready – waiting for tasks on '%s'.", WORKER_QUEUE)
             ch.start_consuming()
         except pika.exceptions.AMQPConnectionError as exc:
             log.error("RabbitMQ connection lost: %s – retrying in %ss", exc, retry_delay)
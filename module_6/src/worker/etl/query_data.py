@@ -8,6 +8,7 @@ import os
 import re
 
 import psycopg2
+from psycopg2 import sql
 from dotenv import load_dotenv
 
 load_dotenv(override=False)
@@ -44,11 +45,15 @@ def get_record_count(dbname=None) -> int:
     return count
 
 
-def get_existing_urls(dbname=None) -> set:
-    """Return the set of URLs already present in gradcafe_main."""
+def get_existing_urls(urls, dbname=None) -> set:
+    """Return the subset of ``urls`` already present in gradcafe_main.
+
+    Only the candidate batch is looked up (via the url index), so the cost
+    scales with ``len(urls)`` rather than with the table.
+    """
     conn = get_db_connection(dbname)
     cur = conn.cursor()
-    cur.execute("SELECT url FROM gradcafe_main WHERE url IS NOT NULL;")
+    cur.execute("SELECT url FROM gradcafe_main WHERE url = ANY(%s);", (list(urls),))
     urls = {row[0] for row in cur.fetchall()}
     cur.close()
     conn.close()
@@ -66,3 +71,184 @@ def get_watermark(source: str, dbname=None) -> str | None:
     cur.close()
     conn.close()
     return row[0] if row else None
+
+
+# ── Question catalogue ────────────────────────────────────────────────────────
+# Each entry is (question text, display SQL, params).  question_N() runs the
+# display SQL on its own; compute_analysis() answers every question in one
+# pass and shows the same SQL so the page reads per question.
+# Copied from src/web/query_data.py (separate build context) so the worker
+# can materialize analytics_summary; change both together.
+
+QUESTIONS = {
+    "q1": (
+        "How many entries do you have in your database who have applied for Fall 2026?",
+        "SELECT COUNT(*) FROM {table} WHERE term = %s",
+        ("Fall 2026",),
+    ),
+    "q2": (
+        "What percentage of entries are from international students?",
+        """SELECT ROUND((COUNT(*) FILTER (WHERE us_or_international = %s) * 100.0
+                         / NULLIF(COUNT(*), 0)), 2)
+           FROM {table}
+           WHERE us_or_international IS NOT NULL""",
+        ("International",),
+    ),
+    "q3": (
+        "What are the average GPA and GRE scores for accepted applicants?",
+        """SELECT ROUND(AVG(gpa)::numeric, 2),
+                  ROUND(AVG(gre)::numeric, 2),
+                  ROUND(AVG(gre_v)::numeric, 2),
+                  ROUND(AVG(gre_aw)::numeric, 2)
+           FROM {table}
+           WHERE status = %s""",
+        ("Accepted",),
+    ),
+    "q4": (
+        "What is the highest GPA among accepted applicants?",
+        "SELECT MAX(gpa) FROM {table} WHERE status = %s",
+        ("Accepted",),
+    ),
+    "q5": (
+        "What is the most common application status?",
+        "SELECT status, COUNT(*) AS cnt FROM {table} WHERE status IS NOT NULL "
+        "GROUP BY status ORDER BY cnt DESC LIMIT 1",
+        (),
+    ),
+    "q6": (
+        "What is the average GPA of rejected applicants?",
+        "SELECT ROUND(AVG(gpa)::numeric, 2) FROM {table} WHERE status = %s",
+        ("Rejected",),
+    ),
+    "q7": (
+        "How many entries are PhD applicants?",
+        "SELECT COUNT(*) FROM {table} WHERE degree ILIKE %s",
+        ("%PhD%",),
+    ),
+    "q8": (
+        "How many Computer Science program acceptances are there?",
+        "SELECT COUNT(*) FROM {table} WHERE status = %s AND program_category = %s",
+        ("Accepted", "computer_science"),
+    ),
+    "q9": (
+        "What is the total number of CS applications?",
+        # program_category is generated from the program text: "computer_science"
+        # for "Computer Science", "cs_related" for Comp Sci / CS / Software
+        # Engineering / Informatics (see db/derived_columns.sql).
+        "SELECT COUNT(*) FROM {table} WHERE program_category IN (%s, %s)",
+        ("computer_science", "cs_related"),
+    ),
+    "q10": (
+        "What is the total number of records in the database?",
+        "SELECT COUNT(*) FROM {table}",
+        (),
+    ),
+    "q11": (
+        "Which universities have the highest average GPA among accepted applicants?",
+        """SELECT
+                  CASE WHEN llm_generated_university = LOWER(llm_generated_university)
+                       THEN INITCAP(llm_generated_university)
+                       ELSE llm_generated_university
+                  END AS university_name,
+                  ROUND(AVG(gpa)::numeric, 2) AS avg_gpa,
+                  COUNT(*) AS acceptances
+           FROM {table}
+           WHERE status = 'Accepted'
+             AND llm_generated_university IS NOT NULL
+             AND gpa IS NOT NULL
+           GROUP BY university_name
+           ORDER BY avg_gpa DESC
+           LIMIT 10""",
+        (),
+    ),
+}
+
+# Every scalar question as one FILTER aggregate, so a single sequential scan
+# answers q1–q4 and q6–q10.  Column order must match SCALAR_COLUMNS.
+SCALAR_SQL = """
+    SELECT COUNT(*) FILTER (WHERE term = %(fall)s),
+           ROUND(COUNT(*) FILTER (WHERE us_or_international = %(intl)s) * 100.0
+                 / NULLIF(COUNT(*) FILTER (WHERE us_or_international IS NOT NULL), 0), 2),
+           ROUND((AVG(gpa) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           ROUND((AVG(gre) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           ROUND((AVG(gre_v) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           ROUND((AVG(gre_aw) FILTER (WHERE status = %(accepted)s))::numeric, 2),
+           MAX(gpa) FILTER (WHERE status = %(accepted)s),
+           ROUND((AVG(gpa) FILTER (WHERE status = %(rejected)s))::numeric, 2),
+           COUNT(*) FILTER (WHERE degree ILIKE %(phd)s),
+           COUNT(*) FILTER (WHERE status = %(accepted)s AND program_category = %(cs)s),
+           COUNT(*) FILTER (WHERE program_category IN (%(cs)s, %(cs_related)s)),
+           COUNT(*)
+    FROM {table}
+"""
+SCALAR_PARAMS = {
+    "fall": "Fall 2026",
+    "intl": "International",
+    "accepted": "Accepted",
+    "rejected": "Rejected",
+    "phd": "%PhD%",
+    "cs": "computer_science",
+    "cs_related": "cs_related",
+}
+# (question key, number of SCALAR_SQL columns it owns), in column order
+SCALAR_COLUMNS = (
+    ("q1", 1), ("q2", 1), ("q3", 4), ("q4", 1), ("q6", 1),
+    ("q7", 1), ("q8", 1), ("q9", 1), ("q10", 1),
+)
+
+
+def _table_sql(template):
+    """Bind the {table} placeholder of a query template to gradcafe_main."""
+    return sql.SQL(template).format(table=sql.Identifier("gradcafe_main"))
+
+
+def _format_answer(key, result):
+    """Shape a question's raw row (or rows, for q11) into its template answer."""
+    if key == "q3":
+        if not result:
+            return {"avg_gpa": None, "avg_gre": None, "avg_gre_v": None, "avg_gre_aw": None}
+        return {
+            "avg_gpa": result[0],
+            "avg_gre": result[1],
+            "avg_gre_v": result[2],
+            "avg_gre_aw": result[3],
+        }
+    if key == "q5":
+        return f"{result[0]} ({result[1]} entries)" if result else "N/A"
+    if key == "q11":
+        return result
+    if key in ("q4", "q6"):
+        return result[0] if result else None
+    return result[0] if result else 0
+
+
+def _answer(cur, key, result):
+    """Build the ``{question, query, answer}`` dict the template renders."""
+    question, template, params = QUESTIONS[key]
+    query_str = cur.mogrify(_table_sql(template), params).decode("utf-8")
+    return {
+        "question": question,
+        "query": query_str.strip(),
+        "answer": _format_answer(key, result),
+    }
+
+
+def compute_analysis(cur):
+    """
+    Answer every question on ``cur`` and return the results dict.
+
+    A single FILTER-aggregate scan answers every scalar question, then the
+    two grouped questions (q5, q11) run on the same cursor.
+    """
+    cur.execute(_table_sql(SCALAR_SQL), SCALAR_PARAMS)
+    scalars = cur.fetchone()
+    rows = {}
+    offset = 0
+    for key, width in SCALAR_COLUMNS:
+        rows[key] = scalars[offset:offset + width] if scalars else None
+        offset += width
+    cur.execute(_table_sql(QUESTIONS["q5"][1]))
+    rows["q5"] = cur.fetchone()
+    cur.execute(_table_sql(QUESTIONS["q11"][1]))
+    rows["q11"] = cur.fetchall()
+    return {key: _answer(cur, key, rows[key]) for key in QUESTIONS}
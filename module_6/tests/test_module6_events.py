@@ -0,0 +1,134 @@
+"""Unit tests for the task-event hub in src/web/events.py.
+
+No database is needed: a fake connection backed by a socket pair stands in
+for psycopg2, so the listener thread's select()/poll() loop runs for real.
+"""
+import queue
+import socket
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import events
+from events import _parse
+
+
+class _FakeListenConnection:
+    """psycopg2-like connection whose notifications are pushed by the test."""
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._pending = []
+        self._lock = threading.Lock()
+        self.notifies = []
+        self.listening = threading.Event()
+        self.closed = threading.Event()
+        self.cursor_obj = MagicMock()
+        self.cursor_obj.execute.side_effect = lambda *_: self.listening.set()
+
+    def notify(self, payload):
+        with self._lock:
+            self._pending.append(SimpleNamespace(payload=payload))
+        self._writer.send(b"x")
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def set_isolation_level(self, _level):
+        return None
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def poll(self):
+        self._reader.recv(1024)
+        with self._lock:
+            self.notifies.extend(self._pending)
+            self._pending.clear()
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+        self.closed.set()
+
+
+def test_parse_json_and_plain_payloads():
+    assert _parse('{"source": "recompute"}') == {"source": "recompute"}
+    assert _parse("seed_json") == {"source": "seed_json"}
+    assert _parse("[1]") == {"source": "[1]"}
+
+
+def test_publish_fans_out_to_every_subscriber():
+    hub = events.TaskEventHub(connect=MagicMock(side_effect=RuntimeError("no db")))
+    first, second = hub.subscribe(), hub.subscribe()
+
+    hub.publish({"source": "recompute"})
+
+    assert first.get_nowait() == {"source": "recompute"}
+    assert second.get_nowait() == {"source": "recompute"}
+    hub.unsubscribe(first)
+    hub.unsubscribe(second)
+
+
+def test_slow_subscriber_drops_oldest_events():
+    hub = events.TaskEventHub(connect=MagicMock(side_effect=RuntimeError("no db")))
+    with patch.object(events, "EVENTS_QUEUE_SIZE", 2):
+        client = hub.subscribe()
+
+    for i in range(3):
+        hub.publish({"n": i})
+
+    assert [client.get_nowait()["n"] for _ in range(2)] == [1, 2]
+    assert hub.stats()["dropped"] == 1
+    hub.unsubscribe(client)
+
+
+def test_single_listener_relays_notifications_until_last_client_leaves():
+    conn = _FakeListenConnection()
+    connect = MagicMock(return_value=conn)
+    hub = events.TaskEventHub(connect=connect, poll_seconds=0.05)
+
+    first, second = hub.subscribe(), hub.subscribe()
+    assert conn.listening.wait(2)
+    conn.notify('{"source": "gradcafe_scraped", "last_seen": "2026-03-01"}')
+
+    expected = {"source": "gradcafe_scraped", "last_seen": "2026-03-01"}
+    assert first.get(timeout=2) == expected
+    assert second.get(timeout=2) == expected
+    connect.assert_called_once()
+    conn.cursor_obj.execute.assert_called_once_with("LISTEN ingestion_watermarks;")
+    assert hub.stats()["listening"] is True
+
+    hub.unsubscribe(first)
+    hub.unsubscribe(second)
+    assert conn.closed.wait(2)
+    assert hub.stats()["subscribers"] == 0
+
+
+def test_listener_reconnects_after_connection_failure():
+    conn = _FakeListenConnection()
+    connect = MagicMock(side_effect=[RuntimeError("db starting"), conn])
+    hub = events.TaskEventHub(connect=connect, poll_seconds=0.05)
+
+    with patch.object(events, "EVENTS_RECONNECT_SECONDS", 0.01):
+        client = hub.subscribe()
+        assert conn.listening.wait(2)
+    conn.notify('{"source": "recompute"}')
+
+    assert client.get(timeout=2) == {"source": "recompute"}
+    assert hub.stats()["reconnects"] == 1
+    hub.unsubscribe(client)
+    assert conn.closed.wait(2)
+
+
+def test_resubscribe_after_last_client_left_starts_a_new_listener():
+    hub = events.TaskEventHub(connect=MagicMock(side_effect=RuntimeError("no db")))
+    client = hub.subscribe()
+    hub.unsubscribe(client)
+    assert hub.stats()["listening"] is False
+
+    client = hub.subscribe()
+
+    assert hub.stats()["listening"] is True
+    hub.unsubscribe(client)
+    assert isinstance(client, queue.Queue)
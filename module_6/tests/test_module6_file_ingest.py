@@ -0,0 +1,76 @@
+"""Incremental file ingestion against a real database.
+
+Loads into gradcafe_main of TEST_DB_NAME (default gradcafe_test) and only
+touches rows whose url starts with URL_PREFIX.  Skipped when no PostgreSQL
+is reachable through DATABASE_URL / DB_* variables.
+"""
+import json
+
+import psycopg2
+import pytest
+
+import load_data
+
+TEST_DB = "gradcafe_test"
+URL_PREFIX = "https://test.invalid/ingest-"
+
+
+def _record(i):
+    return {
+        "program": "Physics, MIT",
+        "applicant_status": "Accepted",
+        "url": f"{URL_PREFIX}{i}",
+    }
+
+
+def _count(cur):
+    cur.execute("SELECT COUNT(*) FROM gradcafe_main WHERE url LIKE %s;", (URL_PREFIX + "%",))
+    return cur.fetchone()[0]
+
+
+@pytest.fixture
+def db_cursor(tmp_path):
+    """Cursor on TEST_DB with this test's rows and watermark cleared."""
+    try:
+        conn = load_data.get_db_connection(TEST_DB)
+        load_data.ensure_schema(conn)
+    except psycopg2.Error as exc:
+        pytest.skip(f"PostgreSQL not available: {exc}")
+    conn.autocommit = True
+    cur = conn.cursor()
+
+    def _cleanup():
+        cur.execute("DELETE FROM gradcafe_main WHERE url LIKE %s;", (URL_PREFIX + "%",))
+        cur.execute("DELETE FROM ingestion_watermarks WHERE source LIKE %s;",
+                    (f"file:{tmp_path}%",))
+
+    _cleanup()
+    yield cur
+    _cleanup()
+    cur.close()
+    conn.close()
+
+
+def test_unknown_file_is_read_into_populated_table(db_cursor, tmp_path):
+    load_data.copy_rows(db_cursor, (load_data.record_to_row(_record(i)) for i in range(2)))
+    path = tmp_path / "seed.json"
+    path.write_text(json.dumps([_record(i) for i in range(5)]), encoding="utf-8")
+
+    load_data.load_data(file_path=str(path), dbname=TEST_DB)
+
+    assert _count(db_cursor) == 5
+    db_cursor.execute("SELECT byte_offset FROM ingestion_watermarks WHERE source = %s;",
+                      (load_data.file_source(path),))
+    assert db_cursor.fetchone()[0] == path.stat().st_size
+
+
+def test_known_unchanged_file_is_skipped(db_cursor, tmp_path):
+    path = tmp_path / "seed.json"
+    path.write_text(json.dumps([_record(i) for i in range(3)]), encoding="utf-8")
+    load_data.load_data(file_path=str(path), dbname=TEST_DB)
+    db_cursor.execute("DELETE FROM gradcafe_main WHERE url = %s;", (f"{URL_PREFIX}0",))
+
+    load_data.load_data(file_path=str(path), dbname=TEST_DB)
+
+    assert _count(db_cursor) == 2
+
@@ -0,0 +1,200 @@
+"""Generated classification columns and the plans of the production queries.
+
+The tests that need PostgreSQL load a scratch copy of gradcafe_main (same
+columns, generated expressions and indexes), check the classification and
+EXPLAIN the queries /analysis and the worker's summary actually run, with
+the planner's default settings; they are skipped when no PostgreSQL is
+reachable through DATABASE_URL / DB_* variables.
+"""
+import json
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+import load_data
+import query_data
+
+SCRATCH_TABLE = "gradcafe_explain"
+
+
+def test_record_to_row_leaves_derived_columns_to_postgres():
+    row = load_data.record_to_row({
+        "program": "Computer Science, Johns Hopkins University",
+        "applicant_status": "Accepted",
+        "url": "https://www.thegradcafe.com/result/1",
+        "llm-generated-university": "Johns Hopkins University",
+    })
+    values = dict(zip(load_data.ROW_COLUMNS, row))
+
+    assert len(row) == len(load_data.ROW_COLUMNS)
+    assert "program_category" not in values
+    assert json.loads(values["raw_data"])["applicant_status"] == "Accepted"
+
+
+class _RecordingCursor:
+    """Cursor stand-in that keeps every statement it is given."""
+
+    rowcount = 0
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, *_args):
+        self.statements.append(statement)
+
+    def close(self):
+        return None
+
+
+def test_create_indexes_names_by_table():
+    cur = _RecordingCursor()
+
+    load_data.create_indexes(cur, load_data.WORKLOAD_INDEXES[:1])
+    load_data.create_indexes(cur, load_data.WORKLOAD_INDEXES[:1], "gradcafe_bench")
+
+    assert cur.statements == [
+        "CREATE INDEX IF NOT EXISTS idx_gradcafe_status ON gradcafe_main (status);",
+        "CREATE INDEX IF NOT EXISTS idx_gradcafe_bench_status ON gradcafe_bench (status);",
+    ]
+
+
+def test_ensure_schema_runs_derived_columns_file():
+    cur = _RecordingCursor()
+    conn = type("Conn", (), {"cursor": lambda self: cur, "commit": lambda self: None})()
+
+    load_data.ensure_schema(conn)
+
+    assert any("GENERATED ALWAYS AS" in str(s) and "program_category" in str(s)
+               for s in cur.statements)
+    assert not any("UPDATE gradcafe_main" in str(s) for s in cur.statements)
+
+
+def test_ensure_schema_runs_watermark_notify_file():
+    cur = _RecordingCursor()
+    conn = type("Conn", (), {"cursor": lambda self: cur, "commit": lambda self: None})()
+
+    load_data.ensure_schema(conn)
+
+    db_dir = Path(load_data.__file__).parent
+    assert (db_dir / "watermark_notify.sql").read_text(encoding="utf-8") in cur.statements
+    assert "ingestion_watermarks_notify" not in (db_dir / "init.sql").read_text(encoding="utf-8")
+
+
+def test_ensure_schema_drops_duplicate_url_index():
+    cur = _RecordingCursor()
+    conn = type("Conn", (), {"cursor": lambda self: cur, "commit": lambda self: None})()
+
+    load_data.ensure_schema(conn)
+
+    assert "DROP INDEX IF EXISTS idx_gradcafe_url;" in cur.statements
+    assert not any("idx_gradcafe_url ON" in str(s) for s in cur.statements)
+
+
+def test_ensure_schema_drops_indexes_no_query_reads():
+    cur = _RecordingCursor()
+    conn = type("Conn", (), {"cursor": lambda self: cur, "commit": lambda self: None})()
+
+    load_data.ensure_schema(conn)
+
+    for suffix in ("program_trgm", "degree_trgm", "program_category", "university_key",
+                   "status_scores", "term", "citizenship"):
+        assert f"DROP INDEX IF EXISTS idx_gradcafe_{suffix};" in cur.statements
+    assert not any("gin_trgm_ops" in str(s) for s in cur.statements)
+
+
+# ── EXPLAIN (needs PostgreSQL) ────────────────────────────────────────────────
+
+@pytest.fixture(scope="module")
+def scratch_cursor():
+    """Cursor on a populated, vacuumed and analyzed copy of gradcafe_main."""
+    try:
+        conn = load_data.get_db_connection()
+        load_data.ensure_schema(conn)
+    except psycopg2.Error as exc:
+        pytest.skip(f"PostgreSQL not available: {exc}")
+
+    cur = conn.cursor()
+    cur.execute(f"DROP TABLE IF EXISTS {SCRATCH_TABLE};")
+    cur.execute(f"CREATE TABLE {SCRATCH_TABLE} (LIKE gradcafe_main INCLUDING ALL);")
+    programs = ["Computer Science, JHU", "Physics, MIT", "Software Engineering, UBC",
+                "History, Yale", "Mathematics, McGill"]
+    rows = (
+        load_data.record_to_row({
+            "program": programs[i % len(programs)],
+            "comments": f"Heard back by email {i % 12} weeks after the interview.",
+            "applicant_status": "Accepted" if i % 3 else "Rejected",
+            "masters_or_phd": "PhD" if i % 7 == 0 else "Masters",
+            "semester_year_start": "Fall 2026" if i % 4 else "Fall 2025",
+            "citizenship": "International" if i % 2 else None,
+            "gpa": f"GPA {3 + i % 10 / 10:.2f}",
+            "llm-generated-university": f"University {i % 50}",
+            "url": f"https://www.thegradcafe.com/result/explain-{i}",
+        })
+        for i in range(20000)
+    )
+    load_data.copy_rows(cur, rows, SCRATCH_TABLE)
+    conn.commit()
+    # Index-only scans need the visibility map that VACUUM sets
+    conn.autocommit = True
+    cur.execute(f"VACUUM ANALYZE {SCRATCH_TABLE};")
+    conn.autocommit = False
+    yield cur
+    conn.rollback()
+    cur.execute(f"DROP TABLE IF EXISTS {SCRATCH_TABLE};")
+    conn.commit()
+    cur.close()
+    conn.close()
+
+
+@pytest.mark.parametrize("program, category", [
+    ("Computer Science, Johns Hopkins University", "computer_science"),
+    ("COMPUTER SCIENCE (MSE)", "computer_science"),
+    ("Applied Comp Sci, McGill", "cs_related"),
+    ("MS CS program, MIT", "cs_related"),
+    ("Software Engineering, UBC", "cs_related"),
+    ("Health Informatics, JHU", "cs_related"),
+    ("Physics, CSU", "other"),
+    (None, "other"),
+])
+def test_program_category_is_generated(scratch_cursor, program, category):
+    scratch_cursor.execute("SAVEPOINT classify;")
+    scratch_cursor.execute(
+        f"INSERT INTO {SCRATCH_TABLE} (program) VALUES (%s) RETURNING program_category;",
+        (program,),
+    )
+    assert scratch_cursor.fetchone()[0] == category
+    scratch_cursor.execute("ROLLBACK TO SAVEPOINT classify;")
+
+
+def _plan_nodes(cur, query, params):
+    """Node types and index names of EXPLAIN for ``query`` on the scratch table."""
+    query = query_data.sql.SQL(query).format(table=query_data.sql.Identifier(SCRATCH_TABLE))
+    cur.execute(query_data.sql.SQL("EXPLAIN (FORMAT JSON) ") + query, params)
+    plan = cur.fetchone()[0][0]["Plan"]
+    nodes, stack = [], [plan]
+    while stack:
+        node = stack.pop()
+        nodes.append((node["Node Type"], node.get("Index Name", "")))
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+def test_scalar_pass_is_one_sequential_scan(scratch_cursor):
+    nodes = _plan_nodes(scratch_cursor, query_data.SCALAR_SQL, query_data.SCALAR_PARAMS)
+
+    # Every scalar question is answered by this one scan; no index helps it
+    assert [node for node, _ in nodes if "Scan" in node] == ["Seq Scan"], nodes
+
+
+@pytest.mark.parametrize("key, column", [
+    ("q5", "status"),
+    ("q11", "llm_generated_university"),
+])
+def test_grouped_questions_run_index_only(scratch_cursor, key, column):
+    _, template, params = query_data.QUESTIONS[key]
+    nodes = _plan_nodes(scratch_cursor, template, params)
+
+    # Indexes copied by LIKE ... INCLUDING ALL are named <table>_<columns>_idx
+    assert any(node == "Index Only Scan" and name.startswith(f"{SCRATCH_TABLE}_{column}_")
+               for node, name in nodes), nodes
@@ -0,0 +1,194 @@
+"""Unit tests for the streaming reader and file partitioning in src/db/load_data.py.
+
+No database is needed: these exercise the readers, partitioning and file
+watermark planning on generated files.
+Set STREAM_TEST_MB=1024 to run the memory check against a 1 GB file.
+"""
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from load_data import (
+    _hash_prefix,
+    _iter_range,
+    iter_records,
+    iter_records_from,
+    partition_file,
+    plan_file_load,
+)
+
+STREAM_TEST_MB = int(os.getenv("STREAM_TEST_MB", "64"))
+
+# Peak Python heap allowed while streaming, independent of file size.
+PEAK_LIMIT_BYTES = 8 * 1024 * 1024
+
+
+def _record(i):
+    return {
+        "program": "Computer Science, Johns Hopkins University",
+        "comments": "x" * 200,
+        "url": f"https://www.thegradcafe.com/result/{i}",
+        "applicant_status": "Accepted",
+    }
+
+
+def _write_array(path, target_bytes):
+    """Write a JSON array of records until the file reaches ``target_bytes``."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        while f.tell() < target_bytes:
+            if count:
+                f.write(",\n")
+            f.write(json.dumps(_record(count)))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def _write_ndjson(path, target_bytes):
+    """Write one record per line until the file reaches ``target_bytes``."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while f.tell() < target_bytes:
+            f.write(json.dumps(_record(count)) + "\n")
+            count += 1
+    return count
+
+
+def _peak_while_streaming(path):
+    """Consume iter_records(path) and return (records seen, traced peak bytes)."""
+    tracemalloc.start()
+    try:
+        seen = 0
+        for _ in iter_records(path):
+            seen += 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seen, peak
+
+
+def test_json_array_across_chunk_boundaries(tmp_path):
+    path = tmp_path / "data.json"
+    records = [{"a": i, "s": "],{é" * i} for i in range(20)]
+    path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+
+    assert list(iter_records(path, chunk_size=7)) == records
+
+
+def test_ndjson_skips_malformed_lines_and_strips_nul(tmp_path):
+    path = tmp_path / "data.ndjson"
+    path.write_text('{"a": 1}\nnot json\n\n{"a": "x\x00y"}\n', encoding="utf-8")
+
+    assert list(iter_records(path)) == [{"a": 1}, {"a": "xy"}]
+
+
+def test_single_pretty_printed_object(tmp_path):
+    path = tmp_path / "one.json"
+    path.write_text('{\n  "a": 1\n}\n', encoding="utf-8")
+
+    assert list(iter_records(path)) == [{"a": 1}]
+
+
+def test_empty_file_yields_nothing(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("", encoding="utf-8")
+
+    assert not list(iter_records(path))
+
+
+def test_truncated_array_raises(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text('[{"a": 1}, {"b": ', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(iter_records(path))
+
+
+@pytest.mark.parametrize("writer", [_write_array, _write_ndjson])
+def test_peak_memory_is_flat_in_file_size(tmp_path, writer):
+    small = tmp_path / "small"
+    large = tmp_path / "large"
+    small_count = writer(small, 4 * 1024 * 1024)
+    large_count = writer(large, STREAM_TEST_MB * 1024 * 1024)
+
+    small_seen, small_peak = _peak_while_streaming(small)
+    large_seen, large_peak = _peak_while_streaming(large)
+
+    assert (small_seen, large_seen) == (small_count, large_count)
+    assert large_peak < PEAK_LIMIT_BYTES
+    # Growing the file many times over must not grow the peak meaningfully.
+    assert large_peak < small_peak * 2 + 256 * 1024
+
+
+@pytest.mark.parametrize("layout", ["indented", "ndjson", "compact"])
+@pytest.mark.parametrize("parts", [1, 3, 8])
+def test_partition_file_ranges_cover_every_record_once(tmp_path, layout, parts):
+    records = [{"url": f"u{i}", "nested": {"rows": [{"v": i}]}, "s": "a\n{b"} for i in range(500)]
+    path = tmp_path / f"{layout}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        if layout == "ndjson":
+            f.writelines(json.dumps(r) + "\n" for r in records)
+        else:
+            json.dump(records, f, indent=2 if layout == "indented" else None)
+
+    ranges, ndjson = partition_file(path, parts)
+
+    assert ndjson == (layout == "ndjson")
+    assert len(ranges) == (1 if layout == "compact" else parts)
+    got = [r for start, end in ranges for r in _iter_range(path, start, end, ndjson)]
+    assert got == records
+
+
+def test_iter_records_from_reads_only_the_appended_tail(tmp_path):
+    path = tmp_path / "feed.ndjson"
+    path.write_text('{"a": 1}\n{"a": 2}\n{"a": 3', encoding="utf-8")
+    progress = {}
+
+    first = list(iter_records_from(path, 0, True, progress))
+    # The torn final line is left for the next run.
+    assert first == [{"a": 1}, {"a": 2}]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('}\n{"a": 4}')
+    resumed = {}
+    second = list(iter_records_from(path, progress["offset"], True, resumed))
+
+    assert second == [{"a": 3}, {"a": 4}]
+    assert resumed["offset"] == path.stat().st_size
+
+
+class _WatermarkCursor:
+    """Minimal cursor returning one stored ingestion_watermarks row."""
+
+    def __init__(self, row):
+        self.row = row
+
+    def execute(self, *_args):
+        return None
+
+    def fetchone(self):
+        return self.row
+
+
+def test_plan_file_load_skips_resumes_or_restarts(tmp_path):
+    path = tmp_path / "feed.ndjson"
+    path.write_text('{"a": 1}\n', encoding="utf-8")
+    stat = path.stat()
+    offset = stat.st_size
+    digest = _hash_prefix(path, offset)
+
+    assert plan_file_load(_WatermarkCursor(None), path) == (0, True, False)
+    unchanged = (stat.st_size, stat.st_mtime_ns, digest, offset)
+    assert plan_file_load(_WatermarkCursor(unchanged), path) is None
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"a": 2}\n')
+    appended = (stat.st_size, stat.st_mtime_ns, digest, offset)
+    assert plan_file_load(_WatermarkCursor(appended), path) == (offset, True, True)
+
+    path.write_text('{"b": 9}\n{"a": 2}\n', encoding="utf-8")
+    assert plan_file_load(_WatermarkCursor(appended), path) == (0, True, True)
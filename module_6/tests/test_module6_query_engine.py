@@ -0,0 +1,371 @@
+"""Unit tests for the analysis engine and connection pool in src/web/query_data.py.
+
+No database is needed: a recording cursor stands in for psycopg2 and
+returns canned rows for the scalar pass and the two grouped questions.
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+from psycopg2.pool import PoolError
+
+import query_data
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    """Each test starts and ends without pooled connections."""
+    query_data.close_pools()
+    yield
+    query_data.close_pools()
+
+
+def _fake_conn():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = TRANSACTION_STATUS_INTRANS
+    return conn
+
+SCALARS = (12, 41.5, 3.71, 321.0, 160.5, 4.25, 4.0, 3.2, 7, 3, 5, 20)
+
+
+def _fake_connection(scalars=SCALARS, top_status=("Rejected", 9), universities=None):
+    cur = MagicMock()
+    cur.fetchone.side_effect = [scalars, top_status]
+    cur.fetchall.return_value = universities or [("MIT", 3.9, 2)]
+    cur.mogrify.return_value = b"  SELECT ...  "
+    conn = _fake_conn()
+    conn.cursor.return_value = cur
+    return conn, cur
+
+
+def test_run_all_queries_uses_one_pooled_connection_and_three_statements():
+    conn, cur = _fake_connection()
+
+    with patch('query_data.get_db_connection', return_value=conn) as mock_connect:
+        results = query_data.run_all_queries('gradcafe')
+
+    mock_connect.assert_called_once_with('gradcafe')
+    # snapshot setup, scalar scan, q5, q11
+    assert cur.execute.call_count == 4
+    # The read-only snapshot is ended and the connection goes back to the pool
+    conn.rollback.assert_called_once()
+    conn.close.assert_not_called()
+    assert query_data.pool_stats()['gradcafe']['idle'] == 1
+    assert set(results) == set(query_data.QUESTIONS)
+    assert all(set(r) == {'question', 'query', 'answer'} for r in results.values())
+    assert results['q1']['query'] == 'SELECT ...'
+
+
+def test_run_all_queries_maps_scalar_columns_to_questions():
+    conn, _ = _fake_connection()
+
+    with patch('query_data.get_db_connection', return_value=conn):
+        results = query_data.run_all_queries('gradcafe')
+
+    assert results['q1']['answer'] == 12
+    assert results['q2']['answer'] == 41.5
+    assert results['q3']['answer'] == {
+        'avg_gpa': 3.71, 'avg_gre': 321.0, 'avg_gre_v': 160.5, 'avg_gre_aw': 4.25,
+    }
+    assert results['q4']['answer'] == 4.0
+    assert results['q5']['answer'] == 'Rejected (9 entries)'
+    assert results['q6']['answer'] == 3.2
+    assert [results[k]['answer'] for k in ('q7', 'q8', 'q9', 'q10')] == [7, 3, 5, 20]
+    assert results['q11']['answer'] == [('MIT', 3.9, 2)]
+
+
+def test_run_all_queries_empty_table_defaults():
+    conn, _ = _fake_connection(scalars=None, top_status=None, universities=[])
+
+    with patch('query_data.get_db_connection', return_value=conn):
+        results = query_data.run_all_queries()
+
+    assert results['q1']['answer'] == 0
+    assert results['q3']['answer']['avg_gpa'] is None
+    assert results['q4']['answer'] is None
+    assert results['q5']['answer'] == 'N/A'
+
+
+def test_run_all_queries_returns_connection_on_error():
+    conn, cur = _fake_connection()
+    cur.execute.side_effect = RuntimeError('boom')
+
+    with patch('query_data.get_db_connection', return_value=conn):
+        with pytest.raises(RuntimeError):
+            query_data.run_all_queries('gradcafe')
+
+    conn.rollback.assert_called_once()
+    assert query_data.pool_stats()['gradcafe']['in_use'] == 0
+
+
+def test_single_question_matches_engine_shape():
+    conn, cur = _fake_connection()
+    cur.fetchone.side_effect = [(7,)]
+
+    with patch('query_data.get_db_connection', return_value=conn):
+        result = query_data.question_7('gradcafe')
+
+    assert result['answer'] == 7
+    assert result['question'] == query_data.QUESTIONS['q7'][0]
+
+
+def test_load_analysis_reads_materialized_row():
+    summary = {'q10': {'question': 'Q10', 'query': 'SELECT 10', 'answer': 20}}
+    conn = _fake_conn()
+    conn.cursor.return_value.fetchone.return_value = (summary,)
+
+    with patch('query_data.get_db_connection', return_value=conn), \
+            patch('query_data.run_all_queries') as mock_live:
+        assert query_data.load_analysis('gradcafe') == summary
+
+    mock_live.assert_not_called()
+    conn.cursor.return_value.execute.assert_called_once()
+
+
+def test_load_analysis_falls_back_to_live_queries():
+    missing, empty = _fake_conn(), _fake_conn()
+    missing.cursor.return_value.execute.side_effect = query_data.UndefinedTable()
+    empty.cursor.return_value.fetchone.return_value = None
+
+    for conn in (missing, empty):
+        with patch('query_data.get_db_connection', return_value=conn), \
+                patch('query_data.run_all_queries', return_value={'live': True}) as mock_live:
+            assert query_data.load_analysis() == {'live': True}
+        mock_live.assert_called_once_with('gradcafe')
+        query_data.close_pools()
+
+
+# ── Connection pool ───────────────────────────────────────────────────────────
+
+def test_pool_reuses_idle_connection():
+    conn = _fake_conn()
+    pool = query_data.ConnectionPool('gradcafe', min_size=0, max_size=2)
+
+    with patch('query_data.get_db_connection', return_value=conn) as mock_connect:
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+    assert first is second
+    mock_connect.assert_called_once_with('gradcafe')
+    stats = pool.stats()
+    assert (stats['created'], stats['reused'], stats['in_use']) == (1, 1, 1)
+
+
+def test_pool_times_out_at_max_size():
+    pool = query_data.ConnectionPool('gradcafe', min_size=0, max_size=1)
+
+    with patch('query_data.get_db_connection', side_effect=lambda _db: _fake_conn()):
+        pool.acquire()
+        with pytest.raises(PoolError):
+            pool.acquire(timeout=0.01)
+
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_pool_failed_connect_frees_slot():
+    pool = query_data.ConnectionPool('gradcafe', min_size=0, max_size=1)
+
+    with patch('query_data.get_db_connection', side_effect=psycopg2.OperationalError('down')):
+        with pytest.raises(psycopg2.OperationalError):
+            pool.acquire()
+
+    assert pool.stats()['size'] == 0
+
+
+def test_pool_retires_broken_and_expired_connections():
+    broken, old, fresh = _fake_conn(), _fake_conn(), _fake_conn()
+    pool = query_data.ConnectionPool('gradcafe', min_size=0, max_size=3)
+
+    with patch('query_data.get_db_connection', side_effect=[broken, old, fresh]):
+        pool.release(pool.acquire())
+        broken.closed = 2                       # server dropped it while idle
+        conn = pool.acquire()
+        assert conn is old
+        with patch('query_data.POOL_LIFETIME_SECONDS', 0):
+            pool.release(conn)                  # old: past its lifetime
+        assert pool.acquire() is fresh
+
+    broken.close.assert_called_once()
+    old.close.assert_called_once()
+
+
+def test_pool_discards_connection_failing_health_check():
+    stale, fresh = _fake_conn(), _fake_conn()
+    stale.cursor.return_value.__enter__.return_value.execute.side_effect = (
+        psycopg2.OperationalError('gone')
+    )
+    pool = query_data.ConnectionPool('gradcafe', min_size=0, max_size=2)
+
+    with patch('query_data.get_db_connection', side_effect=[stale, fresh]):
+        pool.release(pool.acquire())
+        with patch('query_data.POOL_CHECK_SECONDS', 0):
+            assert pool.acquire() is fresh
+
+    assert pool.stats()['failed_checks'] == 1
+
+
+def test_pool_idle_timeout_keeps_min_size():
+    first, second = _fake_conn(), _fake_conn()
+    first.info.transaction_status = TRANSACTION_STATUS_IDLE
+    pool = query_data.ConnectionPool('gradcafe', min_size=1, max_size=2)
+
+    with patch('query_data.get_db_connection', side_effect=[first, second]):
+        a, b = pool.acquire(), pool.acquire()
+        pool.release(a)
+        pool.release(b)
+        with patch('query_data.POOL_IDLE_SECONDS', 0):
+            assert pool.acquire() is second
+
+    # first was idle-expired; second survives because the pool is at min_size
+    first.rollback.assert_not_called()
+    first.close.assert_called_once()
+    assert pool.stats()['size'] == 1
+
+
+# ── Result cache ──────────────────────────────────────────────────────────────
+
+def test_result_cache_hits_until_watermark_moves():
+    compute = MagicMock(side_effect=[{'v': 1}, {'v': 2}])
+    cache = query_data.ResultCache(compute)
+
+    with patch('query_data.latest_watermark', side_effect=['w1', 'w1', 'w2']):
+        assert cache.get('gradcafe') == {'v': 1}
+        assert cache.get('gradcafe') == {'v': 1}
+        assert cache.get('gradcafe') == {'v': 2}
+
+    assert compute.call_count == 2
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+    assert stats['entries'] == {'gradcafe': 'w2'}
+
+
+def test_result_cache_single_flight_under_burst():
+    release = threading.Event()
+    calls = []
+
+    def slow_compute(dbname):
+        calls.append(dbname)
+        release.wait(5)
+        return {'v': dbname}
+
+    cache = query_data.ResultCache(slow_compute)
+    results = []
+    with patch('query_data.latest_watermark', return_value='w1'):
+        threads = [threading.Thread(target=lambda: results.append(cache.get('gradcafe')))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while cache.stats()['coalesced'] < 7:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert calls == ['gradcafe']
+    assert results == [{'v': 'gradcafe'}] * 8
+
+
+def test_result_cache_failed_compute_is_not_cached():
+    compute = MagicMock(side_effect=[RuntimeError('db down'), {'v': 1}])
+    cache = query_data.ResultCache(compute)
+
+    with patch('query_data.latest_watermark', return_value='w1'):
+        with pytest.raises(RuntimeError):
+            cache.get('gradcafe')
+        assert cache.get('gradcafe') == {'v': 1}
+
+    cache.clear()
+    assert not cache.stats()['entries']
+
+
+def test_latest_watermark_probe():
+    conn = _fake_conn()
+    conn.cursor.return_value.fetchone.return_value = ('2026-03-01',)
+    missing = _fake_conn()
+    missing.cursor.return_value.execute.side_effect = query_data.UndefinedTable()
+
+    with patch('query_data.get_db_connection', return_value=conn):
+        assert query_data.latest_watermark('gradcafe') == '2026-03-01'
+    query_data.close_pools()
+    with patch('query_data.get_db_connection', return_value=missing):
+        assert query_data.latest_watermark('gradcafe') is None
+
+
+def test_data_version_probe():
+    conn = _fake_conn()
+    conn.cursor.return_value.fetchone.return_value = ('2026-03-01', '20', 21)
+    missing = _fake_conn()
+    missing.cursor.return_value.execute.side_effect = query_data.UndefinedTable()
+
+    with patch('query_data.get_db_connection', return_value=conn):
+        assert query_data.data_version('gradcafe') == ('2026-03-01', '20', 21)
+    query_data.close_pools()
+    with patch('query_data.get_db_connection', return_value=missing):
+        assert query_data.data_version('gradcafe') is None
+
+
+def test_cached_analysis_uses_default_db():
+    with patch.object(query_data.RESULT_CACHE, 'get', return_value={'v': 1}) as mock_get:
+        assert query_data.cached_analysis() == {'v': 1}
+
+    mock_get.assert_called_once_with('gradcafe')
+
+
+# ── Worker status ─────────────────────────────────────────────────────────────
+
+_STATUS_ROW = (5, 'recompute', 'now', None, '2026-02-01', None, 'now', None)
+
+
+def test_worker_status_falls_back_to_count_without_stats_row():
+    missing = _fake_conn()
+    missing.cursor.return_value.execute.side_effect = [query_data.UndefinedTable(), None]
+    missing.cursor.return_value.fetchone.return_value = _STATUS_ROW
+    unseeded = _fake_conn()
+    unseeded.cursor.return_value.fetchone.side_effect = [(None,) + _STATUS_ROW[1:], _STATUS_ROW]
+
+    for conn in (missing, unseeded):
+        with patch('query_data.get_db_connection', return_value=conn):
+            status = query_data.worker_status('gradcafe')
+        assert status['total_records'] == 5
+        assert status['scrape_last_seen'] == '2026-02-01'
+        fallback = conn.cursor.return_value.execute.call_args_list[-1][0][0]
+        assert 'COUNT(*) FROM gradcafe_main' in fallback
+        query_data.close_pools()
+    missing.rollback.assert_called()
+
+
+def test_worker_status_records_latency_and_errors():
+    stats = query_data.LatencyStats(window=10)
+    conn = _fake_conn()
+    conn.cursor.return_value.fetchone.return_value = _STATUS_ROW
+
+    with patch.object(query_data, 'STATUS_LATENCY', stats), \
+            patch('query_data.get_db_connection', return_value=conn):
+        query_data.worker_status('gradcafe')
+        conn.cursor.return_value.execute.side_effect = psycopg2.OperationalError('gone')
+        with pytest.raises(psycopg2.OperationalError):
+            query_data.worker_status('gradcafe')
+        reported = query_data.latency_stats()['worker_status']
+
+    assert reported['count'] == 2
+    assert reported['errors'] == 1
+    assert reported['p50_ms'] <= reported['p95_ms'] <= reported['max_ms']
+
+
+def test_latency_stats_percentiles_over_window():
+    stats = query_data.LatencyStats(window=100)
+    assert stats.stats()['p50_ms'] is None
+
+    for ms in range(1, 201):
+        stats.observe(ms / 1000)
+
+    reported = stats.stats()
+    assert reported['count'] == 200
+    # Only the latest 100 samples (101..200 ms) feed the percentiles
+    assert reported['p50_ms'] == 151.0
+    assert reported['p95_ms'] == 196.0
+    assert reported['max_ms'] == 200.0
@@ -0,0 +1,91 @@
+"""The gradcafe_stats row counter (db/row_counter.sql) against a real database.
+
+Writes to gradcafe_main of TEST_DB_NAME (default gradcafe_test) and only
+touches rows whose url starts with URL_PREFIX.  Skipped when no PostgreSQL
+is reachable through DATABASE_URL / DB_* variables.
+"""
+import psycopg2
+import pytest
+
+import load_data
+
+TEST_DB = "gradcafe_test"
+URL_PREFIX = "https://test.invalid/row-counter-"
+
+
+def _rows(numbers):
+    return (
+        load_data.record_to_row({
+            "program": "Physics, MIT",
+            "applicant_status": "Accepted",
+            "url": f"{URL_PREFIX}{i}",
+        })
+        for i in numbers
+    )
+
+
+def _count(cur):
+    cur.execute("SELECT COUNT(*) FROM gradcafe_main WHERE url LIKE %s;", (URL_PREFIX + "%",))
+    return cur.fetchone()[0]
+
+
+def _counter_matches_table(cur):
+    cur.execute("SELECT SUM(row_count), (SELECT COUNT(*) FROM gradcafe_main) "
+                "FROM gradcafe_stats;")
+    counted, actual = cur.fetchone()
+    return counted == actual
+
+
+@pytest.fixture
+def db_cursor():
+    """Autocommit cursor on TEST_DB with this module's rows cleared."""
+    try:
+        conn = load_data.get_db_connection(TEST_DB)
+        load_data.ensure_schema(conn)
+    except psycopg2.Error as exc:
+        pytest.skip(f"PostgreSQL not available: {exc}")
+    conn.autocommit = True
+    cur = conn.cursor()
+
+    def _cleanup():
+        cur.execute("DELETE FROM gradcafe_main WHERE url LIKE %s;", (URL_PREFIX + "%",))
+
+    _cleanup()
+    yield cur
+    _cleanup()
+    cur.close()
+    conn.close()
+
+
+def test_counter_follows_inserts_and_deletes(db_cursor):
+    load_data.copy_rows(db_cursor, _rows(range(4)))
+    db_cursor.execute("DELETE FROM gradcafe_main WHERE url = %s;", (f"{URL_PREFIX}0",))
+
+    assert _count(db_cursor) == 3
+    assert _counter_matches_table(db_cursor)
+
+
+def test_concurrent_copies_do_not_wait_on_the_row_counter(db_cursor):
+    db_cursor.execute("SELECT COUNT(*) FROM gradcafe_stats;")
+    slots = db_cursor.fetchone()[0]
+    first = load_data.get_db_connection(TEST_DB)
+    spare = []
+    second = load_data.get_db_connection(TEST_DB)
+    # Backends pick their counter slot by pid; get two that land apart
+    while second.get_backend_pid() % slots == first.get_backend_pid() % slots:
+        spare.append(second)
+        second = load_data.get_db_connection(TEST_DB)
+    try:
+        cur_first, cur_second = first.cursor(), second.cursor()
+        cur_second.execute("SET lock_timeout = '1s';")
+        load_data.copy_rows(cur_first, _rows(range(3)))
+        # first has not committed, so it still holds its slot's row lock
+        load_data.copy_rows(cur_second, _rows(range(3, 5)))
+        first.commit()
+        second.commit()
+    finally:
+        for conn in (first, second, *spare):
+            conn.close()
+
+    assert _count(db_cursor) == 5
+    assert _counter_matches_table(db_cursor)
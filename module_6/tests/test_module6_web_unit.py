@@ -35,7 +35,7 @@ def test_analysis_route_sets_no_cache_and_renders():
     response = client.get('/analysis')
 
     assert response.status_code == 200
-    assert response.headers['Cache-Control'] == 'no-store, no-cache, must-revalidate'
+    assert response.headers['Cache-Control'] == 'no-cache'
     assert response.headers['Pragma'] == 'no-cache'
     assert b'GradCafe Database Analysis' in response.data
 
@@ -163,12 +163,12 @@ def test_worker_status_success_payload():
     recompute_at = datetime(2026, 3, 1, 12, 2, 0, tzinfo=timezone.utc)
 
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.side_effect = [
-        (123,),
-        ('gradcafe_scraped', '2026-02-01', updated_at),
-        ('2026-02-01', scrape_at),
-        ('2026-03-01', recompute_at),
-    ]
+    mock_cursor.fetchone.return_value = (
+        123,
+        'gradcafe_scraped', '2026-02-01', updated_at,
+        '2026-02-01', scrape_at,
+        '2026-03-01', recompute_at,
+    )
     mock_conn = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
 
@@ -183,6 +183,10 @@ def test_worker_status_success_payload():
     assert payload['seeded'] is True
     assert payload['scrape_last_seen'] == '2026-02-01'
     assert payload['recompute_last_seen'] == '2026-03-01'
+    assert payload['recompute_last_updated'] == recompute_at.isoformat()
+    # Row count and watermarks come from one single-row query, not COUNT(*)
+    mock_cursor.execute.assert_called_once()
+    assert 'gradcafe_stats' in mock_cursor.execute.call_args[0][0]
 
 
 def test_worker_status_handles_missing_watermarks():
@@ -190,12 +194,7 @@ def test_worker_status_handles_missing_watermarks():
     client = app.test_client()
 
     mock_cursor = MagicMock()
-    mock_cursor.fetchone.side_effect = [
-        (0,),
-        None,
-        None,
-        None,
-    ]
+    mock_cursor.fetchone.return_value = (0, None, None, None, None, None, None, None)
     mock_conn = MagicMock()
     mock_conn.cursor.return_value = mock_cursor
 
@@ -223,3 +222,213 @@ def test_worker_status_db_error_returns_ok_false():
     assert payload['ok'] is False
     assert payload['seeded'] is False
     assert payload['total_records'] == 0
+
+
+def test_pool_stats_route_reports_pools():
+    app = _make_app()
+    client = app.test_client()
+
+    with patch('query_data.pool_stats', return_value={'gradcafe': {'size': 1}}):
+        response = client.get('/pool_stats')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'gradcafe': {'size': 1}}
+
+
+def test_latency_stats_route_reports_worker_status():
+    app = _make_app()
+    client = app.test_client()
+
+    response = client.get('/latency_stats')
+
+    assert response.status_code == 200
+    assert {'count', 'errors', 'p50_ms', 'p95_ms', 'max_ms'} <= set(
+        response.get_json()['worker_status'])
+
+
+class _FakeHub:
+    """Task-event hub whose single subscriber queue is pre-filled."""
+
+    def __init__(self, *events):
+        import queue
+
+        self.client = queue.Queue()
+        for event in events:
+            self.client.put(event)
+        self.unsubscribed = False
+
+    def subscribe(self):
+        return self.client
+
+    def unsubscribe(self, client):
+        self.unsubscribed = client is self.client
+
+    def stats(self):
+        return {'subscribers': 1, 'published': 2}
+
+
+def test_events_route_streams_task_completed_then_heartbeat():
+    from app import create_app
+
+    hub = _FakeHub({'source': 'recompute', 'updated_at': '2026-03-01T12:00:00+00:00'})
+    app = create_app(query_func=_query_results, events=hub,
+                     config={'EVENTS_HEARTBEAT_SECONDS': 0.01})
+
+    response = app.test_client().get('/events')
+    chunks = iter(response.response)
+    first, event, idle = next(chunks), next(chunks), next(chunks)
+    response.close()
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert first.startswith(b'retry: ')
+    assert event == (b'event: task_completed\n'
+                     b'data: {"source": "recompute", "updated_at": "2026-03-01T12:00:00+00:00"}\n\n')
+    assert idle == b': keepalive\n\n'
+    assert hub.unsubscribed
+
+
+def test_events_stats_route_reports_hub():
+    from app import create_app
+
+    app = create_app(query_func=_query_results, events=_FakeHub())
+    response = app.test_client().get('/events_stats')
+
+    assert response.get_json() == {'subscribers': 1, 'published': 2}
+
+
+def test_cache_stats_route_reports_counters():
+    app = _make_app()
+    client = app.test_client()
+
+    response = client.get('/cache_stats')
+
+    assert response.status_code == 200
+    assert {'hits', 'misses', 'coalesced', 'entries'} <= set(response.get_json())
+
+
+# ── Conditional GET ──────────────────────────────────────────────────────────
+
+_VERSION = (datetime(2026, 3, 1, 12, 0, 0, tzinfo=timezone.utc), '123', 123)
+
+
+def _conditional_app(version=_VERSION):
+    from app import create_app
+
+    query = MagicMock(side_effect=_query_results)
+    probe = MagicMock(return_value=version)
+    return create_app(query_func=query, version_func=probe), query
+
+
+def test_analysis_sets_validators_and_answers_304():
+    app, query = _conditional_app()
+    client = app.test_client()
+
+    first = client.get('/analysis')
+    etag = first.headers['ETag']
+    again = client.get('/analysis', headers={'If-None-Match': etag})
+
+    assert first.status_code == 200
+    assert first.headers['Last-Modified'] == 'Sun, 01 Mar 2026 12:00:00 GMT'
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+    assert query.call_count == 1
+
+
+def test_analysis_stale_etag_gets_full_body():
+    app, query = _conditional_app()
+    client = app.test_client()
+
+    response = client.get('/analysis', headers={'If-None-Match': '"stale"'})
+
+    assert response.status_code == 200
+    assert query.call_count == 1
+
+
+def test_analysis_if_modified_since():
+    app, query = _conditional_app()
+    client = app.test_client()
+
+    fresh = client.get('/analysis', headers={'If-Modified-Since': 'Sun, 01 Mar 2026 12:00:00 GMT'})
+    stale = client.get('/analysis', headers={'If-Modified-Since': 'Sun, 01 Mar 2026 11:00:00 GMT'})
+
+    assert fresh.status_code == 304
+    assert stale.status_code == 200
+    assert query.call_count == 1
+
+
+def test_validators_skipped_when_probe_fails():
+    from app import create_app
+
+    app = create_app(query_func=_query_results,
+                     version_func=MagicMock(side_effect=RuntimeError('db down')))
+    response = app.test_client().get('/analysis', headers={'If-None-Match': '*'})
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+
+def test_validators_skipped_without_version():
+    app, _ = _conditional_app(version=None)
+    response = app.test_client().get('/analysis', headers={'If-None-Match': '*'})
+
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+
+
+def test_worker_status_etag_follows_row_counter():
+    from app import create_app
+
+    probe = MagicMock(return_value=_VERSION)
+    app = create_app(query_func=_query_results, version_func=probe)
+    client = app.test_client()
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (
+        123, 'seed_json', None, _VERSION[0], None, None, None, None,
+    )
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch('query_data.get_db_connection', return_value=mock_conn):
+        first = client.get('/worker_status')
+        # A seed chunk committed rows; the watermark has not moved yet
+        probe.return_value = _VERSION[:2] + (456,)
+        again = client.get('/worker_status', headers={'If-None-Match': first.headers['ETag']})
+
+    assert again.status_code == 200
+    assert again.headers['ETag'] != first.headers['ETag']
+
+
+def test_worker_status_304_skips_queries():
+    app, _ = _conditional_app()
+    client = app.test_client()
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (
+        123, 'gradcafe_scraped', '2026-02-01', _VERSION[0], None, None, None, None,
+    )
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+
+    with patch('query_data.get_db_connection', return_value=mock_conn) as mock_connect:
+        first = client.get('/worker_status')
+        again = client.get('/worker_status', headers={'If-None-Match': first.headers['ETag']})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.headers['Cache-Control'] == 'no-cache'
+    mock_connect.assert_called_once()
+
+
+def test_default_app_probes_data_version():
+    from app import create_app
+
+    with patch('app.data_version', return_value=_VERSION) as probe, \
+            patch('app.cached_analysis', side_effect=_query_results):
+        app = create_app()
+        response = app.test_client().get('/analysis')
+
+    assert response.status_code == 200
+    probe.assert_called_once_with('gradcafe')
@@ -8,6 +8,7 @@ import psycopg2
 import os
 from psycopg2.extras import execute_values
 from db_helpers import get_test_db_params
+import load_data
 
 
 @pytest.fixture
@@ -41,6 +42,8 @@ def populated_test_db():
         );
     """)
     cur.execute("ALTER TABLE gradcafe_main ADD COLUMN IF NOT EXISTS raw_data JSONB;")
+    # q8/q9 read the generated program_category column
+    load_data.run_schema_file(cur, "derived_columns.sql")
     cur.execute("DELETE FROM gradcafe_main;")
     
     # Insert sample data